@@ -0,0 +1,77 @@
+"""
+전처리 결과 로드 시간 벤치마크 (CSV vs Parquet)
+
+- csv: 이전 방식, pd.read_csv로 파일 전체를 파싱
+- parquet: read_reviews로 같은 이름의 .parquet 전체 읽기
+- parquet (N칼럼): 임베딩 / 비교 분석처럼 필요한 칼럼만 읽기
+
+.parquet이 없으면 CSV에서 만들어 둔 뒤 측정합니다. (pyarrow 필요)
+
+예시:
+    python benchmarks/columnar_bench.py
+    python benchmarks/columnar_bench.py -i "/data/preprocessed_reviews_*.csv" --repeat 5
+"""
+import glob
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Callable
+
+project_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pandas as pd
+
+from review_analysis.preprocessing.columnar import parquet_available, parquet_path, read_reviews, write_parquet
+
+DEFAULT_INPUTS = os.path.join(project_root, "database", "preprocessed_reviews_*.csv")
+
+# st_app.rag.embedder.DOCUMENT_COLUMNS, comparison_analysis.COMPARISON_COLUMNS와 같은 칼럼
+# (벤치마크가 langchain / matplotlib 없이 돌도록 따로 적어 둠)
+PROJECTIONS = {
+    "임베딩": ("context_cleaned", "rating", "date", "rating_group"),
+    "비교 분석": ('rating', 'date', 'text_len', 'word_count', 'year_month', 'rating_group', 'top_keywords'),
+}
+
+
+def best_of(fn: Callable[[], pd.DataFrame], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def compare(csv_path: str, repeat: int) -> None:
+    path = parquet_path(csv_path)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(csv_path):
+        write_parquet([pd.read_csv(csv_path, encoding='utf-8-sig', keep_default_na=False)], path)
+
+    rows = len(read_reviews(csv_path, columns=['rating']))
+    print(f"{os.path.basename(csv_path)} ({rows}행, CSV {os.path.getsize(csv_path) / 1e6:.1f}MB, "
+          f"Parquet {os.path.getsize(path) / 1e6:.1f}MB)")
+    csv_s = best_of(lambda: pd.read_csv(csv_path, encoding='utf-8-sig'), repeat)
+    print(f"{'csv':>22}: {csv_s:.3f}s")
+    projections = [("parquet", None)]
+    projections += [(f"parquet ({len(columns)}칼럼, {name})", columns) for name, columns in PROJECTIONS.items()]
+    for name, columns in projections:
+        seconds = best_of(lambda: read_reviews(csv_path, columns=columns), repeat)
+        print(f"{name:>22}: {seconds:.3f}s ({csv_s / seconds:.1f}배)")
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Compare loading preprocessed reviews from CSV and Parquet")
+    parser.add_argument('-i', '--input', type=str, default=DEFAULT_INPUTS, help="Glob of preprocessed review CSV files")
+    parser.add_argument('--repeat', type=int, default=3, help="Loads per method (best time is reported)")
+    return parser
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    if not parquet_available():
+        raise SystemExit("pyarrow를 불러올 수 없습니다. pip install pyarrow로 설치해주세요.")
+    for csv_path in sorted(glob.glob(args.input)):
+        compare(csv_path, args.repeat)
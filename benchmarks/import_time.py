@@ -0,0 +1,118 @@
+"""
+콜드 스타트 import 시간 측정 (python -X importtime)
+
+모듈마다 새 인터프리터에서 `python -X importtime -c "import <모듈>"`을 실행하고
+stderr 보고서를 파싱하여 전체 시간과 패키지별 시간(하위 모듈 self 시간 합)을 보여줍니다.
+streamlit_app.py가 시작할 때 가져오는 모듈들이 기본 대상입니다.
+
+예시:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --module st_app.rag.backend --top 30
+    python benchmarks/import_time.py --repeat 5 --json import_time.json
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from argparse import ArgumentParser
+from typing import Dict, List, Tuple
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# streamlit_app.py 상단에서 가져오는 앱 모듈 (streamlit 자체는 제외)
+DEFAULT_MODULES = [
+    "st_app.graph.router",
+    "st_app.rag.backend",
+    "st_app.rag.index_store",
+    "st_app.utils.history",
+    "st_app.utils.tracing",
+]
+
+# 첫 사용 전까지 import되지 않아야 하는 무거운 패키지
+HEAVY_PACKAGES = ["langchain", "langchain_community", "langchain_upstage", "langchain_openai",
+                  "faiss", "pandas", "numpy", "sklearn"]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """-X importtime 출력 -> [(모듈, self us, cumulative us, 깊이)]"""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def package_times(rows: List[Tuple[str, int, int, int]]) -> Dict[str, float]:
+    """최상위 패키지별 시간(ms) — 하위 모듈들의 self 시간 합 (의존 패키지 시간은 각자에게 귀속)"""
+    packages: Dict[str, float] = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + self_us / 1000
+    return packages
+
+
+def profile_module(module: str) -> Dict:
+    """새 인터프리터에서 module을 import하고 (전체 시간, 모듈별 시간, 로드된 무거운 패키지)를 돌려줍니다."""
+    check = f"import sys; print(','.join(m for m in {HEAVY_PACKAGES!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}; {check}"],
+        cwd=project_root, capture_output=True, text=True,
+        env={**os.environ, "PYTHONPATH": project_root},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    # 인터프리터 시작 시의 import(encodings, site 등)는 제외
+    site = max((i for i, row in enumerate(rows) if row[0] == "site" and row[3] == 0), default=-1)
+    rows = rows[site + 1:]
+    total_us = sum(cumulative for _, _, cumulative, depth in rows if depth == 0)
+    return {
+        "module": module,
+        "total_ms": total_us / 1000,
+        "modules": {name: cumulative / 1000 for name, _, cumulative, _ in rows},  # 모듈별 cumulative
+        "packages": package_times(rows),
+        "heavy_loaded": [m for m in proc.stdout.strip().split(",") if m],
+    }
+
+
+def run(modules: List[str], top: int, repeat: int) -> List[Dict]:
+    results = []
+    for module in modules:
+        runs = [profile_module(module) for _ in range(repeat)]
+        best = min(runs, key=lambda r: r["total_ms"])
+        best["median_ms"] = statistics.median(r["total_ms"] for r in runs)
+        results.append(best)
+
+        print(f"\n=== {module} ===")
+        print(f"전체: {best['median_ms']:.0f}ms (중앙값, {repeat}회) / 최소 {best['total_ms']:.0f}ms")
+        if best["heavy_loaded"]:
+            print(f"로드된 무거운 패키지: {', '.join(best['heavy_loaded'])}")
+        print(f"{'self 합(ms)':>12}  패키지")
+        for name, ms in sorted(best["packages"].items(), key=lambda x: -x[1])[:top]:
+            print(f"{ms:>12.1f}  {name}")
+    return results
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Profile cold-start import time with python -X importtime")
+    parser.add_argument('-m', '--module', type=str, nargs='*', default=None,
+                        help="Modules to import (default: the st_app modules streamlit_app.py imports)")
+    parser.add_argument('--top', type=int, default=15, help="Heaviest packages to show per module")
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh interpreters per module; the median is reported")
+    parser.add_argument('--json', type=str, default=None, help="Write the full report to this .json file")
+    return parser
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    results = run(args.module or DEFAULT_MODULES, args.top, args.repeat)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n보고서 저장: {args.json}")
@@ -0,0 +1,95 @@
+"""
+리뷰별 상위 키워드 추출 벤치마크
+
+- before: 리뷰마다 vectorizer.transform([text])을 다시 호출하고 파이썬에서 점수를 정렬하던 이전 방식
+- top_keywords: fit_transform 결과(CSR 행렬)에서 모든 행의 상위 키워드를 한 번에 추출
+
+두 방식의 결과가 같은지 확인하고 시간을 비교합니다.
+
+예시:
+    python benchmarks/keywords_bench.py
+    python benchmarks/keywords_bench.py --synthetic 50000
+"""
+import glob
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from typing import List
+
+project_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from review_analysis.preprocessing.review_processor import top_keywords
+
+DEFAULT_INPUTS = os.path.join(project_root, "database", "preprocessed_reviews_*.csv")
+
+
+def load_texts(pattern: str) -> List[str]:
+    texts = []
+    for path in sorted(glob.glob(pattern)):
+        df = pd.read_csv(path)
+        column = next(c for c in ("context_tokenized", "context", "text") if c in df.columns)
+        texts.extend(df[column].fillna("").astype(str))
+    return texts
+
+
+def synthetic_texts(n: int, vocab: int = 2000, seed: int = 42) -> List[str]:
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(3, 30, size=n)
+    words = rng.zipf(1.3, size=int(lengths.sum())) % vocab
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    return [" ".join(f"w{w}" for w in words[bounds[i]:bounds[i + 1]]) for i in range(n)]
+
+
+def legacy_top_keywords(text: str, vectorizer, feature_names, top_n: int = 5) -> str:
+    """이전 구현: 리뷰마다 transform"""
+    try:
+        tfidf_scores = vectorizer.transform([text])
+        feature_index = tfidf_scores[0, :].nonzero()[1]
+        if len(feature_index) == 0:
+            return ""
+        scores = [(feature_names[i], tfidf_scores[0, i]) for i in feature_index]
+        scores.sort(key=lambda x: x[1], reverse=True)
+        return ', '.join(word for word, score in scores[:top_n])
+    except Exception:
+        return ""
+
+
+def compare(name: str, texts: List[str]) -> None:
+    tfidf = TfidfVectorizer(max_features=100, ngram_range=(1, 2), min_df=2, max_df=0.95)
+    matrix = tfidf.fit_transform(texts)
+    feature_names = tfidf.get_feature_names_out()
+
+    start = time.perf_counter()
+    before = [legacy_top_keywords(text, tfidf, feature_names) for text in texts]
+    before_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = top_keywords(matrix, feature_names)
+    after_s = time.perf_counter() - start
+
+    assert before == after, f"{name}: 결과가 이전 구현과 다릅니다"
+    print(f"{name} ({len(texts)}건): before {before_s:.3f}s / top_keywords {after_s:.3f}s "
+          f"({before_s / after_s:.0f}배)")
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Compare per-review transform with batched top-k keyword extraction")
+    parser.add_argument('-i', '--input', type=str, default=DEFAULT_INPUTS, help="Glob of preprocessed review CSV files")
+    parser.add_argument('--synthetic', type=int, default=20000, help="Number of synthetic reviews to add (0: none)")
+    return parser
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    texts = load_texts(args.input)
+    if texts:
+        compare("리뷰 데이터", texts)
+    if args.synthetic:
+        compare("합성 데이터", synthetic_texts(args.synthetic))
@@ -0,0 +1,239 @@
+"""
+챗봇 그래프 부하 테스트 (오프라인)
+
+가짜 LLM / 임베딩(st_app.rag.fake)으로 build_graph()를 컴파일하고,
+질문 믹스를 목표 QPS로 여러 스레드에서 재생하여 처리량, 지연시간 분위수,
+경로별 통계, 메모리 증가량을 측정합니다.
+
+예시:
+    python benchmarks/load_test.py --qps 20 --duration 30 --workers 32 --llm-latency 0.8
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from argparse import ArgumentParser
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+project_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from st_app.graph.router import ROUTE_ORDER, build_graph
+from st_app.rag.aspects import AspectStore, build_aspect_store
+from st_app.rag.backend import fake_backend
+from st_app.rag.extractive import ANSWER_MODES
+from st_app.rag.llm import LLMPolicy
+from st_app.utils.tracing import tracer
+
+# (질문, 기대 경로(복합 질문은 ROUTE_ORDER 순서로 +), 가중치)
+QUESTION_MIX = [
+    ("안녕! 반가워", "chat", 1),
+    ("심심한데 재밌는 얘기 해줘", "chat", 1),
+    ("에버랜드 입장료 얼마야?", "subject_info", 2),
+    ("에버랜드 운영시간 알려줘", "subject_info", 2),
+    ("주차는 어디에 하면 돼?", "subject_info", 1),
+    ("에버랜드 가는 교통편 알려줘", "subject_info", 1),
+    ("사파리 후기 어때?", "rag_review", 3),
+    ("사람들이 추천하는 코스 리뷰 알려줘", "rag_review", 2),
+    ("겨울에 가본 사람들 후기 어땠어?", "rag_review", 2),
+    ("대기 시간에 대한 리뷰 요약해줘", "rag_review", 2),
+    ("입장료 얼마고 사람들 후기는 어때?", "subject_info+rag_review", 1),
+]
+
+
+def current_rss_mb() -> float:
+    """현재 RSS(MB). /proc이 없으면 최대 RSS로 대체"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def latency_stats(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 0.50), 1),
+        "p90_ms": round(percentile(values, 0.90), 1),
+        "p95_ms": round(percentile(values, 0.95), 1),
+        "p99_ms": round(percentile(values, 0.99), 1),
+        "max_ms": round(max(values), 1) if values else 0.0,
+    }
+
+
+def build_schedule(total: int, seed: int) -> List[tuple]:
+    rng = random.Random(seed)
+    weights = [w for _, _, w in QUESTION_MIX]
+    return [rng.choices(QUESTION_MIX, weights=weights)[0][:2] for _ in range(total)]
+
+
+def run_load_test(args) -> dict:
+    backend = fake_backend(
+        llm_latency=args.llm_latency,
+        embed_latency=args.embed_latency,
+        jitter=args.jitter,
+        embedding_dim=args.embedding_dim,
+        max_docs=args.docs,
+        policy=LLMPolicy(
+            timeout=args.llm_timeout,
+            hedge=args.hedge_delay != 0,
+            hedge_delay=args.hedge_delay,
+        ),
+    )
+    if args.aspects:
+        store_path = os.path.join(tempfile.mkdtemp(), "aspect_summaries.json")
+        build_aspect_store(backend, output_path=store_path)
+        backend.aspect_store = AspectStore(store_path)
+    graph = build_graph(backend)
+    tracer.reset()
+
+    total = int(args.qps * args.duration)
+    schedule = build_schedule(total, args.seed)
+
+    lock = threading.Lock()
+    latencies: List[float] = []
+    by_route: Dict[str, List[float]] = defaultdict(list)
+    misroutes = 0
+    errors = 0
+
+    def run_one(i: int, question: str, expected: str, scheduled_at: float):
+        nonlocal misroutes, errors
+        if args.unique_questions:
+            question = f"{question} #{i}"
+        try:
+            result = graph.invoke({
+                "user_input": question,
+                "chat_history": [],
+                "history_summary": "",
+                "route": "",
+                "response": "",
+                "retrieved_reviews": [],
+                "answer_mode": args.answer_mode,
+            })
+            routes = result.get("routes") or [result["route"]]
+            route: Optional[str] = "+".join(sorted(routes, key=ROUTE_ORDER.index))
+        except Exception:
+            route = None
+        # 예정 시각부터 측정하여 큐 대기 시간까지 포함 (coordinated omission 방지)
+        elapsed_ms = (time.perf_counter() - scheduled_at) * 1000
+        with lock:
+            if route is None:
+                errors += 1
+                return
+            latencies.append(elapsed_ms)
+            by_route[route].append(elapsed_ms)
+            if route != expected:
+                misroutes += 1
+                tracer.incr("router.misroute")
+
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for i, (question, expected) in enumerate(schedule):
+            scheduled_at = start + i / args.qps
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(run_one, i, question, expected, scheduled_at)
+    elapsed = time.perf_counter() - start
+    rss_after = current_rss_mb()
+
+    return {
+        "config": {
+            "target_qps": args.qps,
+            "duration_s": args.duration,
+            "workers": args.workers,
+            "llm_latency_s": args.llm_latency,
+            "embed_latency_s": args.embed_latency,
+            "jitter_s": args.jitter,
+            "llm_timeout_s": args.llm_timeout,
+            "hedge_delay_s": args.hedge_delay,
+            "answer_mode": args.answer_mode,
+            "aspects": args.aspects,
+            "documents": len(backend.vectorstore.index_to_docstore_id),
+        },
+        "requests": total,
+        "completed": len(latencies),
+        "errors": errors,
+        "misroutes": misroutes,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_qps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency": latency_stats(latencies),
+        "routes": {route: latency_stats(values) for route, values in sorted(by_route.items())},
+        "nodes": tracer.summary(),
+        "events": tracer.counters(),
+        "memory": {
+            "rss_before_mb": round(rss_before, 1),
+            "rss_after_mb": round(rss_after, 1),
+            "rss_growth_mb": round(rss_after - rss_before, 1),
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print("=" * 60)
+    print("부하 테스트 결과")
+    print("=" * 60)
+    print(f"요청 수: {report['requests']} (완료 {report['completed']}, 오류 {report['errors']}, 오분류 {report['misroutes']})")
+    print(f"소요 시간: {report['elapsed_s']}s, 처리량: {report['throughput_qps']} QPS")
+    lat = report["latency"]
+    print(f"지연시간: p50 {lat['p50_ms']}ms / p90 {lat['p90_ms']}ms / p95 {lat['p95_ms']}ms / p99 {lat['p99_ms']}ms / max {lat['max_ms']}ms")
+    print("\n[경로별]")
+    for route, stats in report["routes"].items():
+        print(f"  - {route}: {stats['count']}건, p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms")
+    print("\n[노드별]")
+    for row in report["nodes"]:
+        print(f"  - {row['span']}: {row['count']}회, 평균 {row['avg_ms']}ms, p95 {row['p95_ms']}ms")
+    if report["events"]:
+        print("\n[이벤트]")
+        for event, count in report["events"].items():
+            print(f"  - {event}: {count}")
+    mem = report["memory"]
+    print(f"\n메모리(RSS): {mem['rss_before_mb']}MB -> {mem['rss_after_mb']}MB (+{mem['rss_growth_mb']}MB)")
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Offline load test for the chatbot graph")
+    parser.add_argument('--qps', type=float, default=10.0, help="Target requests per second")
+    parser.add_argument('--duration', type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument('--workers', type=int, default=32, help="Number of concurrent worker threads")
+    parser.add_argument('--llm-latency', type=float, default=0.5, help="Fake LLM latency per call (s)")
+    parser.add_argument('--embed-latency', type=float, default=0.1, help="Fake embedding latency per call (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Uniform latency jitter (s)")
+    parser.add_argument('--llm-timeout', type=float, default=20.0, help="Per-node LLM timeout (s)")
+    parser.add_argument('--hedge-delay', type=float, default=None,
+                        help="Send a hedged LLM request after this delay (s). Default: recent p95, 0 = off")
+    parser.add_argument('--answer-mode', type=str, default="llm", choices=ANSWER_MODES,
+                        help="Review answers from the fake LLM or from the extractive summarizer")
+    parser.add_argument('--aspects', action='store_true',
+                        help="Precompute the aspect summary store and answer aspect questions from it")
+    parser.add_argument('--docs', type=int, default=0, help="Limit the number of indexed reviews (0 = all)")
+    parser.add_argument('--embedding-dim', type=int, default=256, help="Fake embedding dimension")
+    parser.add_argument('--unique-questions', action='store_true', help="Make every question unique to bypass caches")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', type=str, default=None, help="Write the report as JSON to this path")
+    return parser
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    report = run_load_test(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,100 @@
+"""
+리뷰 텍스트 특성(길이, 단어 수, 이모지 / URL 여부) 계산 벤치마크
+
+- before: 특성마다 .str / .apply(lambda)로 리뷰를 한 번씩 훑던 이전 방식
+- text_features: 코드포인트 배열 한 번으로 모든 개수를 계산 (review_analysis.preprocessing.text_features)
+
+언어 감지도 리뷰마다 detect_language를 호출하는 방식과 칼럼 단위 detect_languages를 비교합니다.
+
+합성 리뷰(기본 100만 건)로 두 방식의 결과가 같은지 확인하고 시간을 비교합니다.
+
+예시:
+    python benchmarks/text_features_bench.py
+    python benchmarks/text_features_bench.py --rows 200000
+"""
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+project_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import numpy as np
+import pandas as pd
+
+from review_analysis.preprocessing.korean_tokenizer import detect_language, detect_languages
+from review_analysis.preprocessing.text_features import LEGACY_EMOJI_PATTERN, LEGACY_EMOJI_RANGES, URL_PATTERN, text_features
+
+SAMPLES = [
+    "사파리 정말 재밌었어요 판다도 봤어요",
+    "줄이 너무 길었지만 티익스프레스는 최고 👍",
+    "Great park but the lines were long 😀",
+    "예약 링크 https://www.everland.com 참고하세요",
+    "ㅋㅋㅋ 또 갈래요",
+    "Rides were fun, food was expensive.",
+]
+
+
+def synthetic_reviews(rows: int, seed: int = 42) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    first = rng.integers(0, len(SAMPLES), size=rows)
+    second = rng.integers(0, len(SAMPLES), size=rows)
+    return pd.Series([f"{SAMPLES[a]} {SAMPLES[b]}" for a, b in zip(first, second)])
+
+
+def legacy_features(texts: pd.Series) -> pd.DataFrame:
+    """이전 구현"""
+    return pd.DataFrame({
+        "text_len": texts.str.len(),
+        "word_count": texts.str.split().str.len(),
+        "text_has_emoji": texts.apply(lambda x: 1 if LEGACY_EMOJI_PATTERN.search(str(x)) else 0),
+        "text_has_url": texts.apply(lambda x: 1 if URL_PATTERN.search(str(x)) else 0),
+    })
+
+
+def vectorized_features(texts: pd.Series) -> pd.DataFrame:
+    features = text_features(texts, has_emoji_ranges=LEGACY_EMOJI_RANGES)
+    return pd.DataFrame({
+        "text_len": features["text_len"],
+        "word_count": features["word_count"],
+        "text_has_emoji": features["has_emoji"].astype(int),
+        "text_has_url": (features["url_count"] > 0).astype(int),
+    })
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Compare per-row regex flags with the single-pass text feature scanner")
+    parser.add_argument('-n', '--rows', type=int, default=1_000_000, help="Number of synthetic reviews")
+    return parser
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    texts = synthetic_reviews(args.rows)
+    print(f"합성 리뷰 {len(texts)}건")
+
+    start = time.perf_counter()
+    before = legacy_features(texts)
+    before_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = vectorized_features(texts)
+    after_s = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(before, after, check_dtype=False)
+    print(f"       before: {before_s:.2f}s")
+    print(f"text_features: {after_s:.2f}s ({before_s / after_s:.1f}배, 이모지 / URL 수와 한글 비율 포함)")
+
+    start = time.perf_counter()
+    before = texts.apply(detect_language)
+    before_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = detect_languages(texts)
+    after_s = time.perf_counter() - start
+
+    assert list(before) == list(after)
+    print(f"언어 감지 before: {before_s:.2f}s")
+    print(f"detect_languages: {after_s:.2f}s ({before_s / after_s:.1f}배)")
@@ -0,0 +1,102 @@
+"""
+리뷰 형태소 분석 처리량 벤치마크 (reviews/sec)
+
+database/reviews_*.csv의 리뷰 본문으로 다음 방식들의 처리량을 비교합니다.
+
+- before: 리뷰마다 Okt()를 새로 만드는 이전 방식
+- pooled: preprocess_korean_text (공유 Okt 분석기 풀, 리뷰 단위 호출)
+- tokenize_many: 배치 API (묶음 단위로 분석기를 빌리고 여러 스레드에서 처리)
+- processes=N: tokenize_parallel (묶음을 N개 프로세스에 분배, 워커마다 분석기 하나)
+
+예시:
+    python benchmarks/tokenize_bench.py --limit 500 --workers 4
+    python benchmarks/tokenize_bench.py --skip-before --processes 1 2 4 8 --chunk-size 128
+"""
+import glob
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Callable, List, Optional
+
+project_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pandas as pd
+
+from review_analysis.preprocessing.korean_tokenizer import (
+    OKT_POS, _preprocess, get_okt_pool, preprocess_korean_text, tokenize_many, tokenize_parallel,
+)
+
+DEFAULT_INPUTS = os.path.join(project_root, "database", "reviews_*.csv")
+
+
+def load_texts(pattern: str, limit: int) -> List[str]:
+    texts = []
+    for path in sorted(glob.glob(pattern)):
+        df = pd.read_csv(path)
+        column = next(c for c in ("content", "context", "text") if c in df.columns)
+        texts.extend(" ".join(str(t).split()) for t in df[column].dropna())
+    return texts[:limit] if limit else texts
+
+
+def legacy_okt_tokens(text: str) -> Optional[List[str]]:
+    """이전 구현: 호출마다 Okt()를 생성"""
+    try:
+        from konlpy.tag import Okt
+        okt = Okt()
+        morphs = okt.pos(text, norm=True, stem=True)
+        tokens = [word for word, pos in morphs if pos in OKT_POS]
+        return tokens if tokens else None
+    except ImportError:
+        return None
+    except Exception:
+        return None
+
+
+def measure(name: str, fn: Callable[[List[str]], List[str]], texts: List[str]) -> dict:
+    start = time.perf_counter()
+    results = fn(texts)
+    elapsed = time.perf_counter() - start
+    row = {"method": name, "seconds": round(elapsed, 3), "reviews_per_sec": round(len(texts) / elapsed, 1)}
+    print(f"{name:>14}: {row['seconds']:>8.3f}s  {row['reviews_per_sec']:>10.1f} reviews/sec")
+    return {**row, "results": results}
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Compare per-review Okt() construction with the shared analyzer pool")
+    parser.add_argument('-i', '--input', type=str, default=DEFAULT_INPUTS, help="Glob of review CSV files")
+    parser.add_argument('-n', '--limit', type=int, default=0, help="Number of reviews to tokenize (0: all)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Analyzers used by tokenize_many")
+    parser.add_argument('-p', '--processes', type=int, nargs='*', default=[],
+                        help="Process counts to measure with tokenize_parallel (e.g. 1 2 4 8)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="Reviews per chunk for tokenize_parallel")
+    parser.add_argument('--skip-before', action='store_true', help="Skip the slow per-review Okt() baseline")
+    return parser
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    texts = load_texts(args.input, args.limit)
+    print(f"리뷰 {len(texts)}건")
+
+    # 공유 풀의 첫 분석기 생성(JVM 시작 포함)은 측정에서 제외
+    with get_okt_pool().acquire() as okt:
+        if okt is None:
+            print("konlpy / JVM을 사용할 수 없어 단순 토크나이저 경로만 측정합니다.")
+
+    rows = []
+    if not args.skip_before:
+        rows.append(measure("before", lambda xs: [_preprocess(x, True, legacy_okt_tokens) for x in xs], texts))
+    rows.append(measure("pooled", lambda xs: [preprocess_korean_text(x) for x in xs], texts))
+    rows.append(measure("tokenize_many", lambda xs: tokenize_many(xs, workers=args.workers), texts))
+    for processes in args.processes:
+        # 워커 시작(spawn, 분석기 생성) 시간 포함
+        rows.append(measure(f"processes={processes}", lambda xs, p=processes: tokenize_parallel(
+            xs, processes=p, chunk_size=args.chunk_size), texts))
+
+    baseline = rows[0]
+    for row in rows[1:]:
+        assert row["results"] == baseline["results"], f"{row['method']} 결과가 {baseline['method']}와 다릅니다"
+        print(f"{row['method']}: {baseline['method']} 대비 {row['reviews_per_sec'] / baseline['reviews_per_sec']:.1f}배")
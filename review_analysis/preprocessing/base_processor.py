@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 class BaseDataProcessor:
-    def __init__(self, input_path: str, output_dir: str):
+    def __init__(self, input_path: str, output_dir: str, workers: int = 1, chunk_size: int = 256,
+                 token_cache: Optional[str] = None):
         self.input_path = input_path
         self.output_dir = output_dir
+        # 형태소 분석 프로세스 수(0이면 CPU 코어 수)와 워커에 한 번에 넘길 리뷰 수
+        self.workers = workers
+        self.chunk_size = chunk_size
+        # 형태소 분석 결과 캐시(SQLite) 경로 (None이면 사용 안 함)
+        self.token_cache = token_cache
     
     @abstractmethod
     def preprocess(self):
@@ -0,0 +1,128 @@
+"""
+전처리 결과의 Parquet 저장 / 읽기
+
+preprocessed_reviews_*.csv 옆에 같은 이름의 .parquet 파일을 함께 저장합니다. 칼럼마다 타입을 정해 두어
+(rating_group / weekday는 범주형, date는 datetime, tfidf_vector_*는 float32) 읽을 때 문자열을 다시
+파싱하지 않고, 필요한 칼럼만 골라 읽을 수 있습니다. pyarrow가 없으면 CSV만 저장 / 사용합니다.
+"""
+import glob
+import os
+from typing import Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+RATING_GROUPS = ('낮음(1-2)', '보통(3)', '높음(4-5)')
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# 날짜가 없는 리뷰(NaT)도 있으므로 날짜에서 나온 칼럼은 결측을 허용하는 정수형
+COLUMN_DTYPES = {
+    'rating': 'float64',
+    'text_len': 'int32',
+    'word_count': 'int32',
+    'is_positive': 'int8',
+    'year': 'Int16',
+    'month': 'Int8',
+    'day': 'Int8',
+    'weekday_num': 'Int8',
+    'text_has_emoji': 'int8',
+    'text_has_url': 'int8',
+}
+
+
+def _parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def parquet_available() -> bool:
+    return _parquet() is not None
+
+
+def parquet_path(csv_path: str) -> str:
+    """preprocessed_reviews_google.csv -> preprocessed_reviews_google.parquet"""
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    저장 칼럼을 Parquet에 쓸 타입으로 맞춥니다.
+    처리 중인 DataFrame과 문자열로만 읽은 중간 파일 묶음(process_streaming) 모두 같은 타입이 됩니다.
+    """
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if name == 'date':
+            values = pd.to_datetime(values, errors='coerce')
+        elif name == 'rating_group':
+            values = pd.Categorical(values, categories=RATING_GROUPS, ordered=True)
+        elif name == 'weekday':
+            values = pd.Categorical(values, categories=WEEKDAYS)
+        elif name.startswith('tfidf_vector_'):
+            values = pd.to_numeric(values, errors='coerce').astype('float32')
+        elif name in COLUMN_DTYPES:
+            values = pd.to_numeric(values, errors='coerce').astype(COLUMN_DTYPES[name])
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def write_parquet(frames: Iterable[pd.DataFrame], path: str) -> bool:
+    """
+    DataFrame(들)을 순서대로 이어 하나의 Parquet 파일로 저장합니다. (묶음마다 row group 하나)
+
+    Returns:
+        저장 여부 (pyarrow가 없으면 False)
+    """
+    pa = _parquet()
+    if pa is None:
+        return False
+    writer = None
+    try:
+        for df in frames:
+            columnar = to_columnar(df)
+            schema = writer.schema if writer is not None else None
+            table = pa.Table.from_pandas(columnar, schema=schema, preserve_index=False)
+            if writer is None:
+                writer = pa.parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return writer is not None
+
+
+def read_reviews(csv_path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    전처리된 리뷰를 읽습니다. 같은 이름의 .parquet이 CSV보다 최신이면 그것을 읽습니다.
+
+    Args:
+        csv_path: preprocessed_reviews_*.csv 경로
+        columns: 읽을 칼럼 (None이면 전체, 파일에 없는 칼럼은 무시)
+
+    CSV에서 읽어도 to_columnar로 Parquet과 같은 타입으로 맞춰 돌려줍니다.
+    """
+    path = parquet_path(csv_path)
+    pa = _parquet()
+    if pa is not None and os.path.exists(path) and (
+            not os.path.exists(csv_path) or os.path.getmtime(path) >= os.path.getmtime(csv_path)):
+        if columns is not None:
+            names = pa.parquet.read_schema(path).names
+            columns = [name for name in columns if name in names]
+        return pd.read_parquet(path, columns=columns)
+
+    usecols = None if columns is None else (lambda name, wanted=frozenset(columns): name in wanted)
+    # 빈 문자열을 NaN으로 바꾸지 않음 (숫자 / 날짜 칼럼의 빈 값은 to_columnar가 결측으로 변환)
+    df = pd.read_csv(csv_path, usecols=usecols, encoding='utf-8-sig', keep_default_na=False)
+    if columns is not None:
+        df = df[[name for name in columns if name in df.columns]]  # Parquet처럼 요청한 순서로
+    return to_columnar(df)
+
+
+def preprocessed_files(database_dir: str) -> List[str]:
+    """database_dir의 preprocessed_reviews_*.csv 경로 (Parquet만 있는 사이트도 .csv 경로로 포함)"""
+    paths = glob.glob(os.path.join(database_dir, 'preprocessed_reviews_*.csv'))
+    paths += glob.glob(os.path.join(database_dir, 'preprocessed_reviews_*.parquet'))
+    return sorted({os.path.splitext(path)[0] + '.csv' for path in paths})
@@ -1,7 +1,7 @@
-import re
 from typing import Optional, List, Any
 import pandas as pd
 from review_analysis.preprocessing.base_processor import BaseDataProcessor
+from review_analysis.preprocessing.text_features import SIMPLE_EMOJI_RANGES, text_features
 
 class ExampleProcessor(BaseDataProcessor):
     def __init__(self, input_path: Optional[str] = None, output_dir: Optional[str] = None):
@@ -38,19 +38,22 @@ class ExampleProcessor(BaseDataProcessor):
 
         print("Starting feature engineering...")
 
+        # 텍스트 길이 / 단어 수 / 이모지 / URL을 한 번에 계산
+        features = text_features(self.df['text'], emoji_ranges=SIMPLE_EMOJI_RANGES)
+
         # 1. 파생 변수 생성 (길이, 단어 수, 별점 그룹 등)
-        self._create_derived_features()
+        self._create_derived_features(features)
 
         # 2. 텍스트 특성 추출 (이모지, URL 포함 여부)
-        self._extract_content_flags()
+        self._extract_content_flags(features)
 
         return self.df
 
-    def _create_derived_features(self):
+    def _create_derived_features(self, features: pd.DataFrame):
         """텍스트 및 날짜 관련 파생변수 생성"""
         # 텍스트 길이 및 단어 수
-        self.df['text_len'] = self.df['text'].str.len()
-        self.df['word_count'] = self.df['text'].str.split().str.len()
+        self.df['text_len'] = features['text_len']
+        self.df['word_count'] = features['word_count']
 
         # 별점 기반 긍정(1)/부정(0) 분류 (4점 이상을 긍정으로 간주)
         if 'rating' in self.df.columns:
@@ -68,19 +71,10 @@ class ExampleProcessor(BaseDataProcessor):
             self.df['month'] = self.df['date'].dt.month
             self.df['weekday'] = self.df['date'].dt.day_name()
 
-    def _extract_content_flags(self):
-        """특수 콘텐츠 포함 여부 확인"""
-        # 이모지 패턴 (간이 버전)
-        emoji_pattern = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF]')
-        # URL 패턴
-        url_pattern = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
-
-        self.df['has_emoji'] = self.df['text'].apply(
-            lambda x: 1 if emoji_pattern.search(str(x)) else 0
-        )
-        self.df['has_url'] = self.df['text'].apply(
-            lambda x: 1 if url_pattern.search(str(x)) else 0
-        )
+    def _extract_content_flags(self, features: pd.DataFrame):
+        """특수 콘텐츠 포함 여부 확인 (이모지는 간이 범위 기준)"""
+        self.df['has_emoji'] = (features['emoji_count'] > 0).astype(int)
+        self.df['has_url'] = (features['url_count'] > 0).astype(int)
 
     def get_processed_data(self) -> list:
         """전처리가 완료된 데이터를 다시 MongoDB에 넣기 위해 딕셔너리 리스트로 변환"""
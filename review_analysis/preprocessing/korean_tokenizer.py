@@ -2,8 +2,34 @@
 한글 형태소 분석 유틸리티 모듈
 의존성 문제를 피하기 위한 다양한 방법 제공
 """
+import importlib.util
+import multiprocessing
+import os
+import queue
 import re
-from typing import List, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from review_analysis.preprocessing.token_cache import TokenCache, cached_map
+
+# numpy / pandas는 칼럼 단위 언어 감지에서만 쓰므로 함수 안에서 import
+# (st_app.rag.extractive가 이 모듈을 가져오므로 앱 시작 시간에 포함되지 않도록)
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Okt 품사 중 남길 것 (명사, 동사, 형용사, 부사)
+OKT_POS = ('Noun', 'Verb', 'Adjective', 'Adverb')
+
+# 전처리 규칙(정제, 품사 선택, 단순 토크나이저)을 바꾸면 올려서 캐시된 결과를 무효화
+TOKENIZER_VERSION = 1
+
+# detect_language 결과 (detect_languages가 돌려주는 범주 순서)
+LANGUAGES = ('korean', 'english', 'mixed')
+KOREAN_RATIO = 0.3  # 공백 제외 문자 중 한글 비율이 이보다 크면 korean
+ENGLISH_RATIO = 0.5  # (korean이 아니고) 영문 비율이 이보다 크면 english
 
 
 def detect_language(text: str) -> str:
@@ -33,14 +59,53 @@ def detect_language(text: str) -> str:
     korean_ratio = korean_count / total_chars
     english_ratio = english_count / total_chars
     
-    if korean_ratio > 0.3:
+    if korean_ratio > KOREAN_RATIO:
         return 'korean'
-    elif english_ratio > 0.5:
+    elif english_ratio > ENGLISH_RATIO:
         return 'english'
     else:
         return 'mixed'
 
 
+def _language_codes(texts: Sequence[str]) -> "np.ndarray":
+    """LANGUAGES 번호 배열 (한글 / 영문 / 공백 제외 문자 수를 코드포인트 배열 한 번으로 계산)"""
+    import numpy as np
+
+    from review_analysis.preprocessing.text_features import TEXT_BLOCK, char_counts
+
+    codes = []
+    for i in range(0, len(texts), TEXT_BLOCK):
+        counts = char_counts(texts[i:i + TEXT_BLOCK])
+        total = counts['nonspace']
+        korean = np.divide(counts['hangul'], total, out=np.zeros(len(total)), where=total > 0)
+        english = np.divide(counts['latin'], total, out=np.zeros(len(total)), where=total > 0)
+        block = np.where(korean > KOREAN_RATIO, 0, np.where(english > ENGLISH_RATIO, 1, 2))
+        block[total == 0] = 1  # 빈 텍스트는 english
+        codes.append(block.astype(np.int8))
+    return np.concatenate(codes) if codes else np.array([], dtype=np.int8)
+
+
+def language_labels(texts: Sequence[str]) -> List[str]:
+    """detect_language를 여러 텍스트에 한 번에 적용한 결과 (입력 순서 유지)"""
+    return [LANGUAGES[code] for code in _language_codes(list(texts))]
+
+
+def detect_languages(texts: "pd.Series") -> "pd.Series":
+    """
+    칼럼 단위 언어 감지 (결과는 리뷰마다 detect_language를 호출한 것과 같음)
+
+    Args:
+        texts: 분석할 텍스트 Series (결측치는 빈 문자열로 취급)
+
+    Returns:
+        같은 인덱스의 범주형 Series (범주: LANGUAGES)
+    """
+    import pandas as pd
+
+    codes = _language_codes(texts.fillna('').astype(str).tolist())
+    return pd.Series(pd.Categorical.from_codes(codes, categories=LANGUAGES), index=texts.index, name='language')
+
+
 def tokenize_korean_simple(text: str) -> List[str]:
     """
     간단한 한글 토크나이저 (의존성 없음)
@@ -71,9 +136,119 @@ def tokenize_korean_simple(text: str) -> List[str]:
     return filtered_tokens
 
 
+def _create_okt():
+    from konlpy.tag import Okt
+    return Okt()
+
+
+class OktPool:
+    """
+    프로세스 전체에서 공유하는 Okt 분석기 풀 (스레드 안전)
+
+    Okt()는 생성할 때마다 JVM 쪽 분석기 객체를 새로 만들므로 리뷰마다 만들지 않고 재사용합니다.
+    분석기는 처음 필요할 때 만들고, 동시에 사용하는 스레드 수만큼(최대 size개)만 늘어납니다.
+    konlpy가 없거나 JVM을 시작할 수 없으면 한 번만 시도하고 이후에는 바로 None을 돌려줍니다.
+    """
+
+    def __init__(self, size: Optional[int] = None, factory: Callable = _create_okt):
+        self.size = size or int(os.getenv('OKT_POOL_SIZE', '4'))
+        self.factory = factory
+        self.available: Optional[bool] = None  # None: 아직 만들어 보지 않음
+        self.created = 0
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def _checkout(self):
+        if self.available is False:
+            return None
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self.available is False:
+                return None
+            if self.created < self.size:
+                try:
+                    analyzer = self.factory()
+                except Exception:
+                    self.available = False
+                    return None
+                self.available = True
+                self.created += 1
+                return analyzer
+        # 모두 사용 중이면 반납될 때까지 대기
+        return self._idle.get()
+
+    @contextmanager
+    def acquire(self) -> Iterator:
+        """분석기 하나를 빌려 씁니다. (사용할 수 없으면 None)"""
+        analyzer = self._checkout()
+        try:
+            yield analyzer
+        finally:
+            if analyzer is not None:
+                self._idle.put(analyzer)
+
+
+_okt_pool: Optional[OktPool] = None
+_okt_pool_lock = threading.Lock()
+
+
+def get_okt_pool() -> OktPool:
+    """프로세스 전체에서 공유하는 OktPool (처음 호출할 때 생성)"""
+    global _okt_pool
+    if _okt_pool is None:
+        with _okt_pool_lock:
+            if _okt_pool is None:
+                _okt_pool = OktPool()
+    return _okt_pool
+
+
+def _package_version(name: str) -> str:
+    from importlib import metadata
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def tokenizer_id(use_morphology: bool = True, okt_available: Optional[bool] = None) -> str:
+    """
+    캐시 키에 쓰는 토크나이저 이름/버전 (예: "okt-0.6.0/v1", "soynlp-0.0.493/v1", "simple/v1")
+
+    okt_available을 생략하면 konlpy 설치 여부만 봅니다. (분석기를 만들지 않으므로 JVM을 시작하지 않음, 캐시 조회용)
+    분석 결과는 분석기를 실제로 사용할 수 있었는지(okt_available)를 넘겨 결과를 만든 토크나이저 이름으로 저장합니다.
+    """
+    if use_morphology and okt_available is not False and (
+            okt_available or importlib.util.find_spec('konlpy') is not None):
+        name = f"okt-{_package_version('konlpy')}"
+    elif use_morphology and importlib.util.find_spec('soynlp') is not None:
+        name = f"soynlp-{_package_version('soynlp')}"
+    else:
+        name = 'simple'
+    return f'{name}/v{TOKENIZER_VERSION}'
+
+
+def _okt_available() -> bool:
+    """공유 분석기 풀에서 Okt를 사용할 수 있는지 (처음 확인할 때 분석기를 만들어 JVM을 시작)"""
+    with get_okt_pool().acquire() as okt:
+        return okt is not None
+
+
+def _okt_tokens(okt, text: str) -> Optional[List[str]]:
+    try:
+        morphs = okt.pos(text, norm=True, stem=True)
+    except Exception:
+        return None
+    tokens = [word for word, pos in morphs if pos in OKT_POS]
+    return tokens if tokens else None
+
+
 def tokenize_korean_okt(text: str) -> Optional[List[str]]:
     """
     Okt를 사용한 한글 형태소 분석 (순수 Python, 의존성 적음)
+    공유 분석기 풀(get_okt_pool)의 분석기를 사용합니다.
     
     Args:
         text: 형태소 분석할 텍스트
@@ -81,17 +256,11 @@ def tokenize_korean_okt(text: str) -> Optional[List[str]]:
     Returns:
         형태소 리스트 또는 None (설치 안 된 경우)
     """
-    try:
-        from konlpy.tag import Okt
-        okt = Okt()
+    with get_okt_pool().acquire() as okt:
+        if okt is None:
+            return None
         # 명사, 동사, 형용사, 부사만 추출
-        morphs = okt.pos(text, norm=True, stem=True)
-        tokens = [word for word, pos in morphs if pos in ['Noun', 'Verb', 'Adjective', 'Adverb']]
-        return tokens if tokens else None
-    except ImportError:
-        return None
-    except Exception:
-        return None
+        return _okt_tokens(okt, text)
 
 
 def tokenize_korean_soynlp(text: str) -> Optional[List[str]]:
@@ -130,11 +299,16 @@ def preprocess_korean_text(text: str, use_morphology: bool = True) -> str:
     Returns:
         전처리된 텍스트 (공백으로 구분된 토큰)
     """
+    return _preprocess(text, use_morphology, tokenize_korean_okt)
+
+
+def _preprocess(text: str, use_morphology: bool, okt_tokenize: Callable[[str], Optional[List[str]]],
+                lang: Optional[str] = None) -> str:
     if not text:
         return ""
     
-    # 언어 감지
-    lang = detect_language(text)
+    # 언어 감지 (이미 감지한 결과가 있으면 사용)
+    lang = lang or detect_language(text)
     
     # 영어나 혼합 텍스트는 그대로 반환
     if lang == 'english':
@@ -143,7 +317,7 @@ def preprocess_korean_text(text: str, use_morphology: bool = True) -> str:
     # 한글 텍스트 처리
     if lang == 'korean' and use_morphology:
         # 방법 1: Okt 시도
-        tokens = tokenize_korean_okt(text)
+        tokens = okt_tokenize(text)
         if tokens:
             return ' '.join(tokens)
         
@@ -157,6 +331,113 @@ def preprocess_korean_text(text: str, use_morphology: bool = True) -> str:
     return ' '.join(tokens)
 
 
+def tokenize_many(texts: Iterable[str], use_morphology: bool = True, workers: Optional[int] = None,
+                  chunk_size: int = 256, languages: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    preprocess_korean_text의 배치 버전 (입력 순서 유지)
+
+    chunk_size개씩 나눈 묶음마다 분석기를 한 번만 빌려 쓰고, 묶음이 여러 개이면
+    최대 workers개(기본: 분석기 풀 크기) 스레드에서 나눠 처리합니다. (Okt 분석 중에는 GIL이 풀림)
+
+    Args:
+        texts: 전처리할 텍스트들
+        use_morphology: 형태소 분석 사용 여부
+        workers: 동시에 사용할 분석기 수
+        chunk_size: 한 번에 분석기를 빌려 처리할 텍스트 수
+        languages: 텍스트별 detect_language 결과 (없으면 language_labels로 한 번에 감지)
+
+    Returns:
+        전처리된 텍스트 리스트
+    """
+    texts = list(texts)
+    languages = list(languages) if languages is not None else language_labels(texts)
+    return [result for _, result in _tokenize_tagged(texts, languages, use_morphology, workers, chunk_size)]
+
+
+def _tokenize_tagged(texts: List[str], languages: Sequence[str], use_morphology: bool, workers: Optional[int],
+                     chunk_size: int) -> List[Tuple[str, str]]:
+    """tokenize_many 본체: [(결과를 만든 토크나이저 이름(tokenizer_id), 결과)]"""
+    pool = get_okt_pool()
+
+    def run(chunk: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        if not use_morphology:
+            name = tokenizer_id(False)
+            return [(name, _preprocess(text, False, tokenize_korean_okt, lang)) for text, lang in chunk]
+        with pool.acquire() as okt:
+            name = tokenizer_id(True, okt is not None)
+            okt_tokenize = (lambda text: _okt_tokens(okt, text)) if okt is not None else (lambda text: None)
+            return [(name, _preprocess(text, True, okt_tokenize, lang)) for text, lang in chunk]
+
+    pairs = list(zip(texts, languages))
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    workers = min(workers or pool.size, len(chunks))
+    if workers <= 1 or pool.available is False:
+        return [result for chunk in chunks for result in run(chunk)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='okt') as executor:
+        return [result for chunk_result in executor.map(run, chunks) for result in chunk_result]
+
+
+def _init_tokenize_worker() -> None:
+    """프로세스 풀 워커 초기화: 워커마다 분석기 하나를 미리 만들어 둠"""
+    global _okt_pool
+    _okt_pool = OktPool(size=1)
+    with _okt_pool.acquire():
+        pass
+
+
+def _tokenize_chunk(chunk: List[str], use_morphology: bool, languages: List[str]) -> List[Tuple[str, str]]:
+    return _tokenize_tagged(chunk, languages, use_morphology, workers=1, chunk_size=max(1, len(chunk)))
+
+
+def tokenize_parallel(texts: Iterable[str], use_morphology: bool = True, processes: Optional[int] = None,
+                      chunk_size: int = 256, cache: Optional[TokenCache] = None,
+                      languages: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    여러 프로세스에서 나눠 처리하는 preprocess_korean_text 배치 버전 (입력 순서 유지)
+
+    chunk_size개씩 나눈 묶음을 프로세스 풀에 분배하며, 워커마다 분석기(JVM 포함)를 하나씩 둡니다.
+    워커는 spawn으로 시작하므로 부모 프로세스에서 이미 시작한 JVM을 물려받지 않습니다.
+    processes가 1이거나 묶음이 하나뿐이면 현재 프로세스에서 tokenize_many로 처리합니다.
+    cache를 넘기면 캐시에 없는 본문만 분석합니다. (review_analysis.preprocessing.token_cache)
+
+    Args:
+        texts: 전처리할 텍스트들
+        use_morphology: 형태소 분석 사용 여부
+        processes: 워커 프로세스 수 (None 또는 0이면 CPU 코어 수)
+        chunk_size: 워커에 한 번에 넘길 텍스트 수
+        cache: 형태소 분석 결과 캐시
+        languages: 텍스트별 detect_language 결과 (예: detect_languages로 구한 칼럼, 없으면 여기서 한 번에 감지)
+
+    Returns:
+        전처리된 텍스트 리스트
+    """
+    texts = list(texts)
+    languages = list(languages) if languages is not None else language_labels(texts)
+    if cache is not None:
+        # 조회는 설치된 분석기 기준으로 하고, 캐시에 없는 본문이 있을 때만 Okt를 실제로 쓸 수 있는지 확인
+        # (JVM을 시작할 수 없으면 대체 토크나이저 이름으로 다시 조회하고, 결과는 만든 토크나이저 이름으로 저장)
+        language_of = dict(zip(texts, languages))
+        return cached_map(texts, tokenizer_id(use_morphology), cache,
+                          lambda missing: _tokenize_parallel_tagged(missing, [language_of[text] for text in missing],
+                                                                    use_morphology, processes, chunk_size),
+                          resolve=lambda: tokenizer_id(use_morphology, _okt_available() if use_morphology else None))
+    return [result for _, result in _tokenize_parallel_tagged(texts, languages, use_morphology, processes, chunk_size)]
+
+
+def _tokenize_parallel_tagged(texts: List[str], languages: List[str], use_morphology: bool,
+                              processes: Optional[int], chunk_size: int) -> List[Tuple[str, str]]:
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    processes = min(processes or os.cpu_count() or 1, len(chunks))
+    if processes <= 1:
+        return _tokenize_tagged(texts, languages, use_morphology, None, chunk_size)
+
+    language_chunks = [languages[i:i + chunk_size] for i in range(0, len(languages), chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_tokenize_worker) as executor:
+        results = executor.map(_tokenize_chunk, chunks, [use_morphology] * len(chunks), language_chunks)
+        return [result for chunk_result in results for result in chunk_result]
+
+
 def get_korean_stopwords() -> List[str]:
     """
     한글 불용어 리스트를 반환합니다.
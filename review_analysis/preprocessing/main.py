@@ -15,6 +15,7 @@ from review_analysis.preprocessing.example_processor import ExampleProcessor
 from review_analysis.preprocessing.tripcom_processor import TripComProcessor
 from review_analysis.preprocessing.google_processor import GoogleProcessor
 from review_analysis.preprocessing.kakao_processor import KakaoProcessor
+from review_analysis.preprocessing.review_processor import ReviewProcessor
 
 
 # 모든 preprocessing 클래스를 예시 형식으로 적어주세요. 
@@ -36,6 +37,20 @@ def create_parser() -> ArgumentParser:
                         help=f"Which processor to use. Choices: {', '.join(PREPROCESS_CLASSES.keys())}")
     parser.add_argument('-a', '--all', action='store_true',
                         help="Run all data preprocessors. Default to False.")    
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="Processes used for Korean morphological analysis (0: one per CPU core). Default to 1.")
+    parser.add_argument('--chunk-size', type=int, default=256,
+                        help="Reviews sent to a tokenizer process at a time. Default to 256.")
+    parser.add_argument('--token-cache', type=str, default=None,
+                        help="SQLite cache of tokenized reviews. Default to <output_dir>/token_cache.sqlite")
+    parser.add_argument('--no-token-cache', action='store_true',
+                        help="Re-tokenize every review without reading or writing the cache.")
+    parser.add_argument('--stream', action='store_true',
+                        help="Read each CSV in chunks instead of loading it whole (for files larger than memory).")
+    parser.add_argument('--rows-per-chunk', type=int, default=50000,
+                        help="Rows read at a time with --stream. Default to 50000.")
+    parser.add_argument('--no-parquet', action='store_true',
+                        help="Write only the CSV, without the .parquet copy next to it.")
     return parser
 
 if __name__ == "__main__":
@@ -44,13 +59,22 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     os.makedirs(args.output_dir, exist_ok=True)
+    token_cache = None if args.no_token_cache else (
+        args.token_cache or os.path.join(args.output_dir, "token_cache.sqlite")
+    )
 
     if args.all: 
         for csv_file in REVIEW_COLLECTIONS:
             base_name = os.path.splitext(os.path.basename(csv_file))[0]
             if base_name in PREPROCESS_CLASSES:
                 preprocessor_class = PREPROCESS_CLASSES[base_name]
-                preprocessor = preprocessor_class(csv_file, args.output_dir)
+                preprocessor = preprocessor_class(csv_file, args.output_dir, args.workers, args.chunk_size,
+                                                 token_cache)
+                if isinstance(preprocessor, ReviewProcessor):
+                    preprocessor.parquet = not args.no_parquet
+                if args.stream and isinstance(preprocessor, ReviewProcessor):
+                    preprocessor.process_streaming(args.rows_per_chunk)
+                    continue
                 preprocessor.preprocess()
                 preprocessor.feature_engineering()
                 preprocessor.save_to_database()
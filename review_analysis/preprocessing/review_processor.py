@@ -0,0 +1,677 @@
+"""
+설정 기반 리뷰 전처리 / 피처 엔지니어링 파이프라인
+
+사이트별 차이(칼럼 이름, 날짜 형식, 이상치 규칙, 형태소 분석 여부, 저장 파일)는 SourceConfig로 선언하고,
+처리 로직은 ReviewProcessor 하나에 모아 모든 사이트에 같은 최적화가 적용되도록 합니다.
+각 단계는 이름으로 조합할 수 있고(preprocess_stages / feature_stages) 실행 시간이 timings에 기록됩니다.
+"""
+import contextlib
+import functools
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from numbers import Integral
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from review_analysis.preprocessing.base_processor import BaseDataProcessor
+from review_analysis.preprocessing.columnar import parquet_path, write_parquet
+from review_analysis.preprocessing.korean_tokenizer import detect_languages, tokenize_parallel
+from review_analysis.preprocessing.text_features import LEGACY_EMOJI_RANGES, text_features
+from review_analysis.preprocessing.token_cache import open_token_cache
+
+
+def parse_dotted_date(dates: pd.Series) -> pd.Series:
+    """Google Maps / Kakao Map 날짜 형식: 2026.1.10. 또는 2026.01.10."""
+    return pd.to_datetime(
+        dates.str.replace('.', '-', regex=False).str.rstrip('-'),
+        errors='coerce',
+        format='%Y-%m-%d'
+    )
+
+
+def parse_english_date(dates: pd.Series) -> pd.Series:
+    """Trip.com 날짜 형식: Jan 10, 2026"""
+    return pd.to_datetime(dates, errors='coerce', format='%b %d, %Y')
+
+
+@dataclass(frozen=True)
+class SourceConfig:
+    """
+    리뷰 출처(사이트)별 전처리 설정
+
+    - text_columns: context로 이름을 바꿀 본문 칼럼 후보 (앞에 있는 것 우선)
+    - rating_range: 이 범위를 벗어난 별점 제거 (None이면 검사 안 함)
+    - tokenize: 한글 형태소 분석 여부 (False면 정제된 본문을 그대로 분석에 사용)
+    - tfidf_stop_words: TfidfVectorizer의 stop_words
+    - output_columns: 저장할 칼럼 순서 (None이면 context_tokenized를 뺀 전체, tfidf_vector_*는 항상 뒤에 추가)
+    """
+
+    name: str
+    output_file: str
+    parse_date: Callable[[pd.Series], pd.Series]
+    text_columns: Tuple[str, ...] = ('content', 'text')
+    rating_range: Optional[Tuple[float, float]] = (1.0, 5.0)
+    year_range: Tuple[int, int] = (2019, 2026)
+    min_text_len: int = 3
+    tokenize: bool = True
+    tfidf_stop_words: Optional[str] = None
+    output_columns: Optional[Tuple[str, ...]] = None
+
+    @property
+    def analysis_column(self) -> str:
+        """단어 수, TF-IDF, 키워드 계산에 쓰는 칼럼"""
+        return 'context_tokenized' if self.tokenize else 'context_cleaned'
+
+
+GOOGLE = SourceConfig(
+    name='google',
+    output_file='preprocessed_reviews_google.csv',
+    parse_date=parse_dotted_date,
+)
+
+KAKAO = SourceConfig(
+    name='kakao',
+    output_file='preprocessed_reviews_kakao.csv',
+    parse_date=parse_dotted_date,
+)
+
+TRIPCOM = SourceConfig(
+    name='tripcom',
+    output_file='preprocessed_reviews_tripcom.csv',
+    parse_date=parse_english_date,
+    text_columns=('text', 'content'),
+    rating_range=None,
+    tokenize=False,
+    tfidf_stop_words='english',
+    output_columns=(
+        'rating', 'date', 'context', 'context_cleaned',
+        'text_len', 'word_count',
+        'rating_group', 'is_positive',
+        'year', 'month', 'day', 'weekday', 'weekday_num', 'year_month',
+        'text_has_emoji', 'text_has_url',
+        'top_keywords',
+    ),
+)
+
+SOURCE_CONFIGS: Dict[str, SourceConfig] = {config.name: config for config in (GOOGLE, KAKAO, TRIPCOM)}
+
+
+def clean_text(text: str) -> str:
+    """줄바꿈을 공백으로, 연속된 공백을 하나로, 앞뒤 공백 제거"""
+    if pd.isna(text):
+        return ""
+    text = str(text)
+    text = text.replace('\n', ' ').replace('\r', ' ')
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def top_keywords(tfidf_matrix, feature_names, top_n: int = 5) -> List[str]:
+    """
+    TF-IDF 행렬의 각 행에서 점수가 높은 단어 top_n개를 ", "로 이어 돌려줍니다.
+
+    리뷰마다 vectorizer.transform을 다시 하지 않고 fit_transform 결과(CSR)의 0이 아닌 값 전체를
+    (행, 점수 내림차순, 단어 번호 오름차순)으로 한 번에 정렬한 뒤 행별로 앞에서 top_n개씩 자릅니다.
+    점수가 같으면 단어 번호가 작은 것이 먼저이며, 0이 아닌 값이 없는 행은 빈 문자열입니다.
+    """
+    matrix = tfidf_matrix.tocsr(copy=True)
+    matrix.eliminate_zeros()
+    n_rows = matrix.shape[0]
+    counts = np.diff(matrix.indptr)
+    rows = np.repeat(np.arange(n_rows), counts)
+
+    order = np.lexsort((matrix.indices, -matrix.data, rows))
+    # 행 기준으로 정렬되어 있으므로 행 안에서의 순위 = 위치 - 행 시작 위치
+    rank = np.arange(len(order)) - np.repeat(matrix.indptr[:-1], counts)
+    keep = order[rank < top_n]
+
+    words = np.asarray(feature_names, dtype=object)[matrix.indices[keep]]
+    bounds = np.searchsorted(rows[keep], np.arange(n_rows + 1))
+    return [', '.join(words[bounds[i]:bounds[i + 1]]) for i in range(n_rows)]
+
+
+def _reset_peak_rss() -> None:
+    """최대 RSS(VmHWM)를 현재 RSS로 초기화합니다. (Linux 전용, 지원하지 않으면 무시)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    최대 RSS(MB). Linux에서는 마지막 _reset_peak_rss() 이후의 최대값(VmHWM),
+    그 밖의 Unix에서는 프로세스 시작 이후의 최대값, 측정할 수 없으면(Windows) None
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _copy_on_write(method):
+    """
+    메서드 안의 pandas 연산을 Copy-on-Write 모드로 실행합니다. (pandas 3.0부터 기본값)
+    rename / drop / 칼럼 선택이 데이터를 복사하지 않고, 실제로 값을 바꿀 때만 해당 칼럼을 복사합니다.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with pd.option_context('mode.copy_on_write', True):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def _order_row_entries(matrix, keys: np.ndarray):
+    """CSR 행렬의 각 행 안의 원소를 keys[열 번호] 순으로 재배치합니다. (값은 그대로)"""
+    matrix = matrix.tocsr()
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    order = np.lexsort((keys[matrix.indices], rows))
+    matrix.indices = matrix.indices[order]
+    matrix.data = matrix.data[order]
+    matrix.has_sorted_indices = False
+    return matrix
+
+
+class ReviewProcessor(BaseDataProcessor):
+    """
+    SourceConfig에 따라 리뷰 CSV를 전처리하고 피처 엔지니어링을 수행하는 클래스
+
+    preprocess()와 feature_engineering()은 각각 preprocess_stages / feature_stages의 단계를 차례로 실행합니다.
+    단계 이름 X는 메서드 _stage_X에 대응하며, 단계 목록을 바꿔 일부만 실행하거나 순서를 조정할 수 있습니다.
+    메모리에 다 올리기 어려운 CSV는 process_streaming()으로 묶음 단위로 처리합니다.
+
+    단계들은 Copy-on-Write 모드에서 하나의 DataFrame(self.df)을 이어 받아 칼럼을 추가하며,
+    processed_df도 복사본이 아니라 같은 DataFrame을 가리킵니다. 행을 거르는 단계만 새 DataFrame을 만듭니다.
+    """
+
+    PREPROCESS_STAGES: Tuple[str, ...] = (
+        'load', 'rename_columns', 'parse_dates', 'fill_missing', 'handle_outliers', 'clean_text', 'detect_language',
+        'tokenize',
+    )
+    FEATURE_STAGES: Tuple[str, ...] = ('derived_features', 'vectorize')
+    # 코퍼스 전체가 필요한 단계 (process_streaming에서 묶음별로 실행하지 않음)
+    CORPUS_STAGES: Tuple[str, ...] = ('load', 'vectorize')
+
+    config: SourceConfig
+
+    def __init__(self, input_path: str, output_dir: str, workers: int = 1, chunk_size: int = 256,
+                 token_cache: Optional[str] = None, config: Optional[SourceConfig] = None,
+                 preprocess_stages: Optional[Tuple[str, ...]] = None,
+                 feature_stages: Optional[Tuple[str, ...]] = None):
+        super().__init__(input_path, output_dir, workers, chunk_size, token_cache)
+        if config is not None:
+            self.config = config
+        self.preprocess_stages = preprocess_stages or self.PREPROCESS_STAGES
+        self.feature_stages = feature_stages or self.FEATURE_STAGES
+        self.df: Optional[pd.DataFrame] = None
+        self.processed_df: Optional[pd.DataFrame] = None
+        self.timings: Dict[str, float] = {}
+        self.peak_rss: Dict[str, float] = {}  # 단계별 최대 RSS(MB)
+        # rating 결측치를 채울 값 (None이면 현재 데이터의 평균, process_streaming에서는 파일 전체 평균)
+        self.rating_fill: Optional[float] = None
+        # 저장할 때 CSV 옆에 같은 이름의 .parquet도 저장 (pyarrow가 없으면 건너뜀)
+        self.parquet = True
+
+    def run_stage(self, name: str) -> None:
+        """단계 하나를 실행하고 걸린 시간(초)을 timings에 더하고, 단계 중 최대 RSS를 peak_rss에 기록합니다."""
+        stage: Callable[[], None] = getattr(self, f'_stage_{name}')
+        _reset_peak_rss()
+        start = time.perf_counter()
+        stage()
+        self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+        self._record_peak_rss(name)
+
+    def _record_peak_rss(self, name: str) -> None:
+        peak = peak_rss_mb()
+        if peak is not None:
+            self.peak_rss[name] = max(self.peak_rss.get(name, 0.0), peak)
+
+    @_copy_on_write
+    def preprocess(self):
+        """
+        데이터 전처리 수행
+        - 칼럼명 통일 (content / text -> context)
+        - 날짜 데이터 형식 변환
+        - 결측치 처리
+        - 이상치 처리
+        - 텍스트 전처리 (설정에 따라 한글 형태소 분석 포함)
+        """
+        for name in self.preprocess_stages:
+            self.run_stage(name)
+        print(f"\n전처리 완료. 최종 데이터 shape: {self.df.shape}")
+        self.processed_df = self.df
+
+    @_copy_on_write
+    def feature_engineering(self):
+        """
+        피처 엔지니어링 수행
+        - 파생 변수 생성
+        - 텍스트 벡터화
+        """
+        if self.processed_df is None:
+            raise ValueError("전처리를 먼저 수행해주세요.")
+        print("\n[피처 엔지니어링 시작]")
+        self.df = self.processed_df
+        for name in self.feature_stages:
+            self.run_stage(name)
+        self.processed_df = self.df
+        print(f"\n피처 엔지니어링 완료. 최종 데이터 shape: {self.df.shape}")
+        self.print_timings()
+
+    def print_timings(self) -> None:
+        total = sum(self.timings.values())
+        print(f"\n[단계별 시간] ({self.config.name}, 총 {total:.2f}s)")
+        for name, seconds in self.timings.items():
+            rss = f", 최대 RSS {self.peak_rss[name]:.0f}MB" if name in self.peak_rss else ""
+            print(f"  - {name}: {seconds:.3f}s{rss}")
+
+    # ---- 전처리 단계 ----
+
+    def _stage_load(self):
+        print(f"Loading data from {self.input_path}...")
+        self.df = pd.read_csv(self.input_path)
+        print(f"Original data shape: {self.df.shape}")
+
+    def _stage_rename_columns(self):
+        print("\n[1] 칼럼명 통일 중...")
+        for column in self.config.text_columns:
+            if column in self.df.columns:
+                self.df = self.df.rename(columns={column: 'context'})
+                break
+        print(f"  - 칼럼명 통일 완료: context")
+
+    def _stage_parse_dates(self):
+        print("\n[2] 날짜 데이터 형식 변환 중...")
+        self.df['date'] = self.config.parse_date(self.df['date'])
+        print(f"  - 날짜 형식 변환 완료")
+
+    def _stage_fill_missing(self):
+        print("\n[3] 결측치 처리 중...")
+        initial_count = len(self.df)
+
+        # rating 결측치: 평균값으로 대체
+        if self.df['rating'].isna().any():
+            missing = self.df['rating'].isna().sum()
+            fill = self.rating_fill if self.rating_fill is not None else self.df['rating'].mean()
+            self.df['rating'] = self.df['rating'].fillna(fill)
+            print(f"  - rating 결측치 평균값으로 대체: {missing}개")
+
+        # context, date 결측치: 해당 행 삭제
+        before_drop = len(self.df)
+        self.df = self.df.dropna(subset=['context', 'date'])
+        dropped = before_drop - len(self.df)
+        if dropped > 0:
+            print(f"  - context/date 결측치 제거: {dropped}개 행 삭제")
+
+        print(f"  - 결측치 처리 완료: {initial_count} -> {len(self.df)} rows")
+
+    def _stage_handle_outliers(self):
+        """
+        이상치 처리
+        - 별점 이상치: rating_range를 벗어난 값 제거
+        - 기간 이상치: year_range 밖의 데이터 제거
+        - 텍스트 이상치: min_text_len자 미만 리뷰 제거
+        """
+        print("\n[4] 이상치 처리 중...")
+        initial_count = len(self.df)
+        config = self.config
+
+        # 규칙마다 거르지 않고 남길 행 마스크를 모아 마지막에 한 번만 거름
+        # (개수는 앞 규칙에서 이미 제거된 행을 빼고 셈)
+        keep = pd.Series(True, index=self.df.index)
+        if config.rating_range is not None:
+            low, high = config.rating_range
+            rating_outliers = (self.df['rating'] < low) | (self.df['rating'] > high)
+            print(f"  - 별점 이상치 제거: {(rating_outliers & keep).sum()}개")
+            keep &= ~rating_outliers
+
+        first_year, last_year = config.year_range
+        self.df['year'] = self.df['date'].dt.year
+        date_outliers = (self.df['year'] < first_year) | (self.df['year'] > last_year)
+        print(f"  - 기간 이상치 제거 ({first_year}년 이전, {last_year}년 이후): {(date_outliers & keep).sum()}개")
+        keep &= ~date_outliers
+
+        text_outliers = self.df['context'].str.len() < config.min_text_len
+        print(f"  - 텍스트 이상치 제거 ({config.min_text_len}자 미만): {(text_outliers & keep).sum()}개")
+        keep &= ~text_outliers
+
+        if not keep.all():
+            self.df = self.df[keep]
+        print(f"  - 총 이상치 제거: {initial_count} -> {len(self.df)} rows")
+
+    def _stage_clean_text(self):
+        print("\n[5] 텍스트 전처리 중...")
+        self.df['context_cleaned'] = self.df['context'].apply(clean_text)
+        if not self.config.tokenize:
+            self._drop_empty('context_cleaned')
+
+    def _stage_detect_language(self):
+        # 칼럼 전체를 한 번에 감지하고 이후 단계(형태소 분석)에서 다시 감지하지 않고 사용
+        self.df['language'] = detect_languages(self.df['context_cleaned'])
+        counts = self.df['language'].value_counts()
+        print("  - 언어 감지: " + ", ".join(f"{lang} {count}" for lang, count in counts.items()))
+
+    def _stage_tokenize(self):
+        if not self.config.tokenize:
+            return
+        # 묶음 단위로 여러 프로세스에서 분석 (workers=1이면 현재 프로세스의 공유 분석기 풀 사용)
+        # 캐시가 있으면 이전 실행에서 분석한 본문은 건너뜀
+        print("  - 한글 형태소 분석 수행 중...")
+        cache = open_token_cache(self.token_cache)
+        try:
+            self.df['context_tokenized'] = tokenize_parallel(
+                self.df['context_cleaned'].tolist(), use_morphology=True,
+                processes=self.workers, chunk_size=self.chunk_size, cache=cache,
+                languages=self.df['language'].tolist() if 'language' in self.df.columns else None,
+            )
+            if cache is not None:
+                print(f"  - 형태소 분석 캐시: {cache.hits}건 재사용, {cache.misses}건 새로 분석")
+        finally:
+            if cache is not None:
+                cache.close()
+        self._drop_empty('context_tokenized')
+
+    def _drop_empty(self, column: str) -> None:
+        empty_text = self.df[column].str.len() == 0
+        if empty_text.any():
+            self.df = self.df[~empty_text]
+            print(f"  - 빈 텍스트 제거: {empty_text.sum()}개")
+        print(f"  - 텍스트 전처리 완료: {len(self.df)} rows")
+
+    # ---- 피처 엔지니어링 단계 ----
+
+    def _stage_derived_features(self):
+        """
+        파생 변수 생성
+        - text_len, word_count: 텍스트 길이 (문자 수), 단어 수
+        - rating_group, is_positive: 별점 그룹 (낮음/보통/높음), 긍정 리뷰 여부 (별점 4 이상)
+        - year, month, day, weekday, weekday_num, year_month: 날짜 관련 변수
+        - text_has_emoji, text_has_url: 이모지 / URL 포함 여부
+        """
+        # 텍스트 특성 (길이, 이모지 / URL 수)을 한 번에 계산
+        # text_has_emoji는 이전 정규식 범위로 (이전 결과와 같게), emoji_count는 한글을 뺀 이모지 범위로
+        features = text_features(self.df['context_cleaned'], has_emoji_ranges=LEGACY_EMOJI_RANGES)
+        self.df['text_len'] = features['text_len']
+        if self.config.analysis_column == 'context_cleaned':
+            self.df['word_count'] = features['word_count']
+        else:
+            self.df['word_count'] = text_features(self.df[self.config.analysis_column])['word_count']
+
+        # 별점 관련
+        self.df['rating_group'] = pd.cut(
+            self.df['rating'],
+            bins=[0, 2, 3, 5],
+            labels=['낮음(1-2)', '보통(3)', '높음(4-5)']
+        )
+        self.df['is_positive'] = (self.df['rating'] >= 4).astype(int)
+
+        # 날짜 관련
+        self.df['year'] = self.df['date'].dt.year
+        self.df['month'] = self.df['date'].dt.month
+        self.df['day'] = self.df['date'].dt.day
+        self.df['weekday'] = self.df['date'].dt.day_name()
+        self.df['weekday_num'] = self.df['date'].dt.dayofweek  # 0=월요일, 6=일요일
+        self.df['year_month'] = self.df['date'].dt.to_period('M').astype(str)
+
+        # 텍스트 특성
+        self.df['text_has_emoji'] = features['has_emoji'].astype(int)
+        self.df['text_has_url'] = (features['url_count'] > 0).astype(int)
+
+        print("  - 파생 변수 생성 완료")
+
+    def _stage_vectorize(self):
+        """
+        텍스트 벡터화
+        - TF-IDF 벡터화 후 20차원으로 축소
+        - 리뷰별 상위 5개 키워드 추출
+        """
+        vectors = self._vectorize(self.df[self.config.analysis_column])
+        if vectors is not None:
+            for column in vectors.columns:
+                self.df[column] = vectors[column].to_numpy()
+
+    def _tfidf_params(self) -> dict:
+        return dict(
+            max_features=100,  # 상위 100개 단어만 사용
+            stop_words=self.config.tfidf_stop_words,
+            ngram_range=(1, 2),  # 1-gram과 2-gram 사용
+            min_df=2,  # 최소 2개 문서에 등장해야 함
+            max_df=0.95  # 95% 이상 문서에 등장하면 제외
+        )
+
+    def _vectorize(self, texts: Iterable[str], vocabulary: Optional[Dict[str, int]] = None,
+                   first_seen: Optional[np.ndarray] = None) -> Optional[pd.DataFrame]:
+        """
+        texts 전체로 TF-IDF / SVD를 학습해 tfidf_vector_1..20, top_keywords 칼럼을 만듭니다.
+        texts는 한 번만 순회하므로 파일에서 읽어 오는 generator여도 됩니다. (sklearn이 없으면 None)
+        vocabulary, first_seen(_fit_vocabulary 결과)을 주면 단어 선택은 건너뛰고 IDF만 학습합니다.
+        """
+        try:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            from sklearn.decomposition import TruncatedSVD
+            from sklearn.preprocessing import normalize
+        except ImportError:
+            print("  - 경고: sklearn이 설치되지 않아 텍스트 벡터화를 건너뜁니다.")
+            print("    pip install scikit-learn으로 설치해주세요.")
+            return None
+
+        print("  - TF-IDF 벡터화 수행 중...")
+        if vocabulary is None:
+            tfidf = TfidfVectorizer(**self._tfidf_params())
+            tfidf_matrix = tfidf.fit_transform(texts)
+        else:
+            # 어휘를 고정하면 행 안의 원소가 단어 번호 순이 되므로, 어휘를 학습할 때처럼 코퍼스에 처음 나온 순서로
+            # 되돌린 뒤 정규화해야 (합산 순서가 같아) 정규화 값과 SVD 결과가 어휘를 학습한 경우와 똑같습니다.
+            tfidf = TfidfVectorizer(**self._tfidf_params(), vocabulary=vocabulary, norm=None)
+            tfidf_matrix = normalize(_order_row_entries(tfidf.fit_transform(texts), first_seen), copy=False)
+
+        print("  - 차원 축소 수행 중...")
+        svd = TruncatedSVD(n_components=20, random_state=42)
+        text_vectors = svd.fit_transform(tfidf_matrix)
+
+        vectors = pd.DataFrame({f'tfidf_vector_{i+1}': text_vectors[:, i] for i in range(text_vectors.shape[1])})
+
+        # 리뷰별 상위 5개 키워드 (이미 계산한 tfidf_matrix에서 한 번에 추출)
+        vectors['top_keywords'] = top_keywords(tfidf_matrix, tfidf.get_feature_names_out(), top_n=5)
+
+        print(f"  - TF-IDF 벡터화 완료: {text_vectors.shape[1]}차원 벡터 생성")
+        print(f"  - 주요 키워드 추출 완료")
+        return vectors
+
+    def _fit_vocabulary(self, texts: Iterable[str]) -> Tuple[Dict[str, int], np.ndarray]:
+        """
+        TfidfVectorizer.fit과 같은 단어 선택(min_df / max_df / max_features)을 문서-단어 행렬 없이 수행합니다.
+        texts를 한 번 순회하며 단어별 문서 빈도와 전체 빈도만 세므로 메모리는 어휘 크기에만 비례합니다.
+
+        Returns:
+            (어휘 {단어: 번호}, 단어 번호별로 코퍼스에 처음 나온 순위)
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        params = self._tfidf_params()
+        analyze = TfidfVectorizer(**params).build_analyzer()
+        term_counts: Dict[str, int] = {}
+        doc_counts: Dict[str, int] = {}
+        n_doc = 0
+        for text in texts:
+            n_doc += 1
+            for term, count in Counter(analyze(text)).items():
+                term_counts[term] = term_counts.get(term, 0) + count
+                doc_counts[term] = doc_counts.get(term, 0) + 1
+
+        # CountVectorizer._limit_features와 같은 순서로 계산 (단어 정렬 -> 문서 빈도 필터 -> 전체 빈도 상위)
+        terms = sorted(term_counts)
+        dfs = np.array([doc_counts[term] for term in terms], dtype=np.int64)
+        tfs = np.array([term_counts[term] for term in terms], dtype=np.int64)
+        max_df, min_df, limit = params['max_df'], params['min_df'], params['max_features']
+        high = max_df if isinstance(max_df, Integral) else max_df * n_doc
+        low = min_df if isinstance(min_df, Integral) else min_df * n_doc
+        mask = (dfs <= high) & (dfs >= low)
+        if limit is not None and mask.sum() > limit:
+            mask_inds = (-tfs[mask]).argsort()[:limit]
+            new_mask = np.zeros(len(dfs), dtype=bool)
+            new_mask[np.where(mask)[0][mask_inds]] = True
+            mask = new_mask
+        kept = [term for term, keep in zip(terms, mask) if keep]
+        if not kept:
+            raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+        first_seen = {term: i for i, term in enumerate(term_counts)}  # dict는 처음 넣은 순서 유지
+        return {term: i for i, term in enumerate(kept)}, np.array([first_seen[term] for term in kept], dtype=np.int64)
+
+    # ---- 저장 ----
+
+    @_copy_on_write
+    def output_frame(self) -> pd.DataFrame:
+        """저장할 칼럼만 남긴 결과 (output_columns 순서, tfidf_vector_*는 뒤에)"""
+        if self.processed_df is None:
+            raise ValueError("전처리된 데이터가 없습니다. preprocess()와 feature_engineering()을 먼저 실행하세요.")
+        return self._select_output(self.processed_df)
+
+    def _select_output(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.config.output_columns is None:
+            # context_tokenized, language는 저장하지 않고 context_cleaned만 저장
+            return df.drop(columns=['context_tokenized', 'language'], errors='ignore')
+        tfidf_columns = [col for col in df.columns if col.startswith('tfidf_vector_')]
+        columns: List[str] = [col for col in (*self.config.output_columns, *tfidf_columns) if col in df.columns]
+        return df[columns]
+
+    @_copy_on_write
+    def save_to_database(self):
+        """
+        전처리된 데이터를 database 폴더에 저장 (파일명: SourceConfig.output_file)
+        """
+        _reset_peak_rss()
+        save_df = self.output_frame()
+        os.makedirs(self.output_dir, exist_ok=True)
+        output_path = os.path.join(self.output_dir, self.config.output_file)
+        save_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+        saved_parquet = self.parquet and write_parquet([save_df], parquet_path(output_path))
+        self._record_peak_rss('save')
+
+        print(f"\n[저장 완료]")
+        print(f"  - 저장 경로: {output_path}")
+        if saved_parquet:
+            print(f"  - Parquet: {parquet_path(output_path)}")
+        print(f"  - 데이터 행 수: {len(save_df)}")
+        print(f"  - 데이터 열 수: {len(save_df.columns)}")
+        if 'save' in self.peak_rss:
+            print(f"  - 최대 RSS: {self.peak_rss['save']:.0f}MB")
+
+    # ---- 묶음 단위 처리 ----
+
+    @_copy_on_write
+    def process_streaming(self, rows_per_chunk: int = 50_000) -> str:
+        """
+        입력 CSV를 rows_per_chunk행씩 읽어 전처리 / 피처 엔지니어링 / 저장을 한 번에 수행합니다.
+        메모리에는 한 묶음과 코퍼스 단위 결과(리뷰별 벡터, 키워드)만 올라갑니다.
+
+        1. rating 칼럼만 훑어 결측치를 채울 평균 계산
+        2. 묶음마다 행 단위 단계(CORPUS_STAGES를 뺀 전처리 / 피처 단계)를 실행하고 중간 파일에 이어 씀
+        3. 중간 파일의 분석 칼럼을 두 번 읽으며 어휘 선택(_fit_vocabulary), TF-IDF / SVD 학습 (vectorize)
+        4. 중간 파일을 묶음 단위로 읽어 벡터 / 키워드를 붙이고 출력 파일에 이어 씀
+
+        결과 파일은 preprocess() -> feature_engineering() -> save_to_database()와 같습니다.
+        (processed_df는 만들지 않습니다.)
+
+        Returns:
+            저장 경로
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        output_path = os.path.join(self.output_dir, self.config.output_file)
+        stages = [name for name in (*self.preprocess_stages, *self.feature_stages) if name not in self.CORPUS_STAGES]
+        print(f"\n[묶음 처리] {self.input_path} ({rows_per_chunk}행씩)")
+
+        # 1. 결측치를 채울 별점 평균 (이상치 제거 전 전체 평균, preprocess()와 같음)
+        total, count = 0.0, 0
+        for chunk in pd.read_csv(self.input_path, usecols=['rating'], chunksize=rows_per_chunk):
+            total += chunk['rating'].sum()
+            count += chunk['rating'].count()
+        self.rating_fill = total / count if count else None
+
+        fd, spill_path = tempfile.mkstemp(prefix=f'{self.config.name}_', suffix='.csv', dir=self.output_dir)
+        os.close(fd)
+        try:
+            # 2. 행 단위 단계
+            rows = 0
+            with open(spill_path, 'w', encoding='utf-8', newline='') as spill:
+                for i, chunk in enumerate(pd.read_csv(self.input_path, chunksize=rows_per_chunk)):
+                    self.df = chunk
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        for name in stages:
+                            self.run_stage(name)
+                    self.df.to_csv(spill, index=False, header=(i == 0))
+                    rows += len(self.df)
+                    print(f"  - 묶음 {i + 1}: {len(chunk)} -> {len(self.df)} rows")
+            self.df = None
+
+            # 3. 코퍼스 단위 단계: 어휘 선택과 IDF / SVD 학습을 중간 파일을 두 번 읽어 수행
+            vectors = None
+            if 'vectorize' in self.feature_stages:
+                column = self.config.analysis_column
+
+                def texts():
+                    for chunk in self._read_spill(spill_path, rows_per_chunk, [column]):
+                        yield from chunk[column]
+
+                _reset_peak_rss()
+                start = time.perf_counter()
+                vocabulary, first_seen = self._fit_vocabulary(texts())
+                vectors = self._vectorize(texts(), vocabulary=vocabulary, first_seen=first_seen)
+                self.timings['vectorize'] = self.timings.get('vectorize', 0.0) + time.perf_counter() - start
+                self._record_peak_rss('vectorize')
+
+            # 4. 저장 (중간 파일은 문자열 그대로 읽어 값이 바뀌지 않게 함, Parquet에는 묶음마다 row group 하나)
+            columns = 0
+            saved_parquet = False
+            with open(output_path, 'w', encoding='utf-8-sig', newline='') as output:
+                def saved_chunks():
+                    nonlocal columns
+                    offset = 0
+                    for i, chunk in enumerate(self._read_spill(spill_path, rows_per_chunk)):
+                        if vectors is not None:
+                            part = vectors.iloc[offset:offset + len(chunk)].set_axis(chunk.index)
+                            chunk = pd.concat([chunk, part], axis=1)
+                        offset += len(chunk)
+                        save_df = self._select_output(chunk)
+                        save_df.to_csv(output, index=False, header=(i == 0))
+                        columns = len(save_df.columns)
+                        yield save_df
+
+                chunks = saved_chunks()
+                if self.parquet:
+                    saved_parquet = write_parquet(chunks, parquet_path(output_path))
+                for _ in chunks:  # Parquet을 저장하지 않았으면 CSV에만 씀
+                    pass
+        finally:
+            os.remove(spill_path)
+
+        print(f"\n[저장 완료]")
+        print(f"  - 저장 경로: {output_path}")
+        if saved_parquet:
+            print(f"  - Parquet: {parquet_path(output_path)}")
+        print(f"  - 데이터 행 수: {rows}")
+        print(f"  - 데이터 열 수: {columns}")
+        self.print_timings()
+        return output_path
+
+    @staticmethod
+    def _read_spill(path: str, rows_per_chunk: int, usecols: Optional[List[str]] = None):
+        return pd.read_csv(path, usecols=usecols, dtype=str, keep_default_na=False, chunksize=rows_per_chunk)
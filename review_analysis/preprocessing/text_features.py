@@ -0,0 +1,146 @@
+"""
+리뷰 본문 텍스트 특성 (길이, 단어 수, 이모지 / URL 수, 한글 비율)
+
+리뷰마다 정규식을 여러 번 돌리던 .apply 대신, 묶음 단위로 본문 전체를 하나의 UTF-32 코드포인트
+배열로 만들어 numpy 비교 한 번씩으로 문자 종류를 판별하고 np.add.reduceat으로 리뷰별 개수를 구합니다.
+URL만 정규식을 쓰되 "http"가 들어 있는 리뷰에만 적용합니다.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# (시작, 끝) 코드포인트, 양 끝 포함
+EMOJI_RANGES: Tuple[Tuple[int, int], ...] = (
+    (0x1F600, 0x1F64F),  # emoticons
+    (0x1F300, 0x1F5FF),  # symbols & pictographs
+    (0x1F680, 0x1F6FF),  # transport & map symbols
+    (0x1F1E0, 0x1F1FF),  # flags
+    (0x1F900, 0x1F9FF),  # supplemental symbols & pictographs
+    (0x1FA70, 0x1FAFF),  # symbols & pictographs extended-A
+    (0x2600, 0x26FF),  # miscellaneous symbols
+    (0x2700, 0x27BF),  # dingbats
+)
+# ExampleProcessor의 간이 이모지 범위
+SIMPLE_EMOJI_RANGES: Tuple[Tuple[int, int], ...] = EMOJI_RANGES[:2]
+# 이전 전처리 정규식의 범위 (text_has_emoji를 이전 결과와 같게 유지할 때만 사용)
+# 마지막 (0x24C2, 0x1F251)이 한글 / CJK까지 포함하므로 이모지 개수에는 쓰지 않음
+LEGACY_EMOJI_RANGES: Tuple[Tuple[int, int], ...] = EMOJI_RANGES[:4] + ((0x2702, 0x27B0), (0x24C2, 0x1F251))
+
+HANGUL_RANGE = (0xAC00, 0xD7A3)  # 가-힣
+
+
+def emoji_pattern(ranges: Sequence[Tuple[int, int]] = EMOJI_RANGES) -> "re.Pattern":
+    return re.compile("[" + "".join(f"{chr(lo)}-{chr(hi)}" for lo, hi in ranges) + "]+", flags=re.UNICODE)
+
+
+EMOJI_PATTERN = emoji_pattern(EMOJI_RANGES)
+LEGACY_EMOJI_PATTERN = emoji_pattern(LEGACY_EMOJI_RANGES)
+
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+# str.split() / 정규식 \s 와 같은 공백 문자 표 (U+3000이 가장 크므로 그 위는 마지막 칸 False로 모음)
+_WHITESPACE = np.array([chr(c).isspace() for c in range(0x3001)] + [False])
+
+# 한 번에 코드포인트 배열로 만들 리뷰 수 (배열과 리뷰별 합계용 임시 배열이 수십 MB를 넘지 않도록)
+TEXT_BLOCK = 20_000
+
+
+def _merge_ranges(ranges: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """겹치거나 이어지는 범위를 합쳐 비교 횟수를 줄입니다."""
+    merged: List[Tuple[int, int]] = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def _in_ranges(codes: np.ndarray, ranges: Iterable[Tuple[int, int]]) -> np.ndarray:
+    mask = np.zeros(len(codes), dtype=bool)
+    for lo, hi in _merge_ranges(ranges):
+        mask |= (codes >= lo) & (codes <= hi)
+    return mask
+
+
+def _row_sums(mask: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    sums = np.zeros(len(lengths), dtype=np.int64)
+    nonempty = lengths > 0
+    if nonempty.any():
+        sums[nonempty] = np.add.reduceat(mask, starts[nonempty], dtype=np.int64)
+    return sums
+
+
+def char_counts(texts: Sequence[str], emoji_ranges: Sequence[Tuple[int, int]] = EMOJI_RANGES,
+                has_emoji_ranges: Optional[Sequence[Tuple[int, int]]] = None) -> Dict[str, np.ndarray]:
+    """
+    문자열 목록의 리뷰별 개수를 돌려줍니다.
+
+    Returns:
+        {'length', 'nonspace', 'words', 'hangul', 'latin', 'emoji'} -> 길이 len(texts)인 int64 배열
+        (words는 len(text.split())과 같음, has_emoji_ranges를 주면 그 범위의 문자 수 'has_emoji'도 포함)
+    """
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    codes = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+    nonspace = ~_WHITESPACE[np.minimum(codes, len(_WHITESPACE) - 1)]
+    # 단어 시작 = 공백이 아닌 문자 중 바로 앞이 공백이거나 리뷰의 첫 글자인 것
+    previous = np.empty_like(nonspace)
+    previous[:1] = False
+    previous[1:] = nonspace[:-1]
+    previous[starts[lengths > 0]] = False
+    latin = ((codes >= ord("a")) & (codes <= ord("z"))) | ((codes >= ord("A")) & (codes <= ord("Z")))
+
+    counts = {
+        "length": lengths,
+        "nonspace": _row_sums(nonspace, starts, lengths),
+        "words": _row_sums(nonspace & ~previous, starts, lengths),
+        "hangul": _row_sums((codes >= HANGUL_RANGE[0]) & (codes <= HANGUL_RANGE[1]), starts, lengths),
+        "latin": _row_sums(latin, starts, lengths),
+        "emoji": _row_sums(_in_ranges(codes, emoji_ranges), starts, lengths),
+    }
+    if has_emoji_ranges is not None:
+        counts["has_emoji"] = _row_sums(_in_ranges(codes, has_emoji_ranges), starts, lengths)
+    return counts
+
+
+def url_counts(texts: Sequence[str]) -> np.ndarray:
+    return np.fromiter(
+        (len(URL_PATTERN.findall(text)) if "http" in text else 0 for text in texts),
+        dtype=np.int64, count=len(texts),
+    )
+
+
+def text_features(texts: pd.Series, emoji_ranges: Sequence[Tuple[int, int]] = EMOJI_RANGES,
+                  has_emoji_ranges: Optional[Sequence[Tuple[int, int]]] = None) -> pd.DataFrame:
+    """
+    본문 Series -> 같은 인덱스의 특성 DataFrame
+
+    - text_len, word_count: 문자 수, 공백 기준 단어 수
+    - emoji_count, url_count: 이모지 문자 수 (emoji_ranges 기준), URL 수
+    - has_emoji: 이모지 포함 여부 0/1 (has_emoji_ranges 기준, 주지 않으면 emoji_ranges 기준)
+    - hangul_ratio: 공백을 뺀 문자 중 한글(가-힣) 비율 (빈 본문은 0)
+
+    결측치는 빈 문자열로 취급합니다. 메모리를 일정하게 쓰도록 TEXT_BLOCK건씩 나눠 계산합니다.
+    """
+    values = texts.fillna("").astype(str).tolist()
+    blocks = []
+    for i in range(0, len(values), TEXT_BLOCK):
+        block = values[i:i + TEXT_BLOCK]
+        counts = char_counts(block, emoji_ranges, has_emoji_ranges)
+        blocks.append({
+            "text_len": counts["length"],
+            "word_count": counts["words"],
+            "emoji_count": counts["emoji"],
+            "has_emoji": (counts.get("has_emoji", counts["emoji"]) > 0).astype(np.int64),
+            "url_count": url_counts(block),
+            "hangul_ratio": np.divide(counts["hangul"], counts["nonspace"],
+                                      out=np.zeros(len(block)), where=counts["nonspace"] > 0),
+        })
+    columns = ["text_len", "word_count", "emoji_count", "has_emoji", "url_count", "hangul_ratio"]
+    data = {c: np.concatenate([b[c] for b in blocks]) if blocks else np.array([], dtype=np.int64) for c in columns}
+    return pd.DataFrame(data, index=texts.index, columns=columns)
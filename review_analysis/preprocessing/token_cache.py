@@ -0,0 +1,109 @@
+"""
+형태소 분석 결과 캐시 (SQLite)
+
+크롤링을 다시 해도 대부분의 리뷰 본문은 그대로이므로, (토크나이저 이름/버전, 정제된 본문의 sha1)을
+키로 분석 결과를 database/token_cache.sqlite에 저장해 두고 다음 전처리 실행에서는 새 리뷰만 분석합니다.
+"""
+import hashlib
+import os
+import sqlite3
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+TOKEN_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "database", "token_cache.sqlite"
+)
+
+# SQLite 한 쿼리에 넣을 수 있는 바인딩 변수 수 제한(기본 999)보다 작게
+_BATCH = 500
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    (토크나이저, 본문 해시) -> 전처리 결과 문자열
+
+    - get_many / put_many로 여러 리뷰를 한 번에 조회 / 저장합니다.
+    - 토크나이저 이름이나 전처리 규칙 버전이 바뀌면 키가 달라져 이전 결과를 쓰지 않습니다.
+    """
+
+    def __init__(self, path: str = TOKEN_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            " tokenizer TEXT NOT NULL, key TEXT NOT NULL, result TEXT NOT NULL,"
+            " PRIMARY KEY (tokenizer, key)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, tokenizer: str, keys: Iterable[str]) -> Dict[str, str]:
+        """저장된 키만 {키: 결과}로 돌려줍니다."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        for i in range(0, len(keys), _BATCH):
+            batch = keys[i:i + _BATCH]
+            rows = self._conn.execute(
+                f"SELECT key, result FROM tokens WHERE tokenizer = ? AND key IN ({','.join('?' * len(batch))})",
+                [tokenizer, *batch],
+            )
+            found.update(rows)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, tokenizer: str, results: Dict[str, str]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tokens (tokenizer, key, result) VALUES (?, ?, ?)",
+                [(tokenizer, key, result) for key, result in results.items()],
+            )
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_token_cache(path: Optional[str]) -> Optional[TokenCache]:
+    """path가 비어 있으면 None (캐시 사용 안 함)"""
+    return TokenCache(path) if path else None
+
+
+def cached_map(texts: List[str], tokenizer: str, cache: TokenCache,
+               tokenize: Callable[[List[str]], List[Tuple[str, str]]],
+               resolve: Optional[Callable[[], str]] = None) -> List[str]:
+    """
+    캐시에 없는 본문만 tokenize로 처리하고 저장한 뒤 입력 순서대로 결과를 돌려줍니다.
+    같은 본문이 여러 번 나오면 한 번만 분석합니다.
+
+    Args:
+        tokenizer: 먼저 조회할 토크나이저 이름
+        tokenize: 본문 리스트 -> [(결과를 만든 토크나이저 이름, 결과)] (결과는 만든 토크나이저 이름으로 저장)
+        resolve: 캐시에 없는 본문이 있을 때만 호출해 실제로 사용할 토크나이저 이름을 구함
+                 (tokenizer와 다르면 남은 본문을 그 이름으로 한 번 더 조회)
+    """
+    keys = [text_key(text) for text in texts]
+    found = cache.get_many(tokenizer, keys)
+    missing = {key: text for key, text in zip(keys, texts) if key not in found}
+    if missing and resolve is not None:
+        actual = resolve()
+        if actual != tokenizer:
+            cache.misses -= len(missing)  # 다시 조회하는 본문은 한 번만 셈
+            found.update(cache.get_many(actual, missing))
+            missing = {key: text for key, text in missing.items() if key not in found}
+    if missing:
+        computed: Dict[str, Dict[str, str]] = {}
+        for key, (name, result) in zip(missing, tokenize(list(missing.values()))):
+            computed.setdefault(name, {})[key] = result
+            found[key] = result
+        for name, results in computed.items():
+            cache.put_many(name, results)
+    return [found[key] for key in keys]
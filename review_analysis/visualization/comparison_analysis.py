@@ -9,9 +9,10 @@ from pathlib import Path
 import os
 from collections import Counter
 from datetime import datetime
-import glob
 import platform
 
+from review_analysis.preprocessing.columnar import preprocessed_files, read_reviews
+
 # 운영체제 확인 후 한글폰트 설정
 if platform.system() == 'Windows':
     plt.rc('font', family='Malgun Gothic')
@@ -25,9 +26,15 @@ elif platform.system() == 'Linux': # Linux
 plt.rcParams['axes.unicode_minus'] = False
 
 
+# 비교 그래프에 쓰는 칼럼 (이 칼럼만 읽음)
+COMPARISON_COLUMNS = (
+    'rating', 'date', 'text_len', 'word_count', 'year_month', 'rating_group', 'top_keywords', 'content', 'text',
+)
+
+
 def load_preprocessed_data(csv_path: str) -> pd.DataFrame:
-    """전처리된 CSV 파일 로드"""
-    return pd.read_csv(csv_path)
+    """전처리된 리뷰 로드 (같은 이름의 .parquet이 있으면 그것을 우선 사용)"""
+    return read_reviews(csv_path, columns=COMPARISON_COLUMNS)
 
 
 def plot_keyword_comparison(data_dict: dict, output_dir: str):
@@ -233,16 +240,16 @@ def perform_comparison_analysis(database_dir: str = "../../database", output_dir
     """
     print("\n[비교 분석] 수행 중...")
     
-    # 전처리된 CSV 파일 찾기
-    preprocessed_files = glob.glob(os.path.join(database_dir, "preprocessed_reviews_*.csv"))
+    # 전처리된 파일 찾기 (CSV / Parquet)
+    file_paths = preprocessed_files(database_dir)
     
-    if len(preprocessed_files) == 0:
+    if len(file_paths) == 0:
         print("  - 경고: 전처리된 데이터 파일을 찾을 수 없습니다.")
         return
     
     # 데이터 로드
     data_dict = {}
-    for file_path in preprocessed_files:
+    for file_path in file_paths:
         site_name = os.path.basename(file_path).replace('preprocessed_reviews_', '').replace('.csv', '')
         df = load_preprocessed_data(file_path)
         data_dict[site_name] = df
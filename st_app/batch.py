@@ -0,0 +1,161 @@
+"""
+배치 질의응답 CLI — 로그에 쌓인 질문을 build_graph()로 한꺼번에 답변
+
+- 입력: CSV(question 컬럼, 선택적으로 id 컬럼) 또는 JSONL({"id": ..., "question": ...})
+- 동일한 질문(공백 정규화 기준)은 한 번만 실행하고 결과를 모든 id에 기록
+- 워커 스레드들이 하나의 백엔드(검색/LLM 캐시)를 공유
+- 답변은 완료되는 즉시 JSONL로 기록하며, 같은 출력 파일로 다시 실행하면 이어서 처리
+
+예시:
+    python -m st_app.batch -i questions.csv -o answers.jsonl -w 16
+"""
+import csv
+import json
+import os
+import threading
+import time
+from argparse import ArgumentParser
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Set, Tuple
+
+from st_app.graph.router import build_graph
+from st_app.rag.backend import BACKEND_CHOICES, backend_from_env
+from st_app.rag.extractive import ANSWER_MODES
+from st_app.utils.tracing import collect_spans
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(str(question).split())
+
+
+def read_questions(path: str, question_column: str = "question", id_column: str = "id") -> Iterator[Tuple[str, str]]:
+    """(id, question) 쌍을 순서대로 읽습니다. id가 없으면 행 번호를 사용합니다."""
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                yield str(record.get(id_column, i)), str(record.get(question_column, ""))
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for i, row in enumerate(csv.DictReader(f)):
+                yield str(row.get(id_column) or i), str(row.get(question_column, ""))
+
+
+def load_done_ids(output_path: str) -> Set[str]:
+    """이미 성공적으로 기록된 id (이어서 처리할 때 건너뜀)"""
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 중단되며 잘린 마지막 줄
+            if "error" not in record:
+                done.add(str(record["id"]))
+    return done
+
+
+def answer_question(graph, question: str, answer_mode: str = "llm") -> dict:
+    start = time.perf_counter()
+    with collect_spans() as spans:
+        result = graph.invoke({
+            "user_input": question,
+            "chat_history": [],
+            "history_summary": "",
+            "route": "",
+            "response": "",
+            "retrieved_reviews": [],
+            "answer_mode": answer_mode,
+        })
+    node_ms: Dict[str, float] = {}
+    for span in spans:
+        node_ms[span["span"]] = round(node_ms.get(span["span"], 0.0) + span["wall_ms"], 2)
+    return {
+        "answer": result["response"],
+        "route": result["route"],
+        "routes": result.get("routes", [result["route"]]),
+        "retrieved_reviews": len(result.get("retrieved_reviews", [])),
+        "timings": {"total_ms": round((time.perf_counter() - start) * 1000, 2), **node_ms},
+    }
+
+
+def run_batch(input_path: str, output_path: str, workers: int = 8, backend_kind: str = None,
+              llm_cache_size: int = 1024, question_column: str = "question", id_column: str = "id",
+              answer_mode: str = "llm") -> dict:
+    done = load_done_ids(output_path)
+
+    # 정규화된 질문 -> id 목록 (입력 순서 유지)
+    pending: "OrderedDict[str, List[Tuple[str, str]]]" = OrderedDict()
+    total = skipped = 0
+    for record_id, question in read_questions(input_path, question_column, id_column):
+        total += 1
+        if record_id in done or not question.strip():
+            skipped += 1
+            continue
+        pending.setdefault(normalize_question(question), []).append((record_id, question))
+
+    print(f"입력 {total}건, 건너뜀 {skipped}건, 실행할 고유 질문 {len(pending)}개")
+    if not pending:
+        return {"total": total, "skipped": skipped, "unique": 0, "errors": 0}
+
+    graph = build_graph(backend_from_env(backend_kind, llm_cache_size=llm_cache_size))
+    write_lock = threading.Lock()
+    errors = completed = 0
+    start = time.perf_counter()
+
+    with open(output_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(answer_question, graph, key, answer_mode): key for key in pending}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                payload = future.result()
+            except Exception as e:
+                payload = {"error": f"{type(e).__name__}: {e}"}
+                errors += 1
+            with write_lock:
+                for record_id, question in pending[key]:
+                    out.write(json.dumps({"id": record_id, "question": question, **payload}, ensure_ascii=False) + "\n")
+                out.flush()
+            completed += 1
+            if completed % 50 == 0 or completed == len(pending):
+                rate = completed / (time.perf_counter() - start)
+                print(f"  - {completed}/{len(pending)} 완료 ({rate:.1f} 질문/초)")
+
+    return {"total": total, "skipped": skipped, "unique": len(pending), "errors": errors}
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Answer logged questions in bulk through the chatbot graph")
+    parser.add_argument('-i', '--input', type=str, required=True, help="Input questions (.csv or .jsonl)")
+    parser.add_argument('-o', '--output', type=str, required=True, help="Output answers (.jsonl, appended/resumed)")
+    parser.add_argument('-w', '--workers', type=int, default=8, help="Number of worker threads")
+    parser.add_argument('-b', '--backend', type=str, default=None, choices=BACKEND_CHOICES,
+                        help="Backend to use. Defaults to the LLM_BACKEND environment variable.")
+    parser.add_argument('--llm-cache-size', type=int, default=1024, help="Shared LLM response cache size (0 = off)")
+    parser.add_argument('--answer-mode', type=str, default="llm", choices=ANSWER_MODES,
+                        help="Review answers from the LLM or from the LLM-free extractive summarizer")
+    parser.add_argument('--question-column', type=str, default="question")
+    parser.add_argument('--id-column', type=str, default="id")
+    return parser
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    args = create_parser().parse_args()
+    summary = run_batch(
+        args.input, args.output,
+        workers=args.workers,
+        backend_kind=args.backend,
+        llm_cache_size=args.llm_cache_size,
+        question_column=args.question_column,
+        id_column=args.id_column,
+        answer_mode=args.answer_mode,
+    )
+    print(f"\n[배치 완료] {summary}")
@@ -1,10 +1,15 @@
-from st_app.rag.llm import get_llm
+from st_app.rag.backend import Backend
+from st_app.rag.llm import invoke_llm
 from st_app.rag.prompt import CHAT_PROMPT
+from st_app.utils.history import history_messages
 from st_app.utils.state import GraphState
+from st_app.utils.tracing import record_llm_usage
 
 
-def chat_node(state: GraphState) -> dict:
-    llm = get_llm()
-    chain = CHAT_PROMPT | llm
-    result = chain.invoke({"question": state["user_input"]})
-    return {"response": result.content}
+def chat_node(state: GraphState, backend: Backend) -> dict:
+    result = invoke_llm(backend, "chat", CHAT_PROMPT, {
+        "question": state["user_input"],
+        "chat_history": history_messages(state),
+    })
+    record_llm_usage(result)
+    return {"answers": [{"route": "chat", "content": result.content}]}
@@ -1,11 +1,49 @@
-from st_app.rag.llm import get_llm
+from st_app.rag.backend import Backend
+from st_app.rag.extractive import summarize_reviews
+from st_app.rag.llm import invoke_llm
 from st_app.rag.prompt import RAG_REVIEW_PROMPT
-from st_app.rag.retriever import retrieve_reviews
+from st_app.rag.retriever import is_recent_query, retrieve_reviews
+from st_app.utils.history import history_messages
 from st_app.utils.state import GraphState
+from st_app.utils.tracing import record_llm_usage, tracer
 
 
-def rag_review_node(state: GraphState) -> dict:
-    docs = retrieve_reviews(state["user_input"])
+def extractive_answer(docs: list) -> str:
+    with tracer.span("extractive_summary"):
+        return summarize_reviews(docs)
+
+
+def use_aspect_store(state: GraphState, backend: Backend) -> bool:
+    """
+    사전 계산된 측면 요약으로 답해도 되는지
+    - 전체 기간 통계이므로 "요즘 / 최근" 질문에는 쓰지 않음
+    - 대화 기록이 있으면 이전 질문에 따라 답이 달라지므로 쓰지 않음
+    - 인덱스가 교체되거나 리뷰가 추가된 뒤에는 다시 만들 때까지 쓰지 않음
+    """
+    store = backend.aspect_store
+    if store is None or is_recent_query(state["user_input"]):
+        return False
+    if state.get("chat_history") or state.get("history_summary"):
+        return False
+    if not store.is_current(backend.get_vectorstore(), backend.loaded_version):
+        tracer.incr("rag_review.aspect_stale")
+        return False
+    return True
+
+
+def rag_review_node(state: GraphState, backend: Backend) -> dict:
+    # 일반적인 측면 질문은 사전 계산된 요약으로 바로 답함 (검색 / LLM 호출 없음)
+    if use_aspect_store(state, backend):
+        found = backend.aspect_store.answer(state["user_input"])
+        tracer.incr("rag_review.aspect_hit" if found else "rag_review.aspect_miss")
+        if found:
+            answer, highlights = found
+            return {
+                "answers": [{"route": "rag_review", "content": answer}],
+                "retrieved_reviews": highlights,
+            }
+
+    docs = retrieve_reviews(backend, state["user_input"])
 
     context_parts = []
     for i, doc in enumerate(docs, 1):
@@ -13,12 +51,24 @@ def rag_review_node(state: GraphState) -> dict:
         context_parts.append(
             f"[리뷰 {i}] 플랫폼: {meta.get('platform', '?')}, "
             f"평점: {meta.get('rating', '?')}, "
-            f"날짜: {meta.get('date', '?')}\n"
+            f"날짜: {meta.get('date') or '?'}\n"
             f"{doc.page_content}"
         )
     context = "\n\n".join(context_parts)
 
-    llm = get_llm()
-    chain = RAG_REVIEW_PROMPT | llm
-    result = chain.invoke({"context": context, "question": state["user_input"]})
-    return {"response": result.content, "retrieved_reviews": context_parts}
+    if state.get("answer_mode") == "extractive":
+        return {
+            "answers": [{"route": "rag_review", "content": extractive_answer(docs)}],
+            "retrieved_reviews": context_parts,
+        }
+
+    result = invoke_llm(backend, "rag_review", RAG_REVIEW_PROMPT, {
+        "context": context,
+        "question": state["user_input"],
+        "chat_history": history_messages(state),
+    }, extractive=lambda: extractive_answer(docs))
+    record_llm_usage(result)
+    return {
+        "answers": [{"route": "rag_review", "content": result.content}],
+        "retrieved_reviews": context_parts,
+    }
@@ -1,9 +1,12 @@
 import json
 import os
 
-from st_app.rag.llm import get_llm
+from st_app.rag.backend import Backend
+from st_app.rag.llm import invoke_llm
 from st_app.rag.prompt import SUBJECT_INFO_PROMPT
+from st_app.utils.history import history_messages
 from st_app.utils.state import GraphState
+from st_app.utils.tracing import record_llm_usage
 
 SUBJECTS_PATH = os.path.join(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
@@ -17,9 +20,12 @@ def _load_subject_info() -> str:
     return json.dumps(data, ensure_ascii=False, indent=2)
 
 
-def subject_info_node(state: GraphState) -> dict:
-    llm = get_llm()
+def subject_info_node(state: GraphState, backend: Backend) -> dict:
     info_text = _load_subject_info()
-    chain = SUBJECT_INFO_PROMPT | llm
-    result = chain.invoke({"subject_info": info_text, "question": state["user_input"]})
-    return {"response": result.content}
+    result = invoke_llm(backend, "subject_info", SUBJECT_INFO_PROMPT, {
+        "subject_info": info_text,
+        "question": state["user_input"],
+        "chat_history": history_messages(state),
+    })
+    record_llm_usage(result)
+    return {"answers": [{"route": "subject_info", "content": result.content}]}
@@ -1,36 +1,134 @@
+import re
+from functools import partial
+from typing import List, Literal, Optional
+
 from langgraph.graph import StateGraph, END
+from pydantic import BaseModel, Field, ValidationError
 
-from st_app.rag.llm import get_llm
+from st_app.rag.backend import Backend, backend_from_env
+from st_app.rag.llm import invoke_llm
 from st_app.rag.prompt import ROUTER_PROMPT
+from st_app.utils.history import history_messages
 from st_app.utils.state import GraphState
+from st_app.utils.tracing import record_llm_usage, trace_node, tracer
 from st_app.graph.nodes.chat_node import chat_node
 from st_app.graph.nodes.subject_info_node import subject_info_node
 from st_app.graph.nodes.rag_review_node import rag_review_node
 
-VALID_ROUTES = {"chat", "subject_info", "rag_review"}
+# 부분 답변을 합칠 때의 순서
+ROUTE_ORDER = ["subject_info", "rag_review", "chat"]
+VALID_ROUTES = set(ROUTE_ORDER)
+
+ROUTE_LABELS = {
+    "subject_info": "에버랜드 정보",
+    "rag_review": "리뷰 기반 답변",
+    "chat": "일반 대화",
+}
+
+
+# 구조화 출력(tool call) JSON만 생성하면 되므로 출력 토큰을 작게 제한
+ROUTER_MAX_TOKENS = 32
+
+
+class RouteDecision(BaseModel):
+    """질문을 처리할 경로 (복합 질문이면 여러 개)"""
+
+    routes: List[Literal["subject_info", "rag_review", "chat"]] = Field(
+        description="subject_info: 에버랜드 기본 정보, rag_review: 방문 후기/리뷰, chat: 일반 대화",
+        min_length=1,
+    )
+
+
+def _route_tokens(text: str) -> List[str]:
+    routes = []
+    for token in re.split(r"[\s,/|]+", text.strip().lower()):
+        if token in VALID_ROUTES and token not in routes:
+            routes.append(token)
+    # 잡담은 다른 의도와 함께 나오면 제외
+    if len(routes) > 1 and "chat" in routes:
+        routes.remove("chat")
+    return routes
+
+
+def parse_routes(text: str) -> List[str]:
+    """라우터 출력("subject_info, rag_review")을 유효한 경로 리스트로 변환합니다."""
+    return _route_tokens(text) or ["chat"]
+
+
+def _normalize_routes(routes: List[str]) -> List[str]:
+    ordered = list(dict.fromkeys(routes))
+    if len(ordered) > 1 and "chat" in ordered:
+        ordered.remove("chat")
+    return ordered
+
+
+def _bind_route_decision(llm):
+    try:
+        return llm.bind_tools(
+            [RouteDecision], tool_choice=RouteDecision.__name__, max_tokens=ROUTER_MAX_TOKENS
+        )
+    except NotImplementedError:
+        return llm  # tool calling을 지원하지 않는 모델
+
+
+def router_node(state: GraphState, backend: Backend) -> dict:
+    """
+    RouteDecision 스키마를 tool call로 강제하여 경로를 고릅니다. (재시도 없음)
+    tool call이 없거나 스키마에 맞지 않으면 텍스트 파싱으로 대체하고 router.fallback으로 집계합니다.
+    LLM이 타임아웃되어 대체 응답마저 없으면 텍스트 파싱 결과인 chat으로 보냅니다.
+
+    대체 원인은 router.invalid(스키마 불일치) / router.no_tool_call(tool call 없음)로, 텍스트에서도 경로를
+    찾지 못해 chat으로 추측한 경우는 router.empty로 집계합니다. (운영 중 오분류 가능성을 보는 지표)
+    """
+    inputs = {"question": state["user_input"], "chat_history": history_messages(state)}
+    result = invoke_llm(backend, "router", ROUTER_PROMPT, inputs, bind=_bind_route_decision)
+    record_llm_usage(result)
+
+    reason = "router.no_tool_call"
+    for call in getattr(result, "tool_calls", None) or []:
+        if call["name"] != RouteDecision.__name__:
+            continue
+        try:
+            routes = _normalize_routes(RouteDecision.model_validate(call["args"]).routes)
+        except ValidationError:
+            reason = "router.invalid"
+            break
+        tracer.incr("router.structured")
+        return {"route": routes[0], "routes": routes}
+
+    tracer.incr("router.fallback")
+    tracer.incr(reason)
+    routes = _route_tokens(str(result.content))
+    if not routes:
+        tracer.incr("router.empty")
+        routes = ["chat"]
+    return {"route": routes[0], "routes": routes}
 
 
-def router_node(state: GraphState) -> dict:
-    llm = get_llm()
-    chain = ROUTER_PROMPT | llm
-    result = chain.invoke({"question": state["user_input"]})
-    route = result.content.strip().lower()
-    if route not in VALID_ROUTES:
-        route = "chat"
-    return {"route": route}
+def route_decision(state: GraphState) -> List[str]:
+    # 여러 경로를 돌려주면 LangGraph가 해당 노드들을 병렬로 실행
+    return state.get("routes") or [state["route"]]
 
 
-def route_decision(state: GraphState) -> str:
-    return state["route"]
+def merge_node(state: GraphState) -> dict:
+    """병렬 노드들의 부분 답변을 하나의 답변으로 합칩니다. (추가 LLM 호출 없음)"""
+    answers = sorted(state.get("answers", []), key=lambda a: ROUTE_ORDER.index(a["route"]))
+    if len(answers) == 1:
+        return {"response": answers[0]["content"]}
+    sections = [f"**{ROUTE_LABELS[a['route']]}**\n\n{a['content']}" for a in answers]
+    return {"response": "\n\n".join(sections)}
 
 
-def build_graph():
+def build_graph(backend: Optional[Backend] = None):
+    """backend를 생략하면 환경변수(LLM_BACKEND 등)로 구성한 백엔드를 사용합니다."""
+    backend = backend or backend_from_env()
     graph = StateGraph(GraphState)
 
-    graph.add_node("router", router_node)
-    graph.add_node("chat", chat_node)
-    graph.add_node("subject_info", subject_info_node)
-    graph.add_node("rag_review", rag_review_node)
+    graph.add_node("router", trace_node("router", partial(router_node, backend=backend)))
+    graph.add_node("chat", trace_node("chat", partial(chat_node, backend=backend)))
+    graph.add_node("subject_info", trace_node("subject_info", partial(subject_info_node, backend=backend)))
+    graph.add_node("rag_review", trace_node("rag_review", partial(rag_review_node, backend=backend)))
+    graph.add_node("merge", trace_node("merge", merge_node))
 
     graph.set_entry_point("router")
 
@@ -44,8 +142,9 @@ def build_graph():
         },
     )
 
-    graph.add_edge("chat", END)
-    graph.add_edge("subject_info", END)
-    graph.add_edge("rag_review", END)
+    graph.add_edge("chat", "merge")
+    graph.add_edge("subject_info", "merge")
+    graph.add_edge("rag_review", "merge")
+    graph.add_edge("merge", END)
 
     return graph.compile()
@@ -0,0 +1,251 @@
+"""
+측면(aspect)별 리뷰 요약 사전 계산 — python -m st_app.rag.aspects
+
+대기 시간, 음식, 가격, 놀이기구, 동물원, 주차처럼 자주 묻는 주제는 매번 같은 리뷰를 검색하고
+요약하게 되므로, 오프라인에서 한 번 계산해 로컬 저장소(JSON)에 넣어 둡니다.
+
+1. 키워드 시드로 리뷰를 측면에 배정
+2. 시드 리뷰의 임베딩 중심(centroid)과의 코사인 유사도로 키워드가 없는 리뷰까지 배정
+3. 측면 x 플랫폼(all/google/kakao/tripcom)별 리뷰 수, 평균 평점, 평점 구간 분포, 대표 문장 저장
+
+rag_review_node는 일반적인 측면 질문("대기 시간 후기 어때?")을 이 저장소로 바로 답하고,
+그 외 질문은 기존처럼 검색 + LLM으로 답합니다. 저장소는 만든 시점의 인덱스(버전, 문서 수)를 기록하며,
+인덱스가 교체되거나 리뷰가 추가되면 다시 만들 때까지 사용하지 않습니다.
+"""
+import json
+import os
+import re
+import threading
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from st_app.rag.extractive import central_sentences, format_citation, rating_of, split_sentences
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ASPECT_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "aspect_summaries.json"
+)
+
+# 측면 이름 -> (표시 이름, 키워드 시드)
+ASPECTS: Dict[str, Tuple[str, re.Pattern]] = {
+    "queue": ("대기 시간", re.compile(r"대기|웨이팅|줄\s*(이|을|서|도)?|기다|오픈런|큐패스|Q-?pass", re.I)),
+    "food": ("음식", re.compile(r"음식|식당|맛있|맛없|먹|메뉴|밥|간식|츄러스|푸드")),
+    "price": ("가격", re.compile(r"가격|입장료|비싸|비쌈|요금|할인|가성비|티켓값")),
+    "rides": ("놀이기구", re.compile(r"놀이\s*기구|어트랙션|롤러\s*코스터|T\s*익스프레스|티익스프레스|바이킹|아마존|썬더\s*폴스|허리케인", re.I)),
+    "zoo": ("동물원", re.compile(r"사파리|동물|판다|푸바오|바오|로스트\s*밸리|주토피아")),
+    "parking": ("주차", re.compile(r"주차|셔틀")),
+}
+
+PLATFORM_KEYWORDS = {
+    "google": re.compile(r"구글|google", re.I),
+    "kakao": re.compile(r"카카오|kakao", re.I),
+    "tripcom": re.compile(r"트립닷컴|트립\s*컴|trip\.?com", re.I),
+}
+
+# 저장소로 답해도 되는 "일반적인" 측면 질문 (그 외 구체적인 질문은 실시간 RAG)
+SUMMARY_INTENT = re.compile(r"후기|리뷰|어때|어땠|어떤가|평가|평판|만족|요약|반응")
+
+
+def match_aspects(text: str) -> List[str]:
+    return [name for name, (_, pattern) in ASPECTS.items() if pattern.search(text)]
+
+
+def _normalize(vectors: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _index_documents(vectorstore) -> Tuple[list, "np.ndarray"]:
+    """FAISS 인덱스에 저장된 문서와 벡터를 같은 순서로 꺼냅니다. (다시 임베딩하지 않음)"""
+    import numpy as np
+
+    ids = [vectorstore.index_to_docstore_id[i] for i in range(len(vectorstore.index_to_docstore_id))]
+    docs = [vectorstore.docstore.search(doc_id) for doc_id in ids]
+    vectors = vectorstore.index.reconstruct_n(0, len(ids))
+    return docs, np.asarray(vectors, dtype=np.float32)
+
+
+def assign_aspects(docs: list, vectors: "np.ndarray", threshold: float = 0.5) -> Dict[str, List[Tuple[int, float]]]:
+    """
+    측면별 (문서 번호, 중심과의 유사도) 목록을 유사도 내림차순으로 돌려줍니다.
+    키워드 시드로 배정된 리뷰는 모두 포함하고, 나머지는 유사도가 threshold 이상일 때만 포함합니다.
+    """
+    normalized = _normalize(vectors)
+    seeds = {name: [i for i, doc in enumerate(docs) if pattern.search(doc.page_content)]
+             for name, (_, pattern) in ASPECTS.items()}
+
+    assignments: Dict[str, List[Tuple[int, float]]] = {}
+    for name, seed_ids in seeds.items():
+        if not seed_ids:
+            assignments[name] = []
+            continue
+        centroid = _normalize(normalized[seed_ids].mean(axis=0, keepdims=True))[0]
+        similarity = normalized @ centroid
+        seed_set = set(seed_ids)
+        members = [i for i in range(len(docs)) if i in seed_set or similarity[i] >= threshold]
+        assignments[name] = sorted(((i, float(similarity[i])) for i in members), key=lambda x: -x[1])
+    return assignments
+
+
+def _aspect_pool(docs: list, members: List[int], pattern: re.Pattern, pool_size: int) -> list:
+    """중심에 가까운 리뷰들에서 측면 키워드가 들어간 문장만 남깁니다. (없으면 리뷰 전체)"""
+    from langchain_core.documents import Document
+
+    pool = []
+    for i in members[:pool_size]:
+        sentences = [s for s in split_sentences(docs[i].page_content) if pattern.search(s)]
+        if sentences:
+            pool.append(Document(page_content="\n".join(sentences), metadata=docs[i].metadata))
+    return pool or [docs[i] for i in members[:pool_size]]
+
+
+def _aspect_stats(docs: list, members: List[int], pattern: re.Pattern, max_highlights: int, pool_size: int) -> dict:
+    ratings = [r for r in (rating_of(docs[i].metadata) for i in members) if r is not None]
+    groups = Counter(docs[i].metadata.get("rating_group", "") for i in members)
+    pool = _aspect_pool(docs, members, pattern, pool_size)
+    highlights = [
+        {"text": text, "platform": meta.get("platform", "?"), "rating": meta.get("rating", "?")}
+        for text, meta in central_sentences(pool, max_highlights)
+    ]
+    return {
+        "count": len(members),
+        "avg_rating": round(sum(ratings) / len(ratings), 2) if ratings else None,
+        "rating_groups": {k: v for k, v in groups.most_common() if k},
+        "highlights": highlights,
+    }
+
+
+def build_aspect_store(backend=None, output_path: str = ASPECT_STORE_PATH, threshold: float = 0.5,
+                       max_highlights: int = 3, pool_size: int = 30) -> dict:
+    """backend의 FAISS 인덱스(문서 + 벡터)로 측면별 요약을 계산해 output_path에 저장합니다."""
+    from st_app.rag.backend import backend_from_env
+
+    backend = backend or backend_from_env()
+    start = time.perf_counter()
+    docs, vectors = _index_documents(backend.get_vectorstore())
+    print(f"총 {len(docs)}개 리뷰 로드 완료. 측면별 배정 중...")
+
+    assignments = assign_aspects(docs, vectors, threshold)
+    aspects = {}
+    for name, members in assignments.items():
+        ids = [i for i, _ in members]
+        pattern = ASPECTS[name][1]
+        platforms = {"all": _aspect_stats(docs, ids, pattern, max_highlights, pool_size)}
+        for platform in sorted({docs[i].metadata.get("platform", "") for i in ids} - {""}):
+            platform_ids = [i for i in ids if docs[i].metadata.get("platform") == platform]
+            platforms[platform] = _aspect_stats(docs, platform_ids, pattern, max_highlights, pool_size)
+        aspects[name] = {"label": ASPECTS[name][0], "platforms": platforms}
+        print(f"  - {ASPECTS[name][0]}: {len(ids)}건")
+
+    store = {
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "index_version": backend.loaded_version,
+        "documents": len(docs),
+        "threshold": threshold,
+        "aspects": aspects,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(store, f, ensure_ascii=False, indent=2)
+    print(f"측면 요약 저장 완료: {output_path} ({time.perf_counter() - start:.1f}s)")
+    return store
+
+
+class AspectStore:
+    """사전 계산된 측면 요약 저장소 (처음 사용할 때 한 번 로드)"""
+
+    def __init__(self, path: str = ASPECT_STORE_PATH, data: Optional[dict] = None):
+        self.path = path
+        self._data = data
+        self._lock = threading.Lock()
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._data = json.load(f)
+        return self._data
+
+    def invalidate(self) -> None:
+        """불러온 요약을 버리고 다음 사용 때 파일을 다시 읽습니다. (인덱스 교체 시, 파일이 다시 만들어졌을 수 있음)"""
+        with self._lock:
+            self._data = None
+
+    def is_current(self, vectorstore, version: Optional[str]) -> bool:
+        """요약이 지금 인덱스로 만든 것인지 (인덱스 버전과 문서 수가 같은지)"""
+        data = self.data
+        if "index_version" in data and data["index_version"] != version:
+            return False
+        return data.get("documents") == len(vectorstore.index_to_docstore_id)
+
+    def lookup(self, question: str) -> Optional[Tuple[str, str, dict]]:
+        """
+        일반적인 측면 질문이면 (측면, 플랫폼, 요약)을 돌려줍니다.
+        측면이 없거나 여러 개이거나, 요약/후기를 묻는 질문이 아니면 None (실시간 RAG로 처리)
+        """
+        aspects = match_aspects(question)
+        if len(aspects) != 1 or not SUMMARY_INTENT.search(question):
+            return None
+        platforms = [p for p, pattern in PLATFORM_KEYWORDS.items() if pattern.search(question)]
+        platform = platforms[0] if len(platforms) == 1 else "all"
+        entry = self.data["aspects"].get(aspects[0], {}).get("platforms", {}).get(platform)
+        if not entry or not entry["count"]:
+            return None
+        return aspects[0], platform, entry
+
+    def answer(self, question: str) -> Optional[Tuple[str, List[str]]]:
+        """(답변, 대표 리뷰 목록) 또는 None"""
+        found = self.lookup(question)
+        if found is None:
+            return None
+        aspect, platform, entry = found
+        label = self.data["aspects"][aspect]["label"]
+        scope = "전체 플랫폼" if platform == "all" else platform
+        header = f"{label} 관련 리뷰 {entry['count']}건({scope})을 미리 분석한 결과입니다."
+        if entry["avg_rating"] is not None:
+            header += f" 평균 평점은 {entry['avg_rating']:.1f}점입니다."
+        lines = [header]
+        if entry["rating_groups"]:
+            lines.append("평점 분포: " + ", ".join(f"{k} {v}건" for k, v in entry["rating_groups"].items()))
+        citations = [format_citation(h["text"], h) for h in entry["highlights"]]
+        lines.extend(citations)
+        return "\n".join(lines), [c[2:] for c in citations]
+
+
+def load_aspect_store(path: Optional[str] = None) -> Optional[AspectStore]:
+    """저장소 파일이 있으면 AspectStore를, 없으면 None을 돌려줍니다. (ASPECT_STORE_PATH 환경변수로 경로 지정)"""
+    path = path or os.getenv("ASPECT_STORE_PATH", ASPECT_STORE_PATH)
+    return AspectStore(path) if os.path.exists(path) else None
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Precompute per-aspect review summaries from the FAISS index")
+    parser.add_argument('-o', '--output', type=str, default=ASPECT_STORE_PATH, help="Output store (.json)")
+    parser.add_argument('-b', '--backend', type=str, default=None,
+                        help="Backend to use. Defaults to the LLM_BACKEND environment variable.")
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help="Minimum cosine similarity to an aspect centroid for reviews without seed keywords")
+    parser.add_argument('--highlights', type=int, default=3, help="Representative sentences per aspect/platform")
+    return parser
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from st_app.rag.backend import backend_from_env
+    load_dotenv()
+
+    args = create_parser().parse_args()
+    build_aspect_store(
+        backend_from_env(args.backend),
+        output_path=args.output,
+        threshold=args.threshold,
+        max_highlights=args.highlights,
+    )
@@ -0,0 +1,279 @@
+"""
+LLM / 임베딩 / 검색 / 캐시 백엔드 구성
+
+build_graph(backend)에 주입하여 Streamlit 없이도(배치 워커, API 서버, 벤치마크)
+같은 파이프라인을 실행할 수 있게 합니다.
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import TYPE_CHECKING, Any, Hashable, Optional
+
+from st_app.rag.aspects import AspectStore, load_aspect_store
+from st_app.rag.llm import LLMPolicy, get_api_key, policy_from_env
+
+# langchain 계열은 타입 표기에만 쓰고 실제 import는 모델을 만들 때 (콜드 스타트 단축)
+if TYPE_CHECKING:
+    from langchain_core.caches import BaseCache
+    from langchain_core.embeddings import Embeddings
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+FAISS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "faiss_index")
+
+BACKEND_CHOICES = ("upstage", "openai", "fake")
+
+
+class LRUCache:
+    """스레드 안전한 LRU 캐시"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@dataclass
+class Backend:
+    """
+    그래프 실행에 필요한 외부 자원 묶음
+
+    - llm: 모든 노드가 사용하는 채팅 모델
+    - embeddings: 검색 질의 임베딩 (인덱스를 만든 모델과 같아야 함)
+    - index_dir: FAISS 인덱스 루트 (CURRENT가 가리키는 버전을 로드, vectorstore를 직접 넘기면 무시)
+    - query_cache: (질의, k) -> 검색 결과 캐시
+    - llm_cache: 동일 프롬프트 LLM 응답 캐시 (모델 생성 시 연결)
+    - policy: 타임아웃 / 헤지 / 대체 경로 정책 (st_app.rag.llm.invoke_llm)
+    - fallback_llm: 타임아웃 시 사용할 더 싼 모델 (없으면 건너뜀)
+    - answer_cache: (노드, 질문, 대화 기록 / 문맥 해시) -> 마지막으로 성공한 응답 (cache 대체 경로)
+    - aspect_store: 사전 계산된 측면별 리뷰 요약 (없으면 항상 실시간 RAG)
+    - recency_weight: 검색 점수 중 최신성 가중치의 비율 (0이면 유사도만 사용)
+    - half_life_days: 최신성 가중치가 절반이 되는 리뷰 나이(일)
+    - recent_days: "요즘", "최근" 질문이 검색할 기간(일)
+    - date_buckets: "year" | "quarter"이면 날짜 구간별 하위 인덱스 사용 (st_app.rag.retriever)
+    """
+
+    llm: "BaseChatModel"
+    embeddings: "Embeddings"
+    index_dir: str = FAISS_DIR
+    k: int = 5
+    vectorstore: Any = None
+    query_cache: LRUCache = field(default_factory=LRUCache)
+    llm_cache: Optional["BaseCache"] = None
+    name: str = "custom"
+    policy: LLMPolicy = field(default_factory=LLMPolicy)
+    fallback_llm: Optional["BaseChatModel"] = None
+    answer_cache: LRUCache = field(default_factory=lambda: LRUCache(maxsize=1024))
+    aspect_store: Optional[AspectStore] = None
+    recency_weight: float = 0.3
+    half_life_days: float = 365.0
+    recent_days: int = 180
+    date_buckets: Optional[str] = None
+    bucket_index: Any = field(default=None, repr=False)
+    as_of: Optional[date] = field(default=None, repr=False)
+    index_version: int = field(default=0, init=False)
+    loaded_version: Optional[str] = field(default=None, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def get_vectorstore(self):
+        """벡터스토어를 처음 사용할 때 한 번만 로드합니다. (index_dir의 CURRENT 버전)"""
+        if self.vectorstore is None:
+            with self._lock:
+                if self.vectorstore is None:
+                    from st_app.rag.index_store import load_version
+                    self.loaded_version, self.vectorstore = load_version(self.index_dir, self.embeddings)
+        return self.vectorstore
+
+    def swap_vectorstore(self, vectorstore, version: Optional[str] = None,
+                         expected_version: Optional[int] = None) -> bool:
+        """
+        새 인덱스로 교체합니다. 진행 중인 검색은 이전 인덱스로 끝나고, 이후 검색부터 새 인덱스를 사용합니다.
+        인덱스에서 파생된 캐시(검색 결과, 날짜 구간 인덱스, 기준일, 측면 요약)는 비웁니다.
+        expected_version을 주면 index_version이 그대로일 때만 교체합니다. (교체 여부를 돌려줌)
+        """
+        with self._lock:
+            if expected_version is not None and self.index_version != expected_version:
+                return False
+            self.vectorstore = vectorstore
+            if version is not None:
+                self.loaded_version = version
+            self.bucket_index = None
+            self.as_of = None
+            self.query_cache.clear()
+            if self.aspect_store is not None:
+                self.aspect_store.invalidate()
+            self.index_version += 1
+            return True
+
+    def update_if_current(self, version: int, **fields) -> bool:
+        """
+        인덱스 버전이 version 그대로일 때만 파생 값(bucket_index, as_of 등)을 저장합니다.
+        만드는 동안 인덱스가 교체되었으면 이전 인덱스로 만든 값을 되돌려 놓지 않고 버립니다.
+        """
+        with self._lock:
+            if self.index_version != version:
+                return False
+            for name, value in fields.items():
+                setattr(self, name, value)
+            return True
+
+    def cache_query(self, version: int, key, value) -> bool:
+        """검색 결과를 query_cache에 넣습니다. (검색하는 동안 인덱스가 교체되었으면 넣지 않음)"""
+        with self._lock:
+            if self.index_version != version:
+                return False
+            self.query_cache.put(key, value)
+            return True
+
+    @property
+    def retriever(self):
+        # 매번 현재 인덱스로 만들어 교체(swap_vectorstore)가 바로 반영되도록 함
+        return self.get_vectorstore().as_retriever(search_kwargs={"k": self.k})
+
+
+def upstage_backend(api_key: Optional[str] = None, model: str = "solar-mini",
+                    index_dir: str = FAISS_DIR, llm_cache: Optional["BaseCache"] = None,
+                    policy: Optional[LLMPolicy] = None, fallback_model: Optional[str] = None) -> Backend:
+    """Upstage Solar LLM + Solar 임베딩 (기본 구성)"""
+    from langchain_upstage import ChatUpstage, UpstageEmbeddings
+
+    api_key = api_key or get_api_key()
+    policy = policy or LLMPolicy()
+    fallback_llm = None
+    if fallback_model:
+        fallback_llm = ChatUpstage(model=fallback_model, api_key=api_key, cache=llm_cache,
+                                   timeout=policy.fallback_timeout)
+    return Backend(
+        llm=ChatUpstage(model=model, api_key=api_key, cache=llm_cache, timeout=policy.timeout),
+        embeddings=UpstageEmbeddings(model="solar-embedding-1-large", api_key=api_key),
+        index_dir=index_dir,
+        llm_cache=llm_cache,
+        name="upstage",
+        policy=policy,
+        fallback_llm=fallback_llm,
+        aspect_store=load_aspect_store(),
+    )
+
+
+def openai_compatible_backend(base_url: str, model: str, embedding_model: str,
+                              api_key: Optional[str] = None, index_dir: str = FAISS_DIR,
+                              llm_cache: Optional["BaseCache"] = None, policy: Optional[LLMPolicy] = None,
+                              fallback_model: Optional[str] = None) -> Backend:
+    """OpenAI 호환 엔드포인트(vLLM, Ollama, LM Studio 등 로컬 서버 포함)"""
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+    api_key = api_key or os.getenv("OPENAI_API_KEY", "EMPTY")
+    policy = policy or LLMPolicy()
+    fallback_llm = None
+    if fallback_model:
+        fallback_llm = ChatOpenAI(model=fallback_model, base_url=base_url, api_key=api_key,
+                                  cache=llm_cache, timeout=policy.fallback_timeout)
+    return Backend(
+        llm=ChatOpenAI(model=model, base_url=base_url, api_key=api_key, cache=llm_cache,
+                       timeout=policy.timeout),
+        embeddings=OpenAIEmbeddings(
+            model=embedding_model, base_url=base_url, api_key=api_key,
+            check_embedding_ctx_length=False,
+        ),
+        index_dir=index_dir,
+        llm_cache=llm_cache,
+        name="openai",
+        policy=policy,
+        fallback_llm=fallback_llm,
+        aspect_store=load_aspect_store(),
+    )
+
+
+def fake_backend(llm_latency: float = 0.0, embed_latency: float = 0.0, jitter: float = 0.0,
+                 embedding_dim: int = 256, max_docs: int = 0,
+                 llm_cache: Optional["BaseCache"] = None, policy: Optional[LLMPolicy] = None) -> Backend:
+    """오프라인 가짜 백엔드 — 리뷰 CSV로 메모리 FAISS 인덱스를 만들어 사용"""
+    from langchain_community.vectorstores import FAISS
+    from st_app.rag.embedder import load_documents
+    from st_app.rag.fake import FakeChatModel, FakeEmbeddings
+
+    documents = load_documents()
+    if max_docs:
+        documents = documents[:max_docs]
+    embeddings = FakeEmbeddings(size=embedding_dim)
+    vectorstore = FAISS.from_documents(documents, embeddings)
+    # 인덱스 생성은 지연 없이, 이후 질의 임베딩에만 지연시간 적용
+    embeddings.latency = embed_latency
+    embeddings.jitter = jitter
+    return Backend(
+        llm=FakeChatModel(latency=llm_latency, jitter=jitter, cache=llm_cache),
+        embeddings=embeddings,
+        vectorstore=vectorstore,
+        llm_cache=llm_cache,
+        name="fake",
+        policy=policy or LLMPolicy(),
+    )
+
+
+def backend_from_env(kind: Optional[str] = None, llm_cache_size: int = 0) -> Backend:
+    """
+    환경변수로 백엔드를 구성합니다.
+
+    - LLM_BACKEND: upstage(기본) | openai | fake (kind를 넘기면 kind 우선)
+    - openai: OPENAI_BASE_URL, OPENAI_MODEL, OPENAI_EMBEDDING_MODEL, OPENAI_API_KEY
+    - FAISS_INDEX_DIR: 인덱스 경로 (기본 st_app/db/faiss_index)
+    - LLM_FALLBACK_MODEL: 타임아웃 시 사용할 더 싼 모델 (upstage / openai)
+    - ASPECT_STORE_PATH: 측면 요약 저장소 (기본 st_app/db/aspect_summaries.json, upstage / openai)
+    - LLM_TIMEOUT, LLM_HEDGE_DELAY, LLM_FALLBACK_TIMEOUT, LLM_FALLBACKS: st_app.rag.llm.policy_from_env 참고
+    - RETRIEVAL_RECENCY_WEIGHT: 최신성 가중치 비율 (기본 0.3), RETRIEVAL_DATE_BUCKETS: year | quarter
+    """
+    from langchain_core.caches import InMemoryCache
+
+    kind = (kind or os.getenv("LLM_BACKEND", "upstage")).lower()
+    index_dir = os.getenv("FAISS_INDEX_DIR", FAISS_DIR)
+    llm_cache = InMemoryCache(maxsize=llm_cache_size) if llm_cache_size else None
+    policy = policy_from_env()
+    fallback_model = os.getenv("LLM_FALLBACK_MODEL") or None
+    if kind == "upstage":
+        backend = upstage_backend(index_dir=index_dir, llm_cache=llm_cache, policy=policy,
+                                  fallback_model=fallback_model)
+    elif kind == "openai":
+        backend = openai_compatible_backend(
+            base_url=os.getenv("OPENAI_BASE_URL", "http://localhost:8000/v1"),
+            model=os.getenv("OPENAI_MODEL", "local-model"),
+            embedding_model=os.getenv("OPENAI_EMBEDDING_MODEL", "local-embedding"),
+            index_dir=index_dir,
+            llm_cache=llm_cache,
+            policy=policy,
+            fallback_model=fallback_model,
+        )
+    elif kind == "fake":
+        backend = fake_backend(llm_cache=llm_cache, policy=policy)
+    else:
+        raise ValueError(f"알 수 없는 LLM_BACKEND: {kind} (선택: {', '.join(BACKEND_CHOICES)})")
+    return apply_retrieval_env(backend)
+
+
+def apply_retrieval_env(backend: Backend) -> Backend:
+    """RETRIEVAL_RECENCY_WEIGHT(최신성 가중치 비율), RETRIEVAL_DATE_BUCKETS(year | quarter)를 backend에 적용합니다."""
+    if os.getenv("RETRIEVAL_RECENCY_WEIGHT"):
+        backend.recency_weight = float(os.environ["RETRIEVAL_RECENCY_WEIGHT"])
+    backend.date_buckets = os.getenv("RETRIEVAL_DATE_BUCKETS") or None
+    return backend
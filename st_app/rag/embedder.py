@@ -1,29 +1,31 @@
-"""FAISS 인덱스 빌드 스크립트 — 로컬에서 한 번 실행하여 인덱스 생성"""
+"""FAISS 인덱스 빌드 스크립트 — 로컬에서 한 번 실행하여 인덱스 생성 (python -m st_app.rag.embedder)"""
 import os
 import pandas as pd
+from typing import Optional
 from langchain_community.vectorstores import FAISS
-from langchain_upstage import UpstageEmbeddings
 from langchain.schema import Document
+from review_analysis.preprocessing.columnar import read_reviews
+from st_app.rag.backend import Backend, backend_from_env
+from st_app.rag.index_store import save_version
+from st_app.rag.retriever import as_date
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-DB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "faiss_index")
 
+# 같은 이름의 .parquet이 있으면 그것을 우선 읽음
 CSV_FILES = [
     ("database/preprocessed_reviews_google.csv", "google"),
     ("database/preprocessed_reviews_kakao.csv", "kakao"),
     ("database/preprocessed_reviews_tripcom.csv", "tripcom"),
 ]
+DOCUMENT_COLUMNS = ("context_cleaned", "rating", "date", "rating_group")
 
 
-def build_index():
-    api_key = os.getenv("UPSTAGE_API_KEY")
-    if not api_key:
-        raise ValueError("UPSTAGE_API_KEY 환경변수를 설정해주세요.")
-
+def load_documents() -> list:
+    """전처리된 리뷰(CSV / Parquet)를 FAISS에 넣을 Document 리스트로 변환"""
     documents = []
     for csv_path, platform in CSV_FILES:
         full_path = os.path.join(BASE_DIR, csv_path)
-        df = pd.read_csv(full_path, encoding="utf-8-sig")
+        df = read_reviews(full_path, columns=DOCUMENT_COLUMNS)
         for _, row in df.iterrows():
             text = str(row.get("context_cleaned", "")).strip()
             if not text:
@@ -31,19 +33,28 @@ def build_index():
             metadata = {
                 "platform": platform,
                 "rating": str(row.get("rating", "")),
-                "date": str(row.get("date", "")),
+                "date": as_date(row["date"]) if pd.notna(row.get("date")) else None,  # datetime.date (없으면 None)
                 "rating_group": str(row.get("rating_group", "")),
             }
             documents.append(Document(page_content=text, metadata=metadata))
+    return documents
+
+
+def build_index(backend: Optional[Backend] = None, keep: int = 3) -> str:
+    """
+    backend의 임베딩 모델로 인덱스를 만들어 backend.index_dir에 새 버전으로 게시합니다.
+    실행 중인 앱은 재시작 없이 IndexReloader가 새 버전으로 교체합니다.
+    """
+    backend = backend or backend_from_env()
 
+    documents = load_documents()
     print(f"총 {len(documents)}개 문서 로드 완료. 임베딩 생성 중...")
 
-    embeddings = UpstageEmbeddings(model="solar-embedding-1-large", api_key=api_key)
-    vectorstore = FAISS.from_documents(documents, embeddings)
+    vectorstore = FAISS.from_documents(documents, backend.embeddings)
 
-    os.makedirs(DB_DIR, exist_ok=True)
-    vectorstore.save_local(DB_DIR)
-    print(f"FAISS 인덱스 저장 완료: {DB_DIR}")
+    version = save_version(vectorstore, backend.index_dir, keep=keep)
+    print(f"FAISS 인덱스 저장 완료: {backend.index_dir} (버전 {version})")
+    return version
 
 
 if __name__ == "__main__":
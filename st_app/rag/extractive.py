@@ -0,0 +1,126 @@
+"""
+LLM 없는 추출 요약 — 검색된 리뷰 문장을 TF-IDF 코사인 중심성으로 골라 답변을 구성
+
+LLM이 느리거나 사용할 수 없을 때 rag_review의 대체 답변(degraded mode)으로 쓰이며,
+요청 단위로 answer_mode="extractive"를 지정해 직접 선택할 수도 있습니다.
+전처리 단계(review_analysis.preprocessing)와 같은 토크나이저 / 불용어를 사용하고, TF-IDF는 sklearn의
+TfidfVectorizer(sublinear_tf=True) 기본 설정과 같은 방식으로 직접 계산합니다. (앱에 sklearn이 필요 없고,
+설치 여부에 따라 요약이 달라지지 않음)
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from review_analysis.preprocessing.korean_tokenizer import get_korean_stopwords, tokenize_korean_simple
+
+ANSWER_MODES = ("llm", "extractive")
+
+# 문장부호 또는 종결어미(~다, ~요) 뒤의 공백에서 분리
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+|(?<=[다요])\s+")
+_STOPWORDS = set(get_korean_stopwords())
+
+
+def split_sentences(text: str, min_chars: int = 8) -> List[str]:
+    """리뷰 본문을 문장 단위로 나눕니다. 너무 짧은 조각은 버립니다."""
+    sentences = []
+    for part in _SENTENCE_SPLIT.split(text or ""):
+        part = " ".join(part.split())
+        if len(part) >= min_chars:
+            sentences.append(part)
+    return sentences
+
+
+def _tokenize(sentence: str) -> str:
+    return " ".join(t for t in tokenize_korean_simple(sentence) if t not in _STOPWORDS)
+
+
+def tfidf_vectors(tokenized: List[List[str]]) -> List[Dict[str, float]]:
+    """
+    문장별 L2 정규화된 TF-IDF 벡터 {토큰: 가중치}
+    tf는 1 + log(횟수), idf는 log((1 + 문장 수) / (1 + 등장 문장 수)) + 1 (TfidfVectorizer(sublinear_tf=True)와 같음)
+    """
+    counts = [Counter(tokens) for tokens in tokenized]
+    document_frequency = Counter(token for count in counts for token in count)
+    idf = {token: math.log((1 + len(counts)) / (1 + df)) + 1 for token, df in document_frequency.items()}
+    vectors = []
+    for count in counts:
+        vector = {token: (1 + math.log(n)) * idf[token] for token, n in count.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        vectors.append({token: w / norm for token, w in vector.items()} if norm else vector)
+    return vectors
+
+
+def rank_sentences(sentences: List[str]) -> List[Tuple[int, float]]:
+    """
+    (문장 번호, 중심성 점수)를 점수 내림차순으로 돌려줍니다.
+    중심성은 다른 문장들과의 TF-IDF 코사인 유사도 평균입니다. (남은 토큰이 없으면 입력 순서)
+    """
+    if len(sentences) < 2:
+        return [(i, 1.0) for i in range(len(sentences))]
+    tokenized = [_tokenize(s).split() for s in sentences]
+    if not any(tokenized):
+        return [(i, 1.0 / (i + 1)) for i in range(len(sentences))]
+
+    vectors = tfidf_vectors(tokenized)
+    centrality = []
+    for i, vector in enumerate(vectors):
+        # 벡터는 L2 정규화되어 있어 내적이 곧 코사인
+        total = sum(sum(w * other.get(token, 0.0) for token, w in vector.items())
+                    for j, other in enumerate(vectors) if j != i)
+        centrality.append(total / (len(sentences) - 1))
+    order = sorted(range(len(sentences)), key=lambda i: (-centrality[i], i))
+    return [(i, centrality[i]) for i in order]
+
+
+def rating_of(meta: dict) -> Optional[float]:
+    try:
+        return float(meta.get("rating"))
+    except (TypeError, ValueError):
+        return None
+
+
+def central_sentences(docs: list, max_sentences: int = 3) -> List[Tuple[str, dict]]:
+    """리뷰(Document)들에서 중심 문장을 리뷰당 하나씩 골라 (문장, 메타데이터)로 돌려줍니다."""
+    sentences: List[str] = []
+    owners: List[int] = []
+    for doc_index, doc in enumerate(docs):
+        for sentence in split_sentences(doc.page_content) or [" ".join(doc.page_content.split())]:
+            sentences.append(sentence)
+            owners.append(doc_index)
+
+    chosen: List[int] = []
+    used_docs = set()
+    for index, _ in rank_sentences(sentences):
+        # 같은 리뷰에서 여러 문장을 뽑지 않아 다양한 출처를 보여줌
+        if owners[index] in used_docs:
+            continue
+        chosen.append(index)
+        used_docs.add(owners[index])
+        if len(chosen) >= max_sentences:
+            break
+    return [(sentences[index], docs[owners[index]].metadata) for index in chosen]
+
+
+def format_citation(text: str, meta: dict, max_chars: int = 120) -> str:
+    if len(text) > max_chars:
+        text = text[:max_chars] + "…"
+    return f"- \"{text}\" ({meta.get('platform', '?')}, 평점 {meta.get('rating', '?')})"
+
+
+def summarize_reviews(docs: list, max_sentences: int = 3, max_chars: int = 120) -> str:
+    """
+    검색된 리뷰(Document)에서 중심 문장을 골라 출처(플랫폼, 평점)와 함께 짧은 답변을 만듭니다.
+    """
+    if not docs:
+        return "관련 리뷰를 찾지 못했습니다."
+
+    ratings = [r for r in (rating_of(doc.metadata) for doc in docs) if r is not None]
+    header = f"관련 리뷰 {len(docs)}건에서 많이 언급된 내용입니다."
+    if ratings:
+        header += f" (평균 평점 {sum(ratings) / len(ratings):.1f})"
+
+    lines = [header]
+    for text, meta in central_sentences(docs, max_sentences):
+        lines.append(format_citation(text, meta, max_chars))
+    return "\n".join(lines)
@@ -0,0 +1,106 @@
+"""오프라인 벤치마크/테스트용 가짜 LLM · 임베딩 (ChatUpstage / UpstageEmbeddings 대체)"""
+import random
+import re
+import time
+from typing import Any, List, Optional, Sequence
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from st_app.utils.history import estimate_tokens
+
+# 라우터 프롬프트 흉내: 키워드 규칙으로 경로를 결정
+ROUTE_KEYWORDS = [
+    ("rag_review", re.compile(r"후기|리뷰|어때|어땠|만족|추천|경험|평가")),
+    ("subject_info", re.compile(r"입장료|가격|요금|운영\s*시간|몇\s*시|주차|위치|주소|교통|놀이기구|이벤트|전화")),
+]
+
+
+def _sleep(latency: float, jitter: float) -> None:
+    delay = latency + (random.uniform(-jitter, jitter) if jitter else 0.0)
+    if delay > 0:
+        time.sleep(delay)
+
+
+def fake_routes(question: str) -> List[str]:
+    return [route for route, pattern in ROUTE_KEYWORDS if pattern.search(question)] or ["chat"]
+
+
+def fake_route(question: str) -> str:
+    return ", ".join(fake_routes(question))
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    설정한 지연시간만큼 대기한 뒤 고정된 형태의 답변을 돌려주는 채팅 모델
+
+    - 라우터 프롬프트(system 메시지에 '라우터' 포함)에는 키워드 규칙으로 경로 이름만 응답
+      (bind_tools로 도구가 묶여 있으면 첫 번째 도구를 호출하는 tool call로 응답)
+    - 그 외 프롬프트에는 질문을 되풀이하는 짧은 답변을 응답
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    model_name: str = "fake-chat"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Optional[str] = None, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], tool_choice=tool_choice, **kwargs)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        _sleep(self.latency, self.jitter)
+        question = str(messages[-1].content) if messages else ""
+        is_router = any(isinstance(m, SystemMessage) and "라우터" in str(m.content) for m in messages)
+        tools = kwargs.get("tools") or []
+        tool_calls = []
+        if is_router and tools:
+            content = ""
+            tool_calls = [{
+                "name": tools[0]["function"]["name"],
+                "args": {"routes": fake_routes(question)},
+                "id": "call_fake_router",
+            }]
+        elif is_router:
+            content = fake_route(question)
+        else:
+            content = f"[fake] '{question}'에 대한 답변입니다."
+        tokens_in = sum(estimate_tokens(str(m.content)) for m in messages)
+        tokens_out = estimate_tokens(content or str(tool_calls))
+        message = AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": tokens_in,
+                "output_tokens": tokens_out,
+                "total_tokens": tokens_in + tokens_out,
+            },
+            response_metadata={"model_name": self.model_name},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class FakeEmbeddings(DeterministicFakeEmbedding):
+    """텍스트 해시 기반의 결정적 벡터를 지연시간과 함께 돌려주는 임베딩"""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        _sleep(self.latency, self.jitter)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        _sleep(self.latency, self.jitter)
+        return super().embed_query(text)
@@ -0,0 +1,184 @@
+"""
+버전별 FAISS 인덱스 디렉터리와 CURRENT 포인터 — python -m st_app.rag.index_store
+
+    faiss_index/
+        CURRENT                 # 현재 버전 이름 (원자적으로 교체)
+        versions/
+            20260119-031500/    # index.faiss, index.pkl
+            20260120-094210/
+
+- 인덱스를 새로 만들면 새 버전 디렉터리에 저장한 뒤 CURRENT만 바꿔 게시 (os.replace)
+- 실행 중인 앱은 IndexReloader가 CURRENT 변경을 감지해 새 버전을 백그라운드에서 로드·예열한 뒤
+  Backend.swap_vectorstore()로 교체 (진행 중인 검색은 이전 인덱스로 끝남)
+- CURRENT가 없으면 디렉터리 자체를 인덱스로 사용 (이전 방식과 호환)
+"""
+import os
+import shutil
+import threading
+import time
+from argparse import ArgumentParser
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from st_app.utils.tracing import tracer
+
+if TYPE_CHECKING:
+    from st_app.rag.backend import Backend
+
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+LEGACY_VERSION = "legacy"
+
+
+def list_versions(root: str) -> List[str]:
+    versions_dir = os.path.join(root, VERSIONS_DIR)
+    if not os.path.isdir(versions_dir):
+        return []
+    return sorted(v for v in os.listdir(versions_dir) if os.path.isdir(os.path.join(versions_dir, v)))
+
+
+def current_version(root: str) -> Optional[str]:
+    try:
+        with open(os.path.join(root, CURRENT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def resolve_index_dir(root: str) -> Tuple[str, str]:
+    """(버전 이름, 인덱스 디렉터리). CURRENT가 없으면 root 자체를 legacy 버전으로 사용합니다."""
+    version = current_version(root)
+    if version is None:
+        return LEGACY_VERSION, root
+    return version, os.path.join(root, VERSIONS_DIR, version)
+
+
+def new_version_dir(root: str) -> Tuple[str, str]:
+    """게시 전의 새 버전 디렉터리를 만듭니다. (이름은 생성 시각, 같은 초에 만들면 접미사 추가)"""
+    base = time.strftime("%Y%m%d-%H%M%S")
+    version, n = base, 1
+    while os.path.exists(os.path.join(root, VERSIONS_DIR, version)):
+        n += 1
+        version = f"{base}-{n}"
+    path = os.path.join(root, VERSIONS_DIR, version)
+    os.makedirs(path)
+    return version, path
+
+
+def publish_version(root: str, version: str) -> None:
+    """CURRENT를 원자적으로 교체합니다. (읽는 쪽은 항상 이전 값 또는 새 값 중 하나만 봄)"""
+    if not os.path.isdir(os.path.join(root, VERSIONS_DIR, version)):
+        raise ValueError(f"존재하지 않는 인덱스 버전: {version}")
+    tmp_path = os.path.join(root, f"{CURRENT_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(root, CURRENT_FILE))
+
+
+def prune_versions(root: str, keep: int = 3) -> List[str]:
+    """CURRENT를 제외하고 오래된 버전부터 지워 keep개만 남깁니다."""
+    current = current_version(root)
+    old = [v for v in list_versions(root) if v != current]
+    removed = old[: max(0, len(old) - max(0, keep - 1))]
+    for version in removed:
+        shutil.rmtree(os.path.join(root, VERSIONS_DIR, version), ignore_errors=True)
+    return removed
+
+
+def save_version(vectorstore, root: str, keep: int = 3) -> str:
+    """벡터스토어를 새 버전으로 저장하고 게시한 뒤 버전 이름을 돌려줍니다."""
+    version, path = new_version_dir(root)
+    vectorstore.save_local(path)
+    publish_version(root, version)
+    prune_versions(root, keep)
+    return version
+
+
+def load_version(root: str, embeddings, version: Optional[str] = None):
+    """(버전 이름, FAISS) — version을 생략하면 CURRENT"""
+    from langchain_community.vectorstores import FAISS
+
+    if version is None:
+        version, path = resolve_index_dir(root)
+    else:
+        path = os.path.join(root, VERSIONS_DIR, version)
+    return version, FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+
+
+def warm_vectorstore(vectorstore) -> None:
+    """검색 한 번으로 인덱스 메모리를 미리 건드려 교체 직후 첫 검색이 느리지 않게 합니다."""
+    import numpy as np
+
+    if vectorstore.index.ntotal:
+        probe = np.zeros((1, vectorstore.index.d), dtype=np.float32)
+        vectorstore.index.search(probe, 1)
+
+
+class IndexReloader:
+    """CURRENT를 주기적으로 확인해 새 버전을 로드·예열한 뒤 backend의 인덱스를 교체하는 백그라운드 스레드"""
+
+    def __init__(self, backend: "Backend", interval: float = 30.0):
+        self.backend = backend
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """새 버전이 게시되었으면 교체하고 True를 돌려줍니다."""
+        version = current_version(self.backend.index_dir)
+        if version is None or version == self.backend.loaded_version:
+            return False
+        with tracer.span("index_reload"):
+            version, vectorstore = load_version(self.backend.index_dir, self.backend.embeddings, version)
+            warm_vectorstore(vectorstore)
+        self.backend.swap_vectorstore(vectorstore, version=version)
+        tracer.incr("index.swaps")
+        print(f"[index] 버전 {version}으로 교체 ({vectorstore.index.ntotal}개 벡터)")
+        return True
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                # 게시 직후 정리된 버전 등: 다음 주기에 다시 시도
+                tracer.incr("index.reload_errors")
+                print(f"[index] 교체 실패: {type(e).__name__}: {e}")
+
+    def start(self) -> threading.Thread:
+        self._thread = threading.Thread(target=self.run, name="index-reloader", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Inspect and switch versioned FAISS index directories")
+    parser.add_argument('-d', '--index-dir', type=str, default=None,
+                        help="Index root. Defaults to FAISS_INDEX_DIR or st_app/db/faiss_index")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--activate', type=str, default=None, help="Point CURRENT at this version (rollback)")
+    group.add_argument('--prune', type=int, default=None, metavar="KEEP", help="Delete all but the newest KEEP versions")
+    return parser
+
+
+if __name__ == "__main__":
+    from st_app.rag.backend import FAISS_DIR
+
+    args = create_parser().parse_args()
+    root = args.index_dir or os.getenv("FAISS_INDEX_DIR", FAISS_DIR)
+    if args.activate:
+        publish_version(root, args.activate)
+        print(f"CURRENT -> {args.activate}")
+    elif args.prune is not None:
+        print(f"삭제: {prune_versions(root, args.prune)}")
+    current = current_version(root)
+    for version in list_versions(root):
+        print(f"{'*' if version == current else ' '} {version}")
+    if current is None:
+        print("(CURRENT 없음: 디렉터리 자체를 인덱스로 사용)")
@@ -0,0 +1,305 @@
+"""
+MongoDB 전처리 컬렉션 -> FAISS 인덱스 실시간 적재 — python -m st_app.rag.ingest
+
+/review/preprocess/{site_name} API가 채우는 {site}_preprocessed 컬렉션을 따라가며
+새 리뷰를 작은 배치로 임베딩해 현재 인덱스에 추가합니다. (전체 재빌드 / 앱 재시작 없음)
+
+- 폴링: 컬렉션별 마지막 _id 이후의 문서를 _id 순으로 batch_size개씩 조회 (기본)
+- 변경 스트림: --watch 지정 시 insert 이벤트를 구독 (레플리카 셋 필요)
+- 전처리 API는 컬렉션을 지우고 다시 넣으므로 (플랫폼, 날짜, 본문) 해시로 중복을 걸러냄
+- 추가는 현재 인덱스를 복제한 뒤 새 벡터를 넣고 Backend.swap_vectorstore()로 교체 (검색 중단 없음)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from argparse import ArgumentParser
+from typing import Dict, Iterable, List, Optional, Set
+
+from langchain_core.documents import Document
+
+from st_app.rag.backend import Backend
+from st_app.rag.index_store import save_version
+from st_app.rag.retriever import as_date
+from st_app.utils.tracing import tracer
+
+CHECKPOINT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "ingest_checkpoint.json"
+)
+
+PREPROCESSED_SUFFIX = "_preprocessed"
+
+_write_lock = threading.Lock()
+
+
+def record_to_document(record: dict, platform: str) -> Optional[Document]:
+    """전처리 컬렉션의 문서를 embedder.load_documents()와 같은 형태의 Document로 변환합니다."""
+    text = str(record.get("context_cleaned") or record.get("text") or "").strip()
+    if not text or text == "nan":
+        return None
+    metadata = {
+        "platform": platform,
+        "rating": str(record.get("rating", "")),
+        "date": as_date(record.get("date", "")),
+        "rating_group": str(record.get("rating_group", "")),
+    }
+    return Document(page_content=text, metadata=metadata)
+
+
+def content_key(doc: Document) -> str:
+    meta = doc.metadata
+    raw = f"{meta.get('platform', '')}|{meta.get('date') or ''}|{' '.join(doc.page_content.split())}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def indexed_keys(vectorstore) -> Set[str]:
+    """현재 인덱스에 들어 있는 문서들의 중복 판별 키"""
+    return {
+        content_key(vectorstore.docstore.search(doc_id))
+        for doc_id in vectorstore.index_to_docstore_id.values()
+    }
+
+
+def clone_vectorstore(vectorstore):
+    """FAISS 인덱스와 docstore를 복제합니다. (다시 임베딩하지 않음)"""
+    import faiss
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+
+    return FAISS(
+        embedding_function=vectorstore.embedding_function,
+        index=faiss.clone_index(vectorstore.index),
+        docstore=InMemoryDocstore(dict(vectorstore.docstore._dict)),
+        index_to_docstore_id=dict(vectorstore.index_to_docstore_id),
+        normalize_L2=vectorstore._normalize_L2,
+        distance_strategy=vectorstore.distance_strategy,
+    )
+
+
+def append_documents(backend: Backend, docs: List[Document]) -> int:
+    """
+    문서를 임베딩해 인덱스 복제본에 추가하고 backend의 인덱스를 교체합니다.
+    임베딩은 잠금 밖에서 수행하므로 그동안에도 검색은 기존 인덱스로 계속됩니다.
+    복제하는 동안 다른 곳(IndexReloader 등)에서 인덱스가 교체되면 덮어쓰지 않고 새 인덱스를 다시 복제해 추가합니다.
+    """
+    if not docs:
+        return 0
+    texts = [doc.page_content for doc in docs]
+    vectors = backend.embeddings.embed_documents(texts)
+    with _write_lock:
+        while True:
+            version = backend.index_version
+            updated = clone_vectorstore(backend.get_vectorstore())
+            updated.add_embeddings(list(zip(texts, vectors)), metadatas=[doc.metadata for doc in docs])
+            if backend.swap_vectorstore(updated, expected_version=version):
+                break
+            tracer.incr("ingest.append_retries")
+    return len(docs)
+
+
+def load_checkpoint(path: str) -> Dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, str]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class IngestionWorker:
+    """
+    {site}_preprocessed 컬렉션들을 따라가며 새 리뷰를 인덱스에 추가하는 워커
+
+    - collections: {사이트 이름: pymongo Collection}
+    - batch_size: 한 번에 임베딩할 최대 문서 수
+    - persist: 배치마다 인덱스를 backend.index_dir에 새 버전으로 게시 (별도 프로세스로 실행할 때)
+      게시한 뒤에만 체크포인트를 파일에 저장합니다. persist=False이면 추가된 문서는 메모리에만 있으므로
+      체크포인트도 메모리에만 두고, 인덱스가 교체되면(IndexReloader 등) 처음부터 다시 훑어 빠진 문서를 채웁니다.
+    """
+
+    def __init__(self, backend: Backend, collections: Dict[str, object], batch_size: int = 64,
+                 poll_interval: float = 5.0, checkpoint_path: Optional[str] = CHECKPOINT_PATH,
+                 persist: bool = False):
+        self.backend = backend
+        self.collections = collections
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.checkpoint_path = checkpoint_path
+        self.persist = persist
+        self.checkpoint: Dict[str, str] = load_checkpoint(checkpoint_path) if checkpoint_path and persist else {}
+        self.seen: Set[str] = indexed_keys(backend.get_vectorstore())
+        self._index_version = backend.index_version
+        self.added_total = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sync_index(self) -> None:
+        """다른 곳에서 인덱스가 교체되었으면 중복 판별 키를 새 인덱스로 다시 만듭니다."""
+        if self.backend.index_version == self._index_version:
+            return
+        self.seen = indexed_keys(self.backend.get_vectorstore())
+        self._index_version = self.backend.index_version
+        if not self.persist:
+            # 메모리에만 추가했던 문서는 교체로 사라졌으므로 처음부터 다시 훑음 (이미 있는 문서는 seen으로 걸러짐)
+            self.checkpoint = {}
+
+    def _ingest(self, site: str, records: List[dict]) -> int:
+        """한 배치를 중복 제거 후 인덱스에 추가하고 추가된 문서 수를 돌려줍니다."""
+        docs, keys = [], set()
+        for record in records:
+            doc = record_to_document(record, site)
+            if doc is None:
+                continue
+            key = content_key(doc)
+            if key in self.seen or key in keys:
+                tracer.incr("ingest.duplicates")
+                continue
+            keys.add(key)
+            docs.append(doc)
+        expected = self._index_version + (1 if docs else 0)
+        with tracer.span("ingest_batch"):
+            added = append_documents(self.backend, docs)
+        # 추가에 성공한 뒤에만 기록 (임베딩이 실패하면 다음 시도에서 다시 추가)
+        self.seen |= keys
+        if self.backend.index_version == expected:
+            self._index_version = expected
+        # 그 사이 다른 곳에서 인덱스가 교체되었으면 _index_version을 그대로 두어 다음 _sync_index에서 seen을 다시 만듦
+        if added:
+            self.added_total += added
+            tracer.incr("ingest.documents", added)
+            if self.persist:
+                version = save_version(self.backend.get_vectorstore(), self.backend.index_dir)
+                self.backend.loaded_version = version
+        return added
+
+    def _advance(self, site: str, last_id) -> None:
+        self.checkpoint[site] = str(last_id)
+        if self.checkpoint_path and self.persist:
+            save_checkpoint(self.checkpoint_path, self.checkpoint)
+
+    def poll_once(self) -> int:
+        """
+        모든 컬렉션에서 마지막 _id 이후 문서를 한 배치씩 가져와 적재합니다.
+        가져온 문서 수(중복 포함)를 돌려주며, 0이면 밀린 문서가 없다는 뜻입니다.
+        """
+        from bson import ObjectId
+
+        self._sync_index()
+        fetched = 0
+        for site, collection in self.collections.items():
+            query = {}
+            if site in self.checkpoint:
+                query = {"_id": {"$gt": ObjectId(self.checkpoint[site])}}
+            records = list(collection.find(query).sort("_id", 1).limit(self.batch_size))
+            if not records:
+                continue
+            fetched += len(records)
+            self._ingest(site, records)
+            self._advance(site, records[-1]["_id"])
+        return fetched
+
+    def run(self) -> None:
+        """중지될 때까지 폴링합니다. (밀린 문서가 있으면 쉬지 않고 다음 배치를 처리)"""
+        while not self._stop.is_set():
+            before = self.added_total
+            try:
+                fetched = self.poll_once()
+            except Exception as e:
+                tracer.incr("ingest.errors")
+                print(f"[ingest] 오류: {type(e).__name__}: {e}")
+                fetched = 0
+            if self.added_total > before:
+                print(f"[ingest] {self.added_total - before}건 추가 (인덱스 버전 {self.backend.index_version})")
+            if not fetched:
+                self._stop.wait(self.poll_interval)
+
+    def watch(self, max_wait: float = 1.0) -> None:
+        """변경 스트림으로 insert 이벤트를 받아 batch_size 또는 max_wait 단위로 적재합니다. (레플리카 셋 필요)"""
+        streams = {
+            site: collection.watch([{"$match": {"operationType": "insert"}}])
+            for site, collection in self.collections.items()
+        }
+        try:
+            pending: Dict[str, List[dict]] = {site: [] for site in streams}
+            deadline = time.monotonic() + max_wait
+            while not self._stop.is_set():
+                for site, stream in streams.items():
+                    change = stream.try_next()
+                    if change is not None:
+                        pending[site].append(change["fullDocument"])
+                if any(len(v) >= self.batch_size for v in pending.values()) or time.monotonic() >= deadline:
+                    self._sync_index()
+                    for site, records in pending.items():
+                        if records:
+                            self._ingest(site, records)
+                            self._advance(site, records[-1]["_id"])
+                    pending = {site: [] for site in streams}
+                    deadline = time.monotonic() + max_wait
+        finally:
+            for stream in streams.values():
+                stream.close()
+
+    def start(self, watch: bool = False) -> threading.Thread:
+        """백그라운드 스레드로 실행합니다. (앱과 같은 프로세스에서 backend를 공유할 때)"""
+        self._thread = threading.Thread(target=self.watch if watch else self.run, name="ingest", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def preprocessed_collections(db, sites: Optional[Iterable[str]] = None) -> Dict[str, object]:
+    """사이트 이름 -> {site}_preprocessed 컬렉션 (sites를 생략하면 DB에 있는 전체)"""
+    if sites is None:
+        names = [n for n in db.list_collection_names() if n.endswith(PREPROCESSED_SUFFIX)]
+        sites = [n[: -len(PREPROCESSED_SUFFIX)] for n in names]
+    return {site: db[f"{site}{PREPROCESSED_SUFFIX}"] for site in sites}
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Tail {site}_preprocessed MongoDB collections into the FAISS index")
+    parser.add_argument('-s', '--sites', type=str, nargs='*', default=None,
+                        help="Sites to follow (default: every *_preprocessed collection)")
+    parser.add_argument('-b', '--backend', type=str, default=None,
+                        help="Backend to use. Defaults to the LLM_BACKEND environment variable.")
+    parser.add_argument('--batch-size', type=int, default=64, help="Documents embedded per micro-batch")
+    parser.add_argument('--poll-interval', type=float, default=5.0, help="Seconds between polls when idle")
+    parser.add_argument('--checkpoint', type=str, default=CHECKPOINT_PATH, help="Last ingested _id per site (.json)")
+    parser.add_argument('--watch', action='store_true', help="Use change streams instead of polling")
+    parser.add_argument('--once', action='store_true', help="Ingest everything pending and exit")
+    return parser
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from st_app.rag.backend import backend_from_env
+    load_dotenv()
+
+    from database.mongodb_connection import mongo_db
+
+    args = create_parser().parse_args()
+    worker = IngestionWorker(
+        backend_from_env(args.backend),
+        preprocessed_collections(mongo_db, args.sites),
+        batch_size=args.batch_size,
+        poll_interval=args.poll_interval,
+        checkpoint_path=args.checkpoint,
+        persist=True,
+    )
+    if args.once:
+        while worker.poll_once():
+            pass
+        print(f"[ingest] 완료: {worker.added_total}건 추가")
+    elif args.watch:
+        worker.watch()
+    else:
+        worker.run()
@@ -1,17 +1,240 @@
+"""
+LLM 호출 정책 — 노드별 타임아웃, 헤지 요청(hedged request), 대체 경로(fallback)
+
+chain.invoke()를 그대로 부르면 엔드포인트가 느려질 때 노드가 무한정 대기합니다.
+invoke_llm()은 다음 순서로 한 턴의 꼬리 지연시간을 제한합니다.
+
+1. 기본 모델 호출 — 최근 p95 지연시간이 지나도 응답이 없으면 같은 요청을 한 번 더 보내고
+   먼저 도착한 응답을 사용 (헤지)
+2. 노드 타임아웃 초과 또는 오류 시 policy.fallbacks 순서대로 시도
+   - cheap_model: Backend.fallback_llm (더 싸고 빠른 모델)
+   - cache: 같은 노드 / 같은 질문 / 같은 대화 기록(요약 포함)과 검색 문맥에 대해 마지막으로 성공한 답변
+   - extractive: 노드가 넘겨준 LLM 없는 답변 (예: 검색된 리뷰 발췌)
+3. 모두 실패하면 안내 문구를 돌려줌
+"""
+import contextvars
+import hashlib
 import os
-import streamlit as st
-from langchain_upstage import ChatUpstage
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Tuple
+
+from st_app.utils.tracing import tracer
+
+if TYPE_CHECKING:
+    from langchain_core.messages import AIMessage
+
+    from st_app.rag.backend import Backend
+
+FALLBACK_CHOICES = ("cheap_model", "cache", "extractive")
+
+UNAVAILABLE_MESSAGE = "지금은 답변을 생성하기 어렵습니다. 잠시 후 다시 시도해 주세요."
+
+
+def get_api_key() -> str:
+    key = os.getenv("UPSTAGE_API_KEY", "")
+    if not key:
+        raise ValueError("UPSTAGE_API_KEY가 설정되지 않았습니다.")
+    return key
+
+
+@dataclass
+class LLMPolicy:
+    """
+    LLM 호출 정책
+
+    - timeout: 노드가 기본 모델 응답을 기다리는 최대 시간(초). node_timeouts로 노드별 지정
+    - hedge_delay: 헤지 요청을 보낼 시점(초). None이면 노드별 최근 p95 지연시간 사용
+    - hedge_min_samples: p95를 쓰기 위해 필요한 최소 표본 수 (부족하면 헤지하지 않음)
+    - fallback_timeout: cheap_model 대체 호출의 타임아웃(초)
+    - fallbacks: 타임아웃/오류 시 시도할 대체 경로 순서
+    """
+
+    timeout: float = 20.0
+    hedge: bool = True
+    hedge_delay: Optional[float] = None
+    hedge_min_samples: int = 20
+    fallback_timeout: float = 5.0
+    fallbacks: Tuple[str, ...] = FALLBACK_CHOICES
+    node_timeouts: Dict[str, float] = field(default_factory=dict)
+
+    def timeout_for(self, node: str) -> float:
+        return self.node_timeouts.get(node, self.timeout)
+
+
+def policy_from_env() -> LLMPolicy:
+    """
+    환경변수로 정책을 구성합니다.
+
+    - LLM_TIMEOUT: 노드 타임아웃(초, 기본 20)
+    - LLM_HEDGE_DELAY: 헤지 시점(초). 비우면 최근 p95, 0이면 헤지하지 않음
+    - LLM_FALLBACK_TIMEOUT: 대체 모델 타임아웃(초, 기본 5)
+    - LLM_FALLBACKS: 쉼표로 구분한 대체 경로 (기본 cheap_model,cache,extractive)
+    """
+    policy = LLMPolicy()
+    if os.getenv("LLM_TIMEOUT"):
+        policy.timeout = float(os.environ["LLM_TIMEOUT"])
+    if os.getenv("LLM_HEDGE_DELAY"):
+        policy.hedge_delay = float(os.environ["LLM_HEDGE_DELAY"])
+        policy.hedge = policy.hedge_delay > 0
+    if os.getenv("LLM_FALLBACK_TIMEOUT"):
+        policy.fallback_timeout = float(os.environ["LLM_FALLBACK_TIMEOUT"])
+    if os.getenv("LLM_FALLBACKS") is not None:
+        names = [name.strip() for name in os.environ["LLM_FALLBACKS"].split(",") if name.strip()]
+        unknown = [name for name in names if name not in FALLBACK_CHOICES]
+        if unknown:
+            raise ValueError(f"알 수 없는 LLM_FALLBACKS: {unknown} (선택: {', '.join(FALLBACK_CHOICES)})")
+        policy.fallbacks = tuple(names)
+    return policy
+
+
+class _LatencyWindow:
+    """노드별 최근 LLM 응답 시간 (헤지 시점 계산용)"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._lock = threading.Lock()
+        self._values: Dict[str, Deque[float]] = {}
+
+    def add(self, node: str, seconds: float) -> None:
+        with self._lock:
+            self._values.setdefault(node, deque(maxlen=self.window)).append(seconds)
+
+    def p95(self, node: str, min_samples: int) -> Optional[float]:
+        with self._lock:
+            values = sorted(self._values.get(node, ()))
+        if len(values) < max(1, min_samples):
+            return None
+        return values[min(len(values) - 1, int(0.95 * len(values)))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+latencies = _LatencyWindow()
+
+# 타임아웃으로 버려진 호출도 끝날 때까지 스레드를 점유하므로 여유 있게 잡음
+_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="llm")
+
+
+def _submit(runnable, inputs: dict) -> Future:
+    # 호출마다 컨텍스트를 복사해야 헤지 요청이 동시에 실행될 수 있음
+    ctx = contextvars.copy_context()
+    started = time.perf_counter()
+
+    def run():
+        result = ctx.run(runnable.invoke, inputs)
+        return result, time.perf_counter() - started
+
+    return _executor.submit(run)
+
+
+def _first_success(futures: List[Future], deadline: float) -> Optional[Tuple[Future, tuple]]:
+    """마감 시각 전에 성공한 첫 번째 결과를 돌려줍니다. (모두 실패하거나 시간 초과면 None)"""
+    pending = set(futures)
+    while pending:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return None
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future, future.result()
+    return None
+
+
+def _invoke_primary(runnable, inputs: dict, node: str, policy: LLMPolicy) -> Optional["AIMessage"]:
+    start = time.perf_counter()
+    deadline = start + policy.timeout_for(node)
+    primary = _submit(runnable, inputs)
+
+    hedge_delay = policy.hedge_delay
+    if hedge_delay is None:
+        hedge_delay = latencies.p95(node, policy.hedge_min_samples)
+    futures = [primary]
+    if policy.hedge and hedge_delay is not None and start + hedge_delay < deadline:
+        done, _ = wait([primary], timeout=hedge_delay)
+        # 기본 요청이 이미 실패했으면 곧바로 재시도하는 것과 같음
+        if not done or primary.exception() is not None:
+            tracer.incr(f"llm.{node}.hedged")
+            futures.append(_submit(runnable, inputs))
+
+    winner = _first_success(futures, deadline)
+    if winner is None:
+        errors = [f for f in futures if f.done() and f.exception() is not None]
+        tracer.incr(f"llm.{node}.{'error' if len(errors) == len(futures) else 'timeout'}")
+        return None
+    future, (result, elapsed) = winner
+    if future is not primary:
+        tracer.incr(f"llm.{node}.hedge_won")
+    latencies.add(node, elapsed)
+    return result
+
+
+def _cache_key(node: str, inputs: dict) -> tuple:
+    """(노드, 공백을 정리한 질문, 질문 외 입력의 해시)"""
+    digest = hashlib.sha1()
+    for name in sorted(inputs):
+        if name == "question":
+            continue
+        # 대화 기록은 {role, content} 메시지 리스트 (요약은 그 안의 시스템 메시지), 검색 문맥 등은 문자열
+        value = inputs[name]
+        for part in value if isinstance(value, (list, tuple)) else [value]:
+            if isinstance(part, dict):
+                part = f"{part.get('role', '')}: {part.get('content', '')}"
+            digest.update(f"{name}|{getattr(part, 'type', '')}|{getattr(part, 'content', part)}\n".encode("utf-8"))
+    return node, " ".join(str(inputs.get("question", "")).split()), digest.hexdigest()
+
+
+def invoke_llm(
+    backend: "Backend",
+    node: str,
+    prompt,
+    inputs: dict,
+    bind: Optional[Callable] = None,
+    extractive: Optional[Callable[[], str]] = None,
+) -> "AIMessage":
+    """
+    prompt | llm 을 정책에 따라 실행합니다.
+
+    - bind: 모델에 도구 등을 묶는 함수 (기본 모델과 대체 모델 모두에 적용)
+    - extractive: LLM 없이 답변 문자열을 만드는 함수 (extractive 대체 경로)
+    """
+    from langchain_core.messages import AIMessage
+
+    policy = backend.policy
 
+    def chain_for(llm):
+        return prompt | (bind(llm) if bind else llm)
 
-def _get_api_key() -> str:
-    try:
-        return st.secrets["UPSTAGE_API_KEY"]
-    except (KeyError, FileNotFoundError):
-        key = os.getenv("UPSTAGE_API_KEY", "")
-        if not key:
-            raise ValueError("UPSTAGE_API_KEY가 설정되지 않았습니다.")
-        return key
+    result = _invoke_primary(chain_for(backend.llm), inputs, node, policy)
+    if result is not None:
+        backend.answer_cache.put(_cache_key(node, inputs), result)
+        return result
 
+    for name in policy.fallbacks:
+        if name == "cheap_model" and backend.fallback_llm is not None:
+            future = _submit(chain_for(backend.fallback_llm), inputs)
+            winner = _first_success([future], time.perf_counter() + policy.fallback_timeout)
+            if winner is not None:
+                result = winner[1][0]
+        elif name == "cache":
+            cached = backend.answer_cache.get(_cache_key(node, inputs))
+            if cached is not None:
+                # 토큰 사용량은 이미 집계되었으므로 내용만 복사
+                result = AIMessage(content=cached.content, tool_calls=cached.tool_calls)
+        elif name == "extractive" and extractive is not None:
+            try:
+                result = AIMessage(content=extractive())
+            except Exception:
+                result = None
+        if result is not None:
+            tracer.incr(f"llm.{node}.fallback.{name}")
+            return result
 
-def get_llm() -> ChatUpstage:
-    return ChatUpstage(model="solar-mini", api_key=_get_api_key())
+    tracer.incr(f"llm.{node}.unavailable")
+    return AIMessage(content=UNAVAILABLE_MESSAGE)
@@ -1,4 +1,4 @@
-from langchain.prompts import ChatPromptTemplate
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 RAG_REVIEW_PROMPT = ChatPromptTemplate.from_messages([
     ("system",
@@ -6,6 +6,7 @@ RAG_REVIEW_PROMPT = ChatPromptTemplate.from_messages([
      "아래 검색된 리뷰 데이터를 참고하여 사용자 질문에 친절하고 자세하게 한국어로 답변하세요. "
      "리뷰 내용을 종합하여 답변하되, 출처(플랫폼, 평점)도 간단히 언급해주세요.\n\n"
      "=== 검색된 리뷰 ===\n{context}\n==================="),
+    MessagesPlaceholder("chat_history", optional=True),
     ("human", "{question}"),
 ])
 
@@ -14,6 +15,7 @@ SUBJECT_INFO_PROMPT = ChatPromptTemplate.from_messages([
      "당신은 에버랜드 안내 도우미입니다. "
      "아래 에버랜드 기본 정보를 바탕으로 사용자 질문에 친절하고 정확하게 한국어로 답변하세요.\n\n"
      "=== 에버랜드 정보 ===\n{subject_info}\n==================="),
+    MessagesPlaceholder("chat_history", optional=True),
     ("human", "{question}"),
 ])
 
@@ -21,16 +23,21 @@ CHAT_PROMPT = ChatPromptTemplate.from_messages([
     ("system",
      "당신은 에버랜드 챗봇입니다. 사용자와 친근하게 한국어로 대화하세요. "
      "에버랜드와 관련 없는 일반적인 대화도 자연스럽게 이어가세요."),
+    MessagesPlaceholder("chat_history", optional=True),
     ("human", "{question}"),
 ])
 
 ROUTER_PROMPT = ChatPromptTemplate.from_messages([
     ("system",
      "당신은 사용자 질문의 의도를 분류하는 라우터입니다. "
-     "아래 세 카테고리 중 하나로만 분류하세요:\n\n"
+     "아래 세 카테고리로 분류하세요:\n\n"
      "- subject_info: 에버랜드의 기본 정보(위치, 운영시간, 입장료, 놀이기구 목록, 주차, 교통편, 이벤트 등)를 묻는 질문\n"
      "- rag_review: 에버랜드 방문 후기, 리뷰, 실제 경험, 만족도, 추천 등을 묻는 질문\n"
      "- chat: 일반적인 인사, 잡담, 에버랜드와 무관한 질문\n\n"
-     "반드시 subject_info, rag_review, chat 중 하나만 답하세요. 다른 말은 하지 마세요."),
+     "이전 대화가 있다면 후속 질문의 맥락을 고려하세요.\n"
+     "한 질문에 여러 의도가 섞여 있으면(예: 입장료와 방문 후기를 함께 묻는 경우) "
+     "해당하는 카테고리를 모두 답하세요. (예: [\"subject_info\", \"rag_review\"])\n"
+     "RouteDecision 도구를 호출하여 routes에 subject_info, rag_review, chat 중에서만 답하세요."),
+    MessagesPlaceholder("chat_history", optional=True),
     ("human", "{question}"),
 ])
@@ -1,19 +1,205 @@
-import os
-import streamlit as st
-from langchain_community.vectorstores import FAISS
-from langchain_upstage import UpstageEmbeddings
-from st_app.rag.llm import _get_api_key
+"""
+리뷰 검색 — 유사도 + 최신성 가중치, 날짜 구간(연/분기)별 하위 인덱스
 
-FAISS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "db", "faiss_index")
+- 유사도 상위 후보를 넉넉히 가져온 뒤 리뷰 날짜가 최근일수록 점수를 높여 다시 정렬
+- "요즘", "최근" 같은 질문은 최근 구간(backend.recent_days)의 리뷰만 검색
+- backend.date_buckets("year" | "quarter")를 지정하면 구간별 FAISS 하위 인덱스를 만들어
+  최근 구간 검색 시 해당 인덱스만 조회
+"""
+import re
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
+from st_app.rag.backend import Backend
+from st_app.utils.tracing import tracer, record_cache, record_retrieval
 
-@st.cache_resource
-def load_retriever(k: int = 5):
-    embeddings = UpstageEmbeddings(model="solar-embedding-1-large", api_key=_get_api_key())
-    vectorstore = FAISS.load_local(FAISS_DIR, embeddings, allow_dangerous_deserialization=True)
-    return vectorstore.as_retriever(search_kwargs={"k": k})
+RECENT_QUERY = re.compile(r"요즘|최근|요새|근래|근황|올해|이번\s*(달|주|시즌)")
 
+BUCKET_CHOICES = ("year", "quarter")
 
-def retrieve_reviews(query: str, k: int = 5) -> list:
-    retriever = load_retriever(k=k)
-    return retriever.invoke(query)
+# 최신성 재정렬을 위해 k의 몇 배까지 후보를 가져올지
+FETCH_MULTIPLIER = 4
+
+
+def as_date(value) -> Optional[date]:
+    """메타데이터의 날짜(date / datetime / "YYYY-MM-DD" 문자열)를 date로 변환합니다."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def date_bucket(value: date, granularity: str = "year") -> str:
+    if granularity == "quarter":
+        return f"{value.year}Q{(value.month - 1) // 3 + 1}"
+    return str(value.year)
+
+
+def is_recent_query(query: str) -> bool:
+    return bool(RECENT_QUERY.search(query))
+
+
+def recency_weight(value: Optional[date], as_of: date, half_life_days: float) -> float:
+    """리뷰 나이가 half_life_days일 때마다 절반이 되는 가중치 (날짜가 없으면 가장 오래된 것으로 취급)"""
+    if value is None or half_life_days <= 0:
+        return 0.0
+    age = max(0, (as_of - value).days)
+    return 0.5 ** (age / half_life_days)
+
+
+class DateBucketIndex:
+    """날짜 구간별 FAISS 하위 인덱스 (본 인덱스의 벡터를 재사용하여 다시 임베딩하지 않음)"""
+
+    def __init__(self, stores: Dict[str, object], granularity: str, as_of: Optional[date]):
+        self.stores = stores
+        self.granularity = granularity
+        self.as_of = as_of
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore, granularity: str = "year") -> "DateBucketIndex":
+        from langchain_community.vectorstores import FAISS
+
+        groups: Dict[str, List[Tuple[str, list, dict]]] = {}
+        dates = []
+        ids = vectorstore.index_to_docstore_id
+        vectors = vectorstore.index.reconstruct_n(0, len(ids))
+        for position in range(len(ids)):
+            doc = vectorstore.docstore.search(ids[position])
+            doc_date = as_date(doc.metadata.get("date"))
+            if doc_date is None:
+                continue
+            dates.append(doc_date)
+            groups.setdefault(date_bucket(doc_date, granularity), []).append(
+                (doc.page_content, vectors[position].tolist(), doc.metadata)
+            )
+        stores = {}
+        for bucket, rows in groups.items():
+            stores[bucket] = FAISS.from_embeddings(
+                [(text, vector) for text, vector, _ in rows],
+                vectorstore.embeddings,
+                metadatas=[meta for _, _, meta in rows],
+                distance_strategy=vectorstore.distance_strategy,
+            )
+        return cls(stores, granularity, max(dates) if dates else None)
+
+    def buckets_since(self, cutoff: date) -> List[str]:
+        start = date_bucket(cutoff, self.granularity)
+        return sorted(b for b in self.stores if b >= start)
+
+    def search(self, query_vector: List[float], k: int, buckets: List[str]) -> List[tuple]:
+        results = []
+        for bucket in buckets:
+            results.extend(self.stores[bucket].similarity_search_with_score_by_vector(query_vector, k=k))
+        return sorted(results, key=lambda pair: pair[1])[:k]
+
+
+_bucket_lock = threading.Lock()
+
+
+def get_bucket_index(backend: Backend) -> Optional[DateBucketIndex]:
+    """
+    backend.date_buckets가 지정되어 있으면 구간별 인덱스를 처음 사용할 때 한 번 만듭니다.
+    만드는 동안 인덱스가 교체되면 만든 인덱스는 이번 호출에만 쓰고 backend에 저장하지 않습니다.
+    """
+    if not backend.date_buckets:
+        return None
+    bucket_index = backend.bucket_index
+    if bucket_index is None:
+        with _bucket_lock:
+            bucket_index = backend.bucket_index
+            if bucket_index is None:
+                version = backend.index_version
+                bucket_index = DateBucketIndex.from_vectorstore(backend.get_vectorstore(), backend.date_buckets)
+                backend.update_if_current(version, bucket_index=bucket_index)
+    return bucket_index
+
+
+def latest_date(vectorstore) -> Optional[date]:
+    """인덱스에서 가장 최근 리뷰 날짜 ("최근"의 기준일)"""
+    docs = (vectorstore.docstore.search(doc_id) for doc_id in vectorstore.index_to_docstore_id.values())
+    dates = [d for d in (as_date(doc.metadata.get("date")) for doc in docs) if d is not None]
+    return max(dates) if dates else None
+
+
+def get_as_of(backend: Backend) -> Optional[date]:
+    bucket_index = get_bucket_index(backend)
+    if bucket_index is not None:
+        return bucket_index.as_of
+    as_of = backend.as_of
+    if as_of is None:
+        with _bucket_lock:
+            as_of = backend.as_of
+            if as_of is None:
+                version = backend.index_version
+                as_of = latest_date(backend.get_vectorstore())
+                backend.update_if_current(version, as_of=as_of)
+    return as_of
+
+
+def load_retriever(backend: Backend):
+    """현재 인덱스의 retriever (인덱스가 교체되면 다음 호출부터 새 인덱스를 사용)"""
+    return backend.retriever
+
+
+def _search(backend: Backend, query: str, k: int, recent: bool) -> List[tuple]:
+    """(문서, 최종 점수) 목록. 점수는 유사도(1 / (1 + 거리))에 최신성 가중치를 섞은 값입니다."""
+    vectorstore = backend.get_vectorstore()
+    fetch_k = k * FETCH_MULTIPLIER if backend.recency_weight > 0 else k
+    bucket_index = get_bucket_index(backend)
+    as_of = get_as_of(backend)
+
+    if recent and as_of is not None:
+        cutoff = as_of - timedelta(days=backend.recent_days)
+        if bucket_index is not None:
+            query_vector = backend.embeddings.embed_query(query)
+            results = bucket_index.search(query_vector, fetch_k, bucket_index.buckets_since(cutoff))
+            results = [(doc, d) for doc, d in results if (as_date(doc.metadata.get("date")) or cutoff) >= cutoff]
+        else:
+            results = vectorstore.similarity_search_with_score(
+                query, k=fetch_k, fetch_k=fetch_k * 10,
+                filter=lambda meta: (as_date(meta.get("date")) or date.min) >= cutoff,
+            )
+        if not results:
+            tracer.incr("retrieval.recent_empty")  # 최근 리뷰가 없으면 전체 기간으로 검색
+            results = vectorstore.similarity_search_with_score(query, k=fetch_k)
+    else:
+        results = vectorstore.similarity_search_with_score(query, k=fetch_k)
+
+    scored = []
+    for doc, distance in results:
+        similarity = 1.0 / (1.0 + float(distance))
+        if backend.recency_weight > 0 and as_of is not None:
+            weight = recency_weight(as_date(doc.metadata.get("date")), as_of, backend.half_life_days)
+            similarity *= (1 - backend.recency_weight) + backend.recency_weight * weight
+        scored.append((doc, similarity))
+    scored.sort(key=lambda pair: -pair[1])
+    return scored[:k]
+
+
+def retrieve_reviews(backend: Backend, query: str, k: Optional[int] = None, recent: Optional[bool] = None) -> list:
+    """
+    질문과 관련된 리뷰를 최신성 가중치를 반영해 검색합니다.
+    recent를 생략하면 질문에 "요즘", "최근" 등이 있을 때 최근 리뷰만 검색합니다.
+    """
+    k = k or backend.k
+    if recent is None:
+        recent = is_recent_query(query)
+    with tracer.span("retrieve_reviews"):
+        key = (query.strip(), k, recent)
+        cached = backend.query_cache.get(key)
+        record_cache(cached is not None)
+        if cached is not None:
+            docs, scores = cached
+        else:
+            version = backend.index_version
+            results = _search(backend, query, k, recent)
+            docs = [doc for doc, _ in results]
+            scores = [score for _, score in results]
+            backend.cache_query(version, key, (docs, scores))
+        record_retrieval(k, scores)
+        return docs
@@ -0,0 +1,142 @@
+"""
+앱 시작 시 백그라운드 예열 — python -m st_app.rag.warmup
+
+배포 직후 첫 리뷰 질문이 인덱스 역직렬화, 임베딩 클라이언트 연결(TLS), 기준일 계산을
+한꺼번에 치르지 않도록 프로세스 시작 시 백그라운드 스레드에서 미리 수행합니다.
+
+1. index: FAISS 인덱스 로드 (Backend.get_vectorstore)
+2. pretouch: 전체 벡터를 한 번 훑어 메모리에 올리고, 최신성 기준일 / 날짜 구간 인덱스 계산
+3. embeddings: 질의 임베딩 한 번으로 클라이언트 연결 수립
+4. canary: (선택) 그래프에 실제 질문을 한 번 실행해 LLM 연결까지 확인
+"""
+import threading
+import time
+from argparse import ArgumentParser
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from st_app.rag.index_store import warm_vectorstore
+from st_app.utils.tracing import tracer
+
+if TYPE_CHECKING:
+    from st_app.rag.backend import Backend
+
+STAGES = ("index", "pretouch", "embeddings", "canary")
+
+PENDING, RUNNING, READY, FAILED, SKIPPED = "pending", "running", "ready", "failed", "skipped"
+
+WARMUP_QUERY = "에버랜드 리뷰"
+
+
+class Warmup:
+    """
+    예열 단계를 차례로 실행하고 단계별 상태를 기록합니다. (한 단계가 실패하면 나머지는 건너뜀)
+
+    - graph, canary: 둘 다 주어지면 마지막에 canary 질문을 그래프로 실행
+    - ready: 모든 단계가 끝나면(실패 포함) set되는 Event
+    """
+
+    def __init__(self, backend: "Backend", graph=None, canary: Optional[str] = None):
+        self.backend = backend
+        self.graph = graph
+        self.canary = canary
+        self.status: Dict[str, str] = {stage: PENDING for stage in STAGES}
+        self.elapsed_ms: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.ready.is_set() and self.error is None
+
+    @property
+    def current_stage(self) -> Optional[str]:
+        return next((stage for stage in STAGES if self.status[stage] == RUNNING), None)
+
+    def _index(self) -> None:
+        self.backend.get_vectorstore()
+
+    def _pretouch(self) -> None:
+        from st_app.rag.retriever import get_as_of
+
+        warm_vectorstore(self.backend.get_vectorstore())
+        get_as_of(self.backend)  # date_buckets가 지정되어 있으면 구간 인덱스도 함께 생성
+
+    def _embeddings(self) -> None:
+        self.backend.embeddings.embed_query(WARMUP_QUERY)
+
+    def _canary(self) -> None:
+        from st_app.batch import answer_question
+
+        result = answer_question(self.graph, self.canary)
+        print(f"[warmup] canary 경로: {'+'.join(result['routes'])}, {result['timings']['total_ms']:.0f}ms")
+
+    def run(self) -> bool:
+        """모든 단계를 실행하고 성공 여부를 돌려줍니다."""
+        try:
+            for stage in STAGES:
+                if stage == "canary" and (self.graph is None or not self.canary):
+                    self.status[stage] = SKIPPED
+                    continue
+                self.status[stage] = RUNNING
+                start = time.perf_counter()
+                try:
+                    with tracer.span(f"warmup_{stage}"):
+                        getattr(self, f"_{stage}")()
+                except Exception as e:
+                    self.status[stage] = FAILED
+                    self.error = f"{stage}: {type(e).__name__}: {e}"
+                    tracer.incr("warmup.errors")
+                    print(f"[warmup] 실패 - {self.error}")
+                    for rest in STAGES[STAGES.index(stage) + 1:]:
+                        self.status[rest] = SKIPPED
+                    return False
+                finally:
+                    self.elapsed_ms[stage] = round((time.perf_counter() - start) * 1000, 1)
+                self.status[stage] = READY
+            return True
+        finally:
+            self.ready.set()
+
+    def start(self) -> threading.Thread:
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """끝날 때까지 기다린 뒤 성공 여부를 돌려줍니다. (timeout이 지나면 False)"""
+        return self.ready.wait(timeout) and self.error is None
+
+    def summary(self) -> List[dict]:
+        return [
+            {"stage": stage, "status": self.status[stage], "ms": self.elapsed_ms.get(stage)}
+            for stage in STAGES
+        ]
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Warm up the FAISS index and model clients, optionally running a canary question")
+    parser.add_argument('-b', '--backend', type=str, default=None,
+                        help="Backend to use. Defaults to the LLM_BACKEND environment variable.")
+    parser.add_argument('--canary', type=str, default=None,
+                        help="Question to run through the graph once the index is warm (calls the LLM)")
+    return parser
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from st_app.rag.backend import backend_from_env
+    load_dotenv()
+
+    args = create_parser().parse_args()
+    backend = backend_from_env(args.backend)
+    graph = None
+    if args.canary:
+        from st_app.graph.router import build_graph
+        graph = build_graph(backend)
+    warmup = Warmup(backend, graph=graph, canary=args.canary)
+    ok = warmup.run()
+    for row in warmup.summary():
+        ms = f"{row['ms']:.1f}ms" if row["ms"] is not None else "-"
+        print(f"{row['stage']:>10}  {row['status']:<8} {ms}")
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,102 @@
+"""대화 이력 관리 — 최근 N턴은 그대로 유지하고, 오래된 턴은 요약으로 접어 GraphState 크기를 제한"""
+from typing import Callable, List, Optional
+
+Summarizer = Callable[[str, List[dict]], str]
+
+ROLE_LABELS = {"user": "사용자", "assistant": "챗봇"}
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 대략적인 토큰 수를 추정합니다. (한글 기준 약 2자당 1토큰)"""
+    if not text:
+        return 0
+    return len(text) // 2 + 1
+
+
+def strip_message(msg: dict) -> dict:
+    """role/content만 남기고 retrieved_reviews 같은 부가 정보는 제거합니다."""
+    return {"role": msg.get("role", "user"), "content": str(msg.get("content", ""))}
+
+
+def fold_summary(summary: str, evicted: List[dict], line_chars: int = 80) -> str:
+    """밀려난 턴을 한 줄씩 잘라 기존 요약 뒤에 이어 붙입니다. (LLM 호출 없음)"""
+    lines = [summary] if summary else []
+    for msg in evicted:
+        content = " ".join(msg["content"].split())
+        if len(content) > line_chars:
+            content = content[:line_chars] + "…"
+        lines.append(f"{ROLE_LABELS.get(msg['role'], msg['role'])}: {content}")
+    return "\n".join(lines)
+
+
+class ChatHistory:
+    """
+    세션 단위 대화 이력
+
+    - 최근 max_turns 턴(사용자+챗봇 한 쌍)은 원문 그대로 유지
+    - 그보다 오래된 턴은 summarizer로 요약에 접어 넣음
+    - 요약 + 원문 이력이 max_tokens를 넘지 않도록 제한
+    """
+
+    def __init__(
+        self,
+        max_turns: int = 3,
+        max_tokens: int = 1200,
+        summary_max_chars: int = 800,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.summary_max_chars = summary_max_chars
+        self.summarizer = summarizer or fold_summary
+        self.turns: List[dict] = []
+        self.summary = ""
+
+    def add(self, role: str, content: str) -> None:
+        self.turns.append(strip_message({"role": role, "content": content}))
+        self._evict()
+
+    def _fold(self, evicted: List[dict]) -> None:
+        self.summary = self.summarizer(self.summary, evicted)
+        if len(self.summary) > self.summary_max_chars:
+            # 오래된 요약부터 줄 단위로 잘라냄
+            trimmed = self.summary[-self.summary_max_chars:]
+            self.summary = trimmed.split("\n", 1)[-1] if "\n" in trimmed else trimmed
+
+    def _evict(self) -> None:
+        max_messages = self.max_turns * 2
+        if len(self.turns) > max_messages:
+            evicted = self.turns[:-max_messages]
+            self.turns = self.turns[-max_messages:]
+            self._fold(evicted)
+
+        # 토큰 예산 초과 시 가장 오래된 메시지부터 요약으로 이동 (마지막 메시지는 유지)
+        while len(self.turns) > 1 and self.token_count() > self.max_tokens:
+            self._fold([self.turns.pop(0)])
+
+        if self.token_count() > self.max_tokens:
+            budget_chars = max(0, (self.max_tokens - self._turn_tokens() - 1) * 2)
+            self.summary = self.summary[-budget_chars:] if budget_chars else ""
+
+    def _turn_tokens(self) -> int:
+        return sum(estimate_tokens(m["content"]) for m in self.turns)
+
+    def token_count(self) -> int:
+        return estimate_tokens(self.summary) + self._turn_tokens()
+
+    def snapshot(self) -> dict:
+        """GraphState에 넣을 chat_history / history_summary를 반환합니다."""
+        return {
+            "chat_history": [dict(m) for m in self.turns],
+            "history_summary": self.summary,
+        }
+
+
+def history_messages(state: dict) -> List[dict]:
+    """GraphState의 요약 + 최근 이력을 프롬프트용 메시지 리스트로 변환합니다."""
+    messages = []
+    summary = state.get("history_summary", "")
+    if summary:
+        messages.append({"role": "system", "content": f"이전 대화 요약:\n{summary}"})
+    messages.extend(strip_message(m) for m in state.get("chat_history", []))
+    return messages
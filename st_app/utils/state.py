@@ -1,9 +1,14 @@
-from typing import TypedDict, List
+import operator
+from typing import Annotated, TypedDict, List
 
 
 class GraphState(TypedDict):
     user_input: str
-    chat_history: List[dict]  # [{"role": "user/assistant", "content": "..."}]
-    route: str  # "chat" | "subject_info" | "rag_review"
-    response: str
+    chat_history: List[dict]  # 최근 N턴 [{"role": "user/assistant", "content": "..."}]
+    history_summary: str  # 최근 N턴 이전 대화의 요약
+    route: str  # 대표 경로 "chat" | "subject_info" | "rag_review"
+    routes: List[str]  # 복합 질문이면 여러 경로 (병렬 실행)
+    answers: Annotated[List[dict], operator.add]  # 각 노드의 부분 답변 [{"route": ..., "content": ...}]
+    response: str  # merge 노드가 합친 최종 답변
     retrieved_reviews: List[str]  # RAG 검색된 리뷰 메타데이터
+    answer_mode: str  # rag_review 답변 방식 "llm"(기본) | "extractive"(LLM 없이 리뷰 발췌 요약)
@@ -0,0 +1,284 @@
+"""LangGraph 노드별 지연시간 / 토큰 / 비용 / 검색 / 캐시 계측"""
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("st_app.trace")
+
+# 모델별 가격 (USD / 1M tokens, 입력/출력)
+MODEL_PRICES = {
+    "solar-mini": (0.15, 0.15),
+}
+DEFAULT_PRICE = MODEL_PRICES["solar-mini"]
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+_span_collector: contextvars.ContextVar[Optional[List[dict]]] = contextvars.ContextVar("span_collector", default=None)
+
+
+class Span:
+    """노드 / 검색 한 번의 실행 기록"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.wall_ms = 0.0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.cost_usd = 0.0
+        self.retrieval_k: Optional[int] = None
+        self.retrieval_scores: List[float] = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        data = {
+            "span": self.name,
+            "wall_ms": round(self.wall_ms, 2),
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "cost_usd": round(self.cost_usd, 8),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+        if self.retrieval_k is not None:
+            data["retrieval_k"] = self.retrieval_k
+            data["retrieval_scores"] = [round(s, 4) for s in self.retrieval_scores]
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class _Stats:
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.latencies: deque = deque(maxlen=window)
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.cost_usd = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(self, span: Span) -> None:
+        self.count += 1
+        self.errors += 1 if span.error else 0
+        self.total_ms += span.wall_ms
+        self.latencies.append(span.wall_ms)
+        self.tokens_in += span.tokens_in
+        self.tokens_out += span.tokens_out
+        self.cost_usd += span.cost_usd
+        self.cache_hits += span.cache_hits
+        self.cache_misses += span.cache_misses
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Tracer:
+    """프로세스 단위 span 집계기 (스레드 안전)"""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _Stats] = {}
+        self._counters: Dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        span = Span(name)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.wall_ms = (time.perf_counter() - span.start) * 1000
+            _current_span.reset(token)
+            self._record(span)
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self._stats.setdefault(span.name, _Stats(self.window)).add(span)
+        data = span.to_dict()
+        collector = _span_collector.get()
+        if collector is not None:
+            collector.append(data)
+        logger.info(json.dumps(data, ensure_ascii=False))
+
+    def incr(self, event: str, amount: int = 1) -> None:
+        """span과 무관한 이벤트 횟수 집계 (예: router.fallback, router.empty)"""
+        with self._lock:
+            self._counters[event] = self._counters.get(event, 0) + amount
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def summary(self) -> List[dict]:
+        """span 이름별 집계 (Streamlit 사이드바 표시용)"""
+        with self._lock:
+            return [
+                {
+                    "span": name,
+                    "count": s.count,
+                    "errors": s.errors,
+                    "avg_ms": round(s.total_ms / s.count, 1) if s.count else 0.0,
+                    "p95_ms": round(s.percentile(0.95), 1),
+                    "tokens_in": s.tokens_in,
+                    "tokens_out": s.tokens_out,
+                    "cost_usd": round(s.cost_usd, 6),
+                    "cache_hits": s.cache_hits,
+                    "cache_misses": s.cache_misses,
+                }
+                for name, s in sorted(self._stats.items())
+            ]
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        metrics = [
+            ("st_app_span_calls_total", "counter", "Number of span executions", lambda s: s.count),
+            ("st_app_span_errors_total", "counter", "Number of failed span executions", lambda s: s.errors),
+            ("st_app_span_seconds_sum", "counter", "Total wall time in seconds", lambda s: s.total_ms / 1000),
+            ("st_app_span_p95_seconds", "gauge", "p95 wall time over the recent window", lambda s: s.percentile(0.95) / 1000),
+            ("st_app_llm_tokens_in_total", "counter", "LLM input tokens", lambda s: s.tokens_in),
+            ("st_app_llm_tokens_out_total", "counter", "LLM output tokens", lambda s: s.tokens_out),
+            ("st_app_llm_cost_usd_total", "counter", "Estimated LLM cost in USD", lambda s: s.cost_usd),
+            ("st_app_cache_hits_total", "counter", "Cache hits", lambda s: s.cache_hits),
+            ("st_app_cache_misses_total", "counter", "Cache misses", lambda s: s.cache_misses),
+        ]
+        with self._lock:
+            lines = []
+            for metric, kind, help_text, value in metrics:
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {kind}")
+                for name, s in sorted(self._stats.items()):
+                    lines.append(f'{metric}{{span="{name}"}} {value(s)}')
+            lines.append("# HELP st_app_events_total Counted events outside spans")
+            lines.append("# TYPE st_app_events_total counter")
+            for event, count in sorted(self._counters.items()):
+                lines.append(f'st_app_events_total{{event="{event}"}} {count}')
+            return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._counters.clear()
+
+
+tracer = Tracer()
+
+
+def trace_node(name: str, fn: Callable) -> Callable:
+    """build_graph()에 등록하는 노드 함수를 span으로 감쌉니다."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with tracer.span(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def collect_spans() -> Iterator[List[dict]]:
+    """블록 안에서 끝난 span 기록을 리스트로 모읍니다. (요청 단위 타이밍 확인용)"""
+    spans: List[dict] = []
+    token = _span_collector.set(spans)
+    try:
+        yield spans
+    finally:
+        _span_collector.reset(token)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def record_llm_usage(message) -> None:
+    """LLM 응답(AIMessage)의 토큰 사용량과 예상 비용을 현재 span에 기록합니다."""
+    span = current_span()
+    if span is None:
+        return
+    usage = getattr(message, "usage_metadata", None) or {}
+    meta = getattr(message, "response_metadata", None) or {}
+    if not usage:
+        token_usage = meta.get("token_usage") or {}
+        usage = {
+            "input_tokens": token_usage.get("prompt_tokens", 0),
+            "output_tokens": token_usage.get("completion_tokens", 0),
+        }
+    tokens_in = usage.get("input_tokens", 0) or 0
+    tokens_out = usage.get("output_tokens", 0) or 0
+    price_in, price_out = MODEL_PRICES.get(meta.get("model_name", ""), DEFAULT_PRICE)
+    span.tokens_in += tokens_in
+    span.tokens_out += tokens_out
+    span.cost_usd += (tokens_in * price_in + tokens_out * price_out) / 1_000_000
+
+
+def record_retrieval(k: int, scores: List[float]) -> None:
+    span = current_span()
+    if span is not None:
+        span.retrieval_k = k
+        span.retrieval_scores = [float(s) for s in scores]
+
+
+def record_cache(hit: bool) -> None:
+    span = current_span()
+    if span is None:
+        return
+    if hit:
+        span.cache_hits += 1
+    else:
+        span.cache_misses += 1
+
+
+def configure_json_logging(log_file: Optional[str] = None) -> None:
+    """span 기록을 JSON 한 줄씩 출력하도록 st_app.trace 로거를 설정합니다. (중복 호출 무시)"""
+    if logger.handlers:
+        return
+    handler = logging.FileHandler(log_file, encoding="utf-8") if log_file else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+_metrics_server: Optional[ThreadingHTTPServer] = None
+_metrics_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """/metrics 엔드포인트를 백그라운드 스레드로 띄웁니다. (프로세스당 한 번)"""
+    global _metrics_server
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = tracer.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _metrics_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, port), MetricsHandler)
+            threading.Thread(target=_metrics_server.serve_forever, daemon=True).start()
+        return _metrics_server
@@ -1,26 +1,93 @@
+import os
 import streamlit as st
-from st_app.graph.router import build_graph
+from st_app.graph.router import ROUTE_LABELS, build_graph
+from st_app.rag.backend import apply_retrieval_env, upstage_backend
+from st_app.rag.index_store import IndexReloader
+from st_app.rag.llm import policy_from_env
+from st_app.rag.warmup import READY, Warmup
+from st_app.utils.history import ChatHistory
+from st_app.utils.tracing import tracer, configure_json_logging, start_metrics_server
 
 st.set_page_config(page_title="에버랜드 챗봇", page_icon="🎢")
 st.title("🎢 에버랜드 챗봇")
 st.caption("에버랜드에 대해 무엇이든 물어보세요! (정보, 리뷰, 일반 대화)")
 
+configure_json_logging(os.getenv("TRACE_LOG_FILE"))
+if os.getenv("METRICS_PORT"):
+    start_metrics_server(int(os.getenv("METRICS_PORT")))
+
+
+@st.cache_resource
+def get_backend():
+    try:
+        api_key = st.secrets["UPSTAGE_API_KEY"]
+    except (KeyError, FileNotFoundError):
+        api_key = None  # 환경변수 UPSTAGE_API_KEY 사용
+    # 타임아웃 / 헤지 / 대체 경로는 backend_from_env와 같은 환경변수로 (LLM_TIMEOUT, LLM_FALLBACK_MODEL 등)
+    backend = upstage_backend(api_key=api_key, policy=policy_from_env(),
+                              fallback_model=os.getenv("LLM_FALLBACK_MODEL") or None)
+    apply_retrieval_env(backend)  # RETRIEVAL_RECENCY_WEIGHT, RETRIEVAL_DATE_BUCKETS
+    # 새 인덱스 버전이 게시되면 재시작 없이 교체 (0이면 끔)
+    reload_interval = float(os.getenv("INDEX_RELOAD_INTERVAL", "30"))
+    if reload_interval > 0:
+        IndexReloader(backend, interval=reload_interval).start()
+    return backend
+
+
+@st.cache_resource
+def get_graph():
+    """컴파일된 그래프는 상태가 없어(대화 기록은 invoke 입력으로 전달) 프로세스당 한 번만 만들어 모든 세션이 공유"""
+    return build_graph(get_backend())
+
+
+@st.cache_resource
+def start_warmup():
+    """인덱스 로드 · 벡터 예열 · 임베딩 연결 (WARMUP_CANARY 질문이 있으면 그래프로 한 번 실행)을 백그라운드에서 (프로세스당 한 번)"""
+    warmup = Warmup(get_backend(), graph=get_graph(), canary=os.getenv("WARMUP_CANARY") or None)
+    warmup.start()
+    return warmup
+
+
+@st.cache_resource
+def start_ingestion(sites: str):
+    """{site}_preprocessed 컬렉션의 새 리뷰를 공유 백엔드 인덱스에 계속 추가 (프로세스당 한 번)"""
+    from database.mongodb_connection import mongo_db
+    from st_app.rag.ingest import IngestionWorker, preprocessed_collections
+
+    site_list = None if sites == "*" else [s.strip() for s in sites.split(",") if s.strip()]
+    # persist=False: 추가한 문서는 메모리 인덱스에만 있으므로 체크포인트도 메모리에만 두고, 인덱스가 교체되면 다시 채움
+    worker = IngestionWorker(get_backend(), preprocessed_collections(mongo_db, site_list))
+    worker.start()
+    return worker
+
+
+if os.getenv("INGEST_SITES"):
+    start_ingestion(os.getenv("INGEST_SITES"))
+
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-if "graph" not in st.session_state:
-    st.session_state.graph = build_graph()
+if "history" not in st.session_state:
+    st.session_state.history = ChatHistory()
+
+graph = get_graph()
+warmup = start_warmup()
+
+
+extractive_only = st.sidebar.toggle(
+    "리뷰 질문은 LLM 없이 발췌 요약으로 답변",
+    help="검색된 리뷰에서 중심 문장을 골라 바로 답합니다. LLM이 느리거나 응답하지 않을 때는 자동으로 이 방식으로 대체됩니다.",
+)
+
+
+def route_caption(routes: list) -> str:
+    return " + ".join(ROUTE_LABELS.get(r, r) for r in routes)
 
-ROUTE_LABELS = {
-    "subject_info": "에버랜드 정보",
-    "rag_review": "리뷰 기반 답변",
-    "chat": "일반 대화",
-}
 
 for msg in st.session_state.messages:
     with st.chat_message(msg["role"]):
-        if msg["role"] == "assistant" and "route" in msg:
-            st.caption(f"질문 분류: **{ROUTE_LABELS.get(msg['route'], msg['route'])}**")
+        if msg["role"] == "assistant" and "routes" in msg:
+            st.caption(f"질문 분류: **{route_caption(msg['routes'])}**")
         st.markdown(msg["content"])
         if msg.get("retrieved_reviews"):
             with st.expander("검색된 리뷰 정보"):
@@ -34,18 +101,20 @@ if prompt := st.chat_input("메시지를 입력하세요..."):
 
     with st.chat_message("assistant"):
         with st.spinner("답변 생성 중..."):
-            result = st.session_state.graph.invoke({
+            result = graph.invoke({
                 "user_input": prompt,
-                "chat_history": st.session_state.messages,
+                **st.session_state.history.snapshot(),
                 "route": "",
                 "response": "",
                 "retrieved_reviews": [],
+                "answer_mode": "extractive" if extractive_only else "llm",
             })
             response = result["response"]
             route = result["route"]
+            routes = result.get("routes") or [route]
             retrieved_reviews = result.get("retrieved_reviews", [])
 
-        st.caption(f"질문 분류: **{ROUTE_LABELS.get(route, route)}**")
+        st.caption(f"질문 분류: **{route_caption(routes)}**")
         st.markdown(response)
 
         if retrieved_reviews:
@@ -53,9 +122,31 @@ if prompt := st.chat_input("메시지를 입력하세요..."):
                 for review in retrieved_reviews:
                     st.markdown(f"- {review}")
 
+    st.session_state.history.add("user", prompt)
+    st.session_state.history.add("assistant", response)
     st.session_state.messages.append({
         "role": "assistant",
         "content": response,
         "route": route,
+        "routes": routes,
         "retrieved_reviews": retrieved_reviews,
     })
+
+with st.sidebar:
+    if not warmup.ready.is_set():
+        st.info(f"⏳ 리뷰 검색 준비 중... ({warmup.current_stage or '대기'})")
+    elif warmup.ok:
+        done = [row for row in warmup.summary() if row["status"] == READY]
+        st.success(f"✅ 리뷰 검색 준비 완료 ({sum(row['ms'] for row in done) / 1000:.1f}s)")
+    else:
+        st.warning(f"⚠️ 예열 실패: {warmup.error} (첫 질문에서 다시 시도합니다)")
+
+    st.subheader("⏱️ 노드별 성능")
+    trace_rows = tracer.summary()
+    if trace_rows:
+        st.dataframe(trace_rows, hide_index=True)
+    else:
+        st.caption("아직 기록된 실행이 없습니다.")
+    trace_events = tracer.counters()
+    if trace_events:
+        st.caption(" · ".join(f"{event}: {count}" for event, count in trace_events.items()))
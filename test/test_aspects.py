@@ -0,0 +1,78 @@
+import pytest
+from langchain_core.documents import Document
+from st_app.graph.router import build_graph
+from st_app.rag.aspects import AspectStore, build_aspect_store
+from st_app.rag.backend import Backend, fake_backend
+from st_app.rag.ingest import append_documents
+
+
+@pytest.fixture(scope="module")
+def backend(tmp_path_factory):
+    backend = fake_backend(max_docs=300)
+    path = tmp_path_factory.mktemp("aspects") / "aspect_summaries.json"
+    build_aspect_store(backend, output_path=str(path))
+    backend.aspect_store = AspectStore(str(path))
+    return backend
+
+
+def test_store_has_per_platform_stats(backend):
+    """Test that the offline job writes per-aspect, per-platform stats."""
+    queue = backend.aspect_store.data["aspects"]["queue"]["platforms"]
+
+    assert queue["all"]["count"] >= queue["google"]["count"] > 0
+    assert queue["all"]["highlights"]
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("대기 시간 후기 어때?", "queue"),
+    ("사파리 리뷰 요약해줘", "zoo"),
+    ("T익스프레스 몇 시에 타야 덜 기다려?", None),
+    ("겨울에 가본 사람들 후기 어땠어?", None),
+])
+def test_lookup_only_answers_general_aspect_questions(backend, question, expected):
+    """Test that long-tail questions are left to live RAG."""
+    found = backend.aspect_store.lookup(question)
+
+    assert (found[0] if found else None) == expected
+
+
+def ask(backend, question: str, chat_history=()) -> dict:
+    return build_graph(backend).invoke({
+        "user_input": question,
+        "chat_history": list(chat_history),
+        "history_summary": "",
+        "route": "",
+        "response": "",
+        "retrieved_reviews": [],
+    })
+
+
+def test_rag_review_answers_from_store(backend):
+    """Test that aspect questions skip retrieval and the LLM."""
+    result = ask(backend, "대기 시간 후기 어때?")
+
+    assert result["response"].startswith("대기 시간 관련 리뷰")
+    assert result["retrieved_reviews"]
+
+
+@pytest.mark.parametrize("question, chat_history", [
+    ("요즘 대기 시간 후기 어때?", []),
+    ("대기 시간 후기 어때?", [{"role": "user", "content": "판다월드는?"}, {"role": "assistant", "content": "좋아요"}]),
+])
+def test_recent_and_follow_up_questions_use_live_rag(backend, question, chat_history):
+    """Test that all-time aspect stats do not answer recency questions or follow-ups."""
+    result = ask(backend, question, chat_history)
+
+    assert not result["response"].startswith("대기 시간 관련 리뷰")
+
+
+def test_store_is_stale_after_ingest(backend):
+    """Test that reviews added to the live index stop the store from answering until it is rebuilt."""
+    live = Backend(llm=backend.llm, embeddings=backend.embeddings, vectorstore=backend.get_vectorstore(),
+                   aspect_store=backend.aspect_store)
+    assert live.aspect_store.is_current(live.get_vectorstore(), live.loaded_version)
+
+    append_documents(live, [Document(page_content="줄이 너무 길어요", metadata={"platform": "kakao"})])
+
+    assert not live.aspect_store.is_current(live.get_vectorstore(), live.loaded_version)
+    assert not ask(live, "대기 시간 후기 어때?")["response"].startswith("대기 시간 관련 리뷰")
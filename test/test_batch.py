@@ -0,0 +1,28 @@
+import json
+from st_app.batch import run_batch
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_batch_deduplicates_and_resumes(tmp_path):
+    """Test that identical questions run once and a rerun skips finished ids."""
+    input_path = tmp_path / "questions.csv"
+    output_path = tmp_path / "answers.jsonl"
+    input_path.write_text("id,question\n1,입장료 얼마야?\n2,입장료  얼마야?\n3,사파리 후기 어때?\n", encoding="utf-8")
+
+    summary = run_batch(str(input_path), str(output_path), workers=2, backend_kind="fake")
+
+    records = {r["id"]: r for r in read_jsonl(output_path)}
+    assert summary["unique"] == 2
+    assert set(records) == {"1", "2", "3"}
+    assert records["1"]["answer"] == records["2"]["answer"]
+    assert records["3"]["route"] == "rag_review"
+    assert "total_ms" in records["3"]["timings"]
+
+    rerun = run_batch(str(input_path), str(output_path), workers=2, backend_kind="fake")
+
+    assert rerun["skipped"] == 3
+    assert len(read_jsonl(output_path)) == 3
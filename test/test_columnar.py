@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+from review_analysis.preprocessing.columnar import parquet_available, parquet_path, read_reviews, to_columnar
+from review_analysis.preprocessing.review_processor import GOOGLE, ReviewProcessor
+
+
+@pytest.fixture
+def reviews_csv(tmp_path):
+    rows = [(float(i % 5 + 1), f"2025.{i % 12 + 1}.3.", f"사파리 판다{i % 4} 놀이기구{i % 3} 최고") for i in range(30)]
+    path = tmp_path / "reviews_google.csv"
+    pd.DataFrame(rows, columns=["rating", "date", "content"]).to_csv(path, index=False)
+    return str(path)
+
+
+def run_processor(input_path, output_dir, parquet=True, streaming=False):
+    processor = ReviewProcessor(input_path, output_dir, config=GOOGLE)
+    processor.parquet = parquet
+    if streaming:
+        return processor.process_streaming(rows_per_chunk=7)
+    processor.preprocess()
+    processor.feature_engineering()
+    processor.save_to_database()
+    return f"{output_dir}/{GOOGLE.output_file}"
+
+
+def test_csv_fallback_has_columnar_dtypes(reviews_csv, tmp_path):
+    """Test that reading a CSV without a Parquet copy projects columns and returns the Parquet dtypes."""
+    csv_path = run_processor(reviews_csv, str(tmp_path / "out"), parquet=False)
+
+    df = read_reviews(csv_path, columns=["date", "rating_group", "tfidf_vector_1", "year", "missing"])
+    assert list(df.columns) == ["date", "rating_group", "tfidf_vector_1", "year"]
+    assert str(df["date"].dtype) == "datetime64[ns]"
+    assert list(df["rating_group"].cat.categories) == ["낮음(1-2)", "보통(3)", "높음(4-5)"]
+    assert df["tfidf_vector_1"].dtype == "float32"
+    assert df["year"].dtype == "Int16"
+
+
+@pytest.mark.skipif(not parquet_available(), reason="pyarrow is not available")
+def test_parquet_matches_csv(reviews_csv, tmp_path):
+    """Test that in-memory and streaming runs write the same Parquet data as the CSV they save."""
+    csv_path = run_processor(reviews_csv, str(tmp_path / "memory"))
+    streamed_path = run_processor(reviews_csv, str(tmp_path / "stream"), streaming=True)
+
+    expected = to_columnar(pd.read_csv(csv_path, encoding="utf-8-sig", keep_default_na=False))
+    pd.testing.assert_frame_equal(pd.read_parquet(parquet_path(csv_path)), expected)
+    pd.testing.assert_frame_equal(read_reviews(streamed_path), expected)
+    pd.testing.assert_frame_equal(read_reviews(csv_path, columns=["rating", "date"]), expected[["rating", "date"]])
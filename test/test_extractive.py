@@ -0,0 +1,48 @@
+import sys
+
+from langchain_core.documents import Document
+from st_app.rag.extractive import rank_sentences, split_sentences, summarize_reviews
+
+
+def test_split_sentences_on_endings():
+    """Test that Korean reviews are split on punctuation and sentence endings."""
+    text = "사파리가 정말 재밌었어요 줄은 길었지만 괜찮았다. 다음에 또 올게요!"
+
+    assert split_sentences(text) == ["사파리가 정말 재밌었어요", "줄은 길었지만 괜찮았다.", "다음에 또 올게요!"]
+
+
+def test_rank_sentences_prefers_central_sentence():
+    """Test that the sentence sharing the most terms ranks first."""
+    sentences = [
+        "사파리 대기 시간이 너무 길어요",
+        "사파리 대기 시간이 길지만 재밌어요",
+        "츄러스가 맛있어요",
+        "사파리 재밌어요",
+    ]
+
+    assert rank_sentences(sentences)[0][0] == 1
+
+
+def test_rank_sentences_does_not_need_sklearn(monkeypatch):
+    """Test that ranking is the same whether or not scikit-learn is installed."""
+    sentences = ["사파리 대기 시간이 너무 길어요", "사파리 대기 시간이 길지만 재밌어요", "츄러스가 맛있어요"]
+    expected = rank_sentences(sentences)
+    monkeypatch.setitem(sys.modules, "sklearn", None)
+    monkeypatch.setitem(sys.modules, "sklearn.feature_extraction.text", None)
+
+    assert rank_sentences(sentences) == expected
+    assert [i for i, _ in expected] == [0, 1, 2] and expected[-1][1] == 0.0
+
+
+def test_summarize_reviews_cites_sources():
+    """Test that the summary cites platform and rating once per review."""
+    docs = [
+        Document(page_content="사파리 대기 시간이 길어요. 사파리 재밌어요.", metadata={"platform": "google", "rating": "5.0"}),
+        Document(page_content="사파리 대기 시간이 길지만 재밌어요.", metadata={"platform": "kakao", "rating": "3.0"}),
+    ]
+
+    summary = summarize_reviews(docs)
+
+    assert "평균 평점 4.0" in summary
+    assert "(google, 평점 5.0)" in summary and "(kakao, 평점 3.0)" in summary
+    assert summary.count("\n- ") == 2
@@ -0,0 +1,75 @@
+import pytest
+from st_app.graph.router import build_graph, parse_routes
+from st_app.rag.backend import fake_backend
+
+
+@pytest.fixture(scope="module")
+def backend():
+    return fake_backend(max_docs=200)
+
+
+@pytest.fixture(scope="module")
+def graph(backend):
+    return build_graph(backend)
+
+
+def make_state(question: str) -> dict:
+    return {
+        "user_input": question,
+        "chat_history": [],
+        "history_summary": "",
+        "route": "",
+        "response": "",
+        "retrieved_reviews": [],
+    }
+
+
+@pytest.mark.parametrize("question, expected_route", [
+    ("안녕! 반가워", "chat"),
+    ("에버랜드 입장료 얼마야?", "subject_info"),
+    ("사파리 후기 어때?", "rag_review"),
+])
+def test_graph_routes_with_fake_backend(graph, question, expected_route):
+    """Test that the compiled graph runs headless with an injected backend."""
+    result = graph.invoke(make_state(question))
+
+    assert result["route"] == expected_route
+    assert result["response"]
+
+
+def test_rag_review_uses_backend_retriever(graph, backend):
+    """Test that retrieval goes through the backend and fills its query cache."""
+    result = graph.invoke(make_state("놀이기구 리뷰 알려줘"))
+
+    assert len(result["retrieved_reviews"]) == backend.k
+    assert len(backend.query_cache) >= 1
+
+
+def test_compound_question_fans_out_and_merges(graph):
+    """Test that a multi-intent question runs both nodes and merges their answers."""
+    result = graph.invoke(make_state("입장료 얼마고 사람들 후기는 어때?"))
+
+    assert set(result["routes"]) == {"subject_info", "rag_review"}
+    assert len(result["answers"]) == 2
+    assert result["response"].index("에버랜드 정보") < result["response"].index("리뷰 기반 답변")
+    assert result["retrieved_reviews"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("rag_review", ["rag_review"]),
+    ("subject_info, rag_review", ["subject_info", "rag_review"]),
+    ("chat, rag_review", ["rag_review"]),
+    ("모르겠어요", ["chat"]),
+])
+def test_parse_routes(text, expected):
+    """Test parsing of multi-label router output."""
+    assert parse_routes(text) == expected
+
+
+def test_extractive_answer_mode_skips_llm(graph):
+    """Test that answer_mode=extractive answers review questions without the LLM."""
+    result = graph.invoke({**make_state("사파리 후기 어때?"), "answer_mode": "extractive"})
+
+    assert result["route"] == "rag_review"
+    assert result["response"].startswith("관련 리뷰")
+    assert "[fake]" not in result["response"]
@@ -0,0 +1,50 @@
+import pytest
+from st_app.utils.history import ChatHistory, history_messages, estimate_tokens
+
+
+@pytest.fixture
+def history():
+    return ChatHistory(max_turns=2, max_tokens=10_000)
+
+
+def test_keeps_last_turns_verbatim(history):
+    """Test that only the last N turns stay verbatim."""
+    for i in range(5):
+        history.add("user", f"질문 {i}")
+        history.add("assistant", f"답변 {i}")
+
+    snapshot = history.snapshot()
+
+    assert [m["content"] for m in snapshot["chat_history"]] == ["질문 3", "답변 3", "질문 4", "답변 4"]
+    assert "질문 0" in snapshot["history_summary"]
+    assert "질문 3" not in snapshot["history_summary"]
+
+
+def test_strips_retrieval_payload(history):
+    """Test that extra message fields never reach the graph state."""
+    history.turns.append({"role": "assistant", "content": "답변", "retrieved_reviews": ["리뷰"]})
+    history.add("user", "다음 질문")
+
+    messages = history_messages(history.snapshot())
+
+    assert all(set(m) == {"role", "content"} for m in messages)
+
+
+def test_enforces_token_budget():
+    """Test that summary + verbatim turns stay within the token budget."""
+    history = ChatHistory(max_turns=10, max_tokens=100)
+    for _ in range(10):
+        history.add("user", "가" * 80)
+        history.add("assistant", "나" * 80)
+
+    assert history.token_count() <= 100
+    assert history.snapshot()["chat_history"][-1]["content"] == "나" * 80
+
+
+def test_summary_becomes_system_message(history):
+    """Test that the rolling summary is passed to prompts first."""
+    messages = history_messages({"history_summary": "요약", "chat_history": [{"role": "user", "content": "안녕"}]})
+
+    assert messages[0]["role"] == "system"
+    assert messages[1] == {"role": "user", "content": "안녕"}
+    assert estimate_tokens("") == 0
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from st_app.rag.backend import Backend
+from st_app.rag.fake import FakeChatModel, FakeEmbeddings
+from st_app.rag.index_store import (
+    IndexReloader, current_version, list_versions, publish_version, resolve_index_dir, save_version,
+)
+
+
+@pytest.fixture
+def embeddings():
+    return FakeEmbeddings(size=16)
+
+
+def make_store(embeddings, *texts):
+    return FAISS.from_documents([Document(page_content=t) for t in texts], embeddings)
+
+
+def test_legacy_directory_without_current(tmp_path, embeddings):
+    """Test that an index saved directly in the root still loads."""
+    make_store(embeddings, "사파리").save_local(str(tmp_path))
+
+    assert resolve_index_dir(str(tmp_path)) == ("legacy", str(tmp_path))
+
+
+def test_save_version_publishes_and_prunes(tmp_path, embeddings):
+    """Test that each save becomes CURRENT and old versions are pruned."""
+    versions = [save_version(make_store(embeddings, f"리뷰 {i}"), str(tmp_path), keep=2) for i in range(3)]
+
+    assert current_version(str(tmp_path)) == versions[-1]
+    assert list_versions(str(tmp_path)) == versions[1:]
+    assert not os.path.exists(tmp_path / "CURRENT.tmp")
+
+
+def test_reloader_swaps_to_new_version(tmp_path, embeddings):
+    """Test that a newly published version replaces the live index while old handles keep working."""
+    root = str(tmp_path)
+    first = save_version(make_store(embeddings, "사파리"), root)
+    backend = Backend(llm=FakeChatModel(), embeddings=embeddings, index_dir=root)
+    old = backend.get_vectorstore()
+    reloader = IndexReloader(backend)
+
+    assert backend.loaded_version == first
+    assert not reloader.check()
+
+    second = save_version(make_store(embeddings, "사파리", "판다"), root)
+    assert reloader.check()
+    assert backend.loaded_version == second
+    assert backend.get_vectorstore().index.ntotal == 2
+    assert old.similarity_search("사파리", k=1)[0].page_content == "사파리"
+
+    publish_version(root, first)  # 롤백
+    assert reloader.check()
+    assert backend.get_vectorstore().index.ntotal == 1
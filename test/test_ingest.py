@@ -0,0 +1,133 @@
+import pytest
+from bson import ObjectId
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from st_app.rag.backend import Backend
+from st_app.rag.fake import FakeChatModel, FakeEmbeddings
+from st_app.rag import ingest
+from st_app.rag.ingest import IngestionWorker, append_documents, indexed_keys
+from st_app.rag.retriever import load_retriever
+
+
+@pytest.fixture
+def backend():
+    embeddings = FakeEmbeddings(size=16)
+    seed = [Document(page_content="사파리 재밌어요", metadata={"platform": "google", "date": None})]
+    return Backend(llm=FakeChatModel(), embeddings=embeddings, vectorstore=FAISS.from_documents(seed, embeddings))
+
+
+def test_append_swaps_the_live_index(backend):
+    """Test that appended reviews are visible without rebuilding or reloading."""
+    old = backend.get_vectorstore()
+
+    append_documents(backend, [Document(page_content="츄러스 맛있어요", metadata={"platform": "kakao"})])
+
+    assert backend.index_version == 1
+    assert len(old.index_to_docstore_id) == 1
+    assert load_retriever(backend).invoke("츄러스 맛있어요")[0].page_content == "츄러스 맛있어요"
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self.docs, key=lambda doc: doc[key], reverse=direction < 0))
+
+    def limit(self, count):
+        return FakeCursor(self.docs[:count])
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class FakeCollection:
+    """The part of the pymongo Collection API used by IngestionWorker and the preprocess API."""
+
+    def __init__(self):
+        self.docs = []
+
+    def insert_many(self, records):
+        self.docs.extend({"_id": ObjectId(), **record} for record in records)
+
+    def delete_many(self, query):
+        self.docs = []
+
+    def find(self, query):
+        after = query.get("_id", {}).get("$gt")
+        return FakeCursor([doc for doc in self.docs if after is None or doc["_id"] > after])
+
+
+def test_worker_polls_mongo_and_skips_reinserted_reviews(backend, tmp_path):
+    """Test micro-batched polling on _id and dedup after the preprocess API re-inserts."""
+    collection = FakeCollection()
+    records = [{"text": f"리뷰 {i}", "rating": 5, "date": "2026-01-0{i}"} for i in range(1, 6)]
+    collection.insert_many([dict(r) for r in records])
+
+    worker = IngestionWorker(backend, {"kakao": collection}, batch_size=2,
+                             checkpoint_path=str(tmp_path / "checkpoint.json"))
+    while worker.poll_once():
+        pass
+    collection.delete_many({})
+    collection.insert_many([dict(r) for r in records])
+    while worker.poll_once():
+        pass
+
+    assert worker.added_total == 5
+    assert len(backend.get_vectorstore().index_to_docstore_id) == 6
+
+
+class FailingEmbeddings:
+    def embed_documents(self, texts):
+        raise TimeoutError()
+
+
+def test_failed_batch_is_retried(backend, monkeypatch):
+    """Test that reviews from a batch whose embedding failed are not marked as seen."""
+    worker = IngestionWorker(backend, {}, checkpoint_path=None)
+    records = [{"text": "츄러스 맛있어요", "date": "2026-01-02"}]
+    embeddings = backend.embeddings
+    monkeypatch.setattr(backend, "embeddings", FailingEmbeddings())
+    with pytest.raises(TimeoutError):
+        worker._ingest("kakao", records)
+
+    monkeypatch.setattr(backend, "embeddings", embeddings)
+    assert worker._ingest("kakao", records) == 1
+
+
+def test_in_memory_worker_recovers_after_index_swap(backend, tmp_path):
+    """Test that a non-persisting worker keeps its checkpoint in memory and re-ingests after a swap."""
+    checkpoint = tmp_path / "checkpoint.json"
+    seed = backend.get_vectorstore()
+    worker = IngestionWorker(backend, {}, checkpoint_path=str(checkpoint))
+    worker._ingest("kakao", [{"text": "츄러스 맛있어요", "date": "2026-01-02"}])
+    worker._advance("kakao", "65f000000000000000000001")
+    assert not checkpoint.exists()
+
+    backend.swap_vectorstore(seed, version="v2")  # IndexReloader가 게시된 버전으로 교체
+    worker._sync_index()
+    assert worker.checkpoint == {}
+    assert worker._ingest("kakao", [{"text": "츄러스 맛있어요", "date": "2026-01-02"}]) == 1
+
+
+def test_append_keeps_a_version_swapped_in_during_the_clone(backend, monkeypatch):
+    """Test that a hot-swap landing mid-append is not overwritten and the batch is re-applied on top of it."""
+    published = FAISS.from_documents([Document(page_content="판다 귀여워요", metadata={"platform": "google"})],
+                                     backend.embeddings)
+    worker = IngestionWorker(backend, {}, checkpoint_path=None)
+    clone = ingest.clone_vectorstore
+
+    def clone_while_reloading(vectorstore):
+        copy = clone(vectorstore)
+        if backend.loaded_version != "v2":
+            backend.swap_vectorstore(published, version="v2")  # IndexReloader가 게시된 버전으로 교체
+        return copy
+
+    monkeypatch.setattr(ingest, "clone_vectorstore", clone_while_reloading)
+    assert worker._ingest("kakao", [{"text": "츄러스 맛있어요", "date": "2026-01-02"}]) == 1
+
+    texts = {doc.page_content for doc in backend.get_vectorstore().docstore._dict.values()}
+    assert texts == {"판다 귀여워요", "츄러스 맛있어요"}
+    assert (backend.loaded_version, backend.index_version) == ("v2", 2)
+    worker._sync_index()
+    assert worker.seen == indexed_keys(backend.get_vectorstore())
@@ -0,0 +1,154 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pandas as pd
+import pytest
+from review_analysis.preprocessing import korean_tokenizer
+from review_analysis.preprocessing.korean_tokenizer import (
+    LANGUAGES, OktPool, detect_language, detect_languages, preprocess_korean_text, tokenize_many, tokenizer_id,
+    tokenize_parallel,
+)
+from review_analysis.preprocessing.token_cache import TokenCache, text_key
+
+
+class FakeOkt:
+    """Stands in for konlpy's Okt: every whitespace token is a noun."""
+
+    instances = 0
+
+    def __init__(self):
+        FakeOkt.instances += 1
+
+    def pos(self, text, norm=True, stem=True):
+        return [(word, 'Noun') for word in text.split()]
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    FakeOkt.instances = 0
+    pool = OktPool(size=2, factory=FakeOkt)
+    monkeypatch.setattr(korean_tokenizer, '_okt_pool', pool)
+    return pool
+
+
+def test_analyzer_is_reused_across_reviews(fake_pool):
+    """Test that tokenizing many reviews creates the analyzer once."""
+    for _ in range(50):
+        assert preprocess_korean_text('사파리 정말 재밌어요') == '사파리 정말 재밌어요'
+
+    assert FakeOkt.instances == 1
+
+
+def test_pool_never_exceeds_size_under_concurrency(fake_pool):
+    """Test that concurrent threads share at most `size` analyzers."""
+    threads = [threading.Thread(target=lambda: [preprocess_korean_text('판다 귀여워요') for _ in range(200)])
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 1 <= FakeOkt.instances <= 2
+
+
+def test_tokenize_many_matches_single_calls_in_order(fake_pool):
+    """Test that the batch API returns the same results as per-review calls, in input order."""
+    texts = [f'리뷰 {i}번 놀이기구 최고' if i % 3 else 'great park' for i in range(100)]
+
+    assert tokenize_many(texts, workers=2, chunk_size=7) == [preprocess_korean_text(t) for t in texts]
+
+
+def test_unavailable_analyzer_is_tried_once(monkeypatch):
+    """Test that a missing konlpy falls back to the simple tokenizer without retrying."""
+    calls = []
+
+    def broken_factory():
+        calls.append(1)
+        raise ImportError('konlpy')
+
+    monkeypatch.setattr(korean_tokenizer, '_okt_pool', OktPool(size=2, factory=broken_factory))
+
+    assert tokenize_many(['에버랜드 너무 좋았어요'] * 3) == ['에버랜드 너무 좋았어요'] * 3
+    assert len(calls) == 1
+
+
+def test_tokenize_parallel_keeps_order_across_processes():
+    """Test that chunks spread over worker processes come back in input order."""
+    texts = [f'{i}번째 리뷰 입니다 정말 좋아요' if i % 2 else f'review number {i}' for i in range(40)]
+
+    assert tokenize_parallel(texts, processes=2, chunk_size=6) == [preprocess_korean_text(t) for t in texts]
+
+
+def test_detect_languages_matches_per_review_detection():
+    """Test that the column-level detector returns a categorical equal to detect_language row by row."""
+    texts = pd.Series(['사파리 최고', 'great park', 'park 좋아요 fun fun fun', '', None, '123 !!', '　\t'],
+                      index=range(100, 107))
+    languages = detect_languages(texts)
+
+    assert list(languages.cat.categories) == list(LANGUAGES)
+    assert list(languages.index) == list(texts.index)
+    assert list(languages) == [detect_language(t) for t in texts.fillna('')]
+
+
+def test_tokenize_many_reuses_given_languages(fake_pool, monkeypatch):
+    """Test that precomputed languages are used instead of detecting each review again."""
+    def fail(text):
+        raise AssertionError('detect_language should not be called')
+    monkeypatch.setattr(korean_tokenizer, 'detect_language', fail)
+    texts = ['사파리 정말 재밌어요', 'great park', '판다!! 귀여워요']
+
+    assert tokenize_many(texts, chunk_size=2) == ['사파리 정말 재밌어요', 'great park', '판다!! 귀여워요']
+    assert tokenize_many(texts, use_morphology=False, languages=['mixed', 'english', 'mixed']) == [
+        '사파리 정말 재밌어요', 'great park', '판다 귀여워요',
+    ]
+
+
+def test_importing_the_tokenizer_does_not_load_pandas():
+    """Test that the app's import path (backend -> extractive -> tokenizer) stays free of numpy and pandas."""
+    code = "import sys, st_app.rag.backend; print(sorted({'numpy', 'pandas'} & set(sys.modules)))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_tokenizer_id_does_not_create_an_analyzer(fake_pool, monkeypatch):
+    """Test that building the cache key only checks whether konlpy is installed instead of starting Okt."""
+    monkeypatch.setattr(korean_tokenizer.importlib.util, 'find_spec', lambda name: object())
+    monkeypatch.setattr('importlib.metadata.version', lambda name: '0.6.0')
+    assert tokenizer_id() == f'okt-0.6.0/v{korean_tokenizer.TOKENIZER_VERSION}'
+    assert fake_pool.created == 0
+
+    monkeypatch.setattr(korean_tokenizer.importlib.util, 'find_spec', lambda name: None)
+    assert tokenizer_id().startswith('simple/')
+    assert tokenizer_id(use_morphology=False).startswith('simple/')
+
+
+def test_fallback_tokens_are_not_cached_as_okt(tmp_path, monkeypatch):
+    """Test that reviews tokenized while Okt cannot start are stored under the fallback tokenizer, not okt-*."""
+    monkeypatch.setattr(korean_tokenizer.importlib.util, 'find_spec', lambda name: object() if name == 'konlpy' else None)
+    texts = ['사파리 정말 재밌었어요', '줄이 너무 길어요']
+    cache = TokenCache(str(tmp_path / 'token_cache.sqlite'))
+
+    def broken_factory():
+        raise OSError('JVM')
+
+    monkeypatch.setattr(korean_tokenizer, '_okt_pool', OktPool(size=1, factory=broken_factory))
+    fallback = tokenize_parallel(texts, processes=1, cache=cache)
+    stored = {row[0] for row in cache._conn.execute('SELECT DISTINCT tokenizer FROM tokens')}
+    assert stored == {tokenizer_id(okt_available=False)}
+    assert tokenize_parallel(texts, processes=1, cache=cache) == fallback
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    # Java가 다시 동작하면 대체 결과를 쓰지 않고 Okt로 분석해 okt-* 이름으로 저장
+    class StemmingOkt(FakeOkt):
+        def pos(self, text, norm=True, stem=True):
+            return [(word[:2], 'Noun') for word in text.split()]
+
+    monkeypatch.setattr(korean_tokenizer, '_okt_pool', OktPool(size=1, factory=StemmingOkt))
+    okt_tokens = ['사파 정말 재밌', '줄이 너무 길어']
+    assert tokenize_parallel(texts, processes=1, cache=cache) == okt_tokens != fallback
+    assert cache.get_many(tokenizer_id(), [text_key(text) for text in texts]) == dict(
+        zip([text_key(text) for text in texts], okt_tokens))
+    cache.close()
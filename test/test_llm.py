@@ -0,0 +1,86 @@
+import time
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+from st_app.rag.backend import Backend
+from st_app.rag.fake import FakeChatModel, FakeEmbeddings
+import st_app.rag.llm as llm
+from st_app.rag.llm import LLMPolicy, invoke_llm
+from st_app.utils.tracing import Tracer
+
+PROMPT = ChatPromptTemplate.from_messages([("human", "{question}")])
+
+
+class SlowFirstCall(FakeChatModel):
+    calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            time.sleep(1.0)
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr(llm, "tracer", tracer)
+    return tracer
+
+
+def make_backend(model, **policy) -> Backend:
+    return Backend(llm=model, embeddings=FakeEmbeddings(size=8), policy=LLMPolicy(**policy))
+
+
+def test_hedged_request_wins_over_slow_primary(tracer):
+    """Test that a duplicate call after the hedge delay returns first."""
+    backend = make_backend(SlowFirstCall(), timeout=2.0, hedge_delay=0.05)
+
+    start = time.perf_counter()
+    result = invoke_llm(backend, "chat", PROMPT, {"question": "안녕"})
+
+    assert time.perf_counter() - start < 0.5
+    assert result.content.startswith("[fake]")
+    assert tracer.counters() == {"llm.chat.hedge_won": 1, "llm.chat.hedged": 1}
+
+
+def test_timeout_falls_back_to_extractive(tracer):
+    """Test that a slow model is abandoned at the node timeout."""
+    backend = make_backend(FakeChatModel(latency=1.0), timeout=0.1, hedge=False)
+
+    start = time.perf_counter()
+    result = invoke_llm(backend, "rag_review", PROMPT, {"question": "후기"}, extractive=lambda: "발췌 답변")
+
+    assert time.perf_counter() - start < 0.5
+    assert result.content == "발췌 답변"
+    assert tracer.counters() == {"llm.rag_review.fallback.extractive": 1, "llm.rag_review.timeout": 1}
+
+
+def test_timeout_falls_back_to_cached_answer(tracer):
+    """Test that the last successful answer for the same question is reused."""
+    model = FakeChatModel()
+    backend = make_backend(model, timeout=0.1, hedge=False, fallbacks=("cache",))
+    first = invoke_llm(backend, "chat", PROMPT, {"question": "운영  시간"})
+
+    model.latency = 1.0
+    second = invoke_llm(backend, "chat", PROMPT, {"question": "운영 시간"})
+
+    assert second.content == first.content
+    assert "llm.chat.fallback.cache" in tracer.counters()
+
+
+def test_cached_answer_is_not_reused_across_conversations(tracer):
+    """Test that a follow-up in a different conversation does not get another conversation's cached answer."""
+    model = FakeChatModel()
+    backend = make_backend(model, timeout=0.1, hedge=False, fallbacks=("cache",))
+    invoke_llm(backend, "rag_review", PROMPT, {
+        "question": "더 알려줘", "context": "사파리 후기", "chat_history": [{"role": "user", "content": "사파리 어때?"}],
+    })
+
+    model.latency = 1.0
+    result = invoke_llm(backend, "rag_review", PROMPT, {
+        "question": "더 알려줘", "context": "츄러스 후기", "chat_history": [{"role": "user", "content": "츄러스 어때?"}],
+    })
+
+    assert result.content == llm.UNAVAILABLE_MESSAGE
+    assert "llm.rag_review.fallback.cache" not in tracer.counters()
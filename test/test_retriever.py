@@ -0,0 +1,95 @@
+from datetime import date
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from st_app.rag.backend import Backend, apply_retrieval_env
+from st_app.rag.fake import FakeChatModel, FakeEmbeddings
+from st_app.rag import retriever
+from st_app.rag.retriever import DateBucketIndex, as_date, date_bucket, get_as_of, get_bucket_index, retrieve_reviews
+
+
+def make_backend(docs, **kwargs) -> Backend:
+    embeddings = FakeEmbeddings(size=16)
+    return Backend(
+        llm=FakeChatModel(),
+        embeddings=embeddings,
+        vectorstore=FAISS.from_documents(docs, embeddings),
+        **kwargs,
+    )
+
+
+def review(text: str, day: str) -> Document:
+    return Document(page_content=text, metadata={"platform": "google", "date": as_date(day)})
+
+
+def test_date_metadata_helpers():
+    """Test date parsing from legacy string metadata and bucketing."""
+    assert as_date("2025-11-23") == date(2025, 11, 23)
+    assert as_date("nan") is None
+    assert date_bucket(date(2025, 11, 23), "quarter") == "2025Q4"
+
+
+def test_recency_breaks_ties_between_similar_reviews():
+    """Test that the newer of two equally similar reviews ranks first."""
+    backend = make_backend([
+        review("사파리 재밌어요", "2019-05-01"),
+        review("사파리 재밌어요", "2025-12-01"),
+        review("주차 불편해요", "2026-01-10"),
+    ])
+
+    docs = retrieve_reviews(backend, "사파리 재밌어요", k=1)
+
+    assert docs[0].metadata["date"] == date(2025, 12, 1)
+
+
+@pytest.mark.parametrize("date_buckets", [None, "year", "quarter"])
+def test_recent_query_searches_recent_reviews_only(date_buckets):
+    """Test that '요즘' questions only return reviews from the recent window."""
+    backend = make_backend([
+        review("사파리 재밌어요", "2019-05-01"),
+        review("사파리 별로예요", "2020-05-01"),
+        review("판다 귀여워요", "2025-12-01"),
+        review("주차 불편해요", "2026-01-10"),
+    ], date_buckets=date_buckets)
+
+    docs = retrieve_reviews(backend, "요즘 사파리 어때?", k=3)
+
+    assert {d.metadata["date"].year for d in docs} == {2025, 2026}
+
+
+def test_retrieval_settings_come_from_the_environment(monkeypatch):
+    """Test that RETRIEVAL_* variables apply to a backend that was not built by backend_from_env."""
+    monkeypatch.setenv("RETRIEVAL_RECENCY_WEIGHT", "0.5")
+    monkeypatch.setenv("RETRIEVAL_DATE_BUCKETS", "quarter")
+    backend = apply_retrieval_env(Backend(llm=FakeChatModel(), embeddings=FakeEmbeddings(size=8)))
+    assert (backend.recency_weight, backend.date_buckets) == (0.5, "quarter")
+
+
+def test_results_built_during_an_index_swap_are_discarded(monkeypatch):
+    """Test that a bucket index, as_of or cached search built from the old index is not stored after a swap."""
+    backend = make_backend([review("사파리 재밌어요", "2019-05-01")], date_buckets="year")
+    new_index = FAISS.from_documents([review("판다 귀여워요", "2026-01-10")], backend.embeddings)
+
+    def swap_after(fn):
+        def wrapped(*args, **kwargs):
+            result = fn(*args, **kwargs)
+            backend.swap_vectorstore(new_index)
+            return result
+        return wrapped
+
+    with monkeypatch.context() as patch:
+        patch.setattr(DateBucketIndex, "from_vectorstore", swap_after(DateBucketIndex.from_vectorstore))
+        assert get_bucket_index(backend).as_of == date(2019, 5, 1)
+    assert backend.bucket_index is None
+
+    backend.date_buckets = None
+    with monkeypatch.context() as patch:
+        patch.setattr(retriever, "latest_date", swap_after(retriever.latest_date))
+        assert get_as_of(backend) == date(2026, 1, 10)
+    assert backend.as_of is None
+
+    with monkeypatch.context() as patch:
+        patch.setattr(retriever, "_search", swap_after(retriever._search))
+        retrieve_reviews(backend, "사파리 재밌어요", k=1)
+    assert len(backend.query_cache) == 0
@@ -0,0 +1,125 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from review_analysis.preprocessing.columnar import parquet_path
+from review_analysis.preprocessing.google_processor import GoogleProcessor
+from review_analysis.preprocessing.review_processor import (
+    GOOGLE, TRIPCOM, ReviewProcessor, SourceConfig, parse_dotted_date, top_keywords,
+)
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+@pytest.fixture
+def google_csv(tmp_path):
+    rows = [
+        (5.0, "2025.1.10.", "사파리 정말 재밌었어요 판다도 봤어요"),
+        (4.0, "2025.01.11.", "줄이 길었지만 놀이기구 최고"),
+        (9.0, "2025.1.12.", "별점이 이상한 리뷰 입니다"),
+        (3.0, "2018.5.1.", "너무 오래된 리뷰 입니다"),
+        (None, "2025.2.1.", "평점 없는 리뷰 입니다 사파리"),
+        (2.0, "2025.3.1.", "음"),
+    ]
+    path = tmp_path / "reviews_google.csv"
+    pd.DataFrame(rows, columns=["rating", "date", "content"]).to_csv(path, index=False)
+    return str(path)
+
+
+def test_config_rules_are_applied(google_csv, tmp_path):
+    """Test that rating, date and length outliers from the config are removed and each stage is timed."""
+    processor = GoogleProcessor(google_csv, str(tmp_path), feature_stages=("derived_features",))
+    processor.preprocess()
+    processor.feature_engineering()
+
+    df = processor.processed_df
+    assert list(df["context"]) == [
+        "사파리 정말 재밌었어요 판다도 봤어요", "줄이 길었지만 놀이기구 최고", "평점 없는 리뷰 입니다 사파리",
+    ]
+    assert df["rating"].iloc[2] == pytest.approx(4.6)  # 결측치는 이상치 제거 전 평균으로 채움
+    assert set(processor.timings) == set(ReviewProcessor.PREPROCESS_STAGES) | {"derived_features"}
+
+
+def test_pipeline_does_not_copy_the_frame(google_csv, tmp_path):
+    """Test that stages hand one frame along and the saved selection shares its column data."""
+    processor = GoogleProcessor(google_csv, str(tmp_path), feature_stages=("derived_features",))
+    processor.preprocess()
+    assert processor.processed_df is processor.df
+    processor.feature_engineering()
+    assert processor.processed_df is processor.df
+
+    saved = processor.output_frame()
+    assert "context_tokenized" not in saved.columns
+    assert np.shares_memory(saved["rating"].to_numpy(), processor.processed_df["rating"].to_numpy())
+    if sys.platform.startswith("linux"):
+        assert set(processor.peak_rss) == set(processor.timings)
+
+
+def test_stages_are_composable(google_csv, tmp_path):
+    """Test that a custom config and stage list run without the tokenizer or vectorizer."""
+    config = SourceConfig(name="custom", output_file="custom.csv", parse_date=parse_dotted_date,
+                          rating_range=None, tokenize=False)
+    processor = ReviewProcessor(google_csv, str(tmp_path), config=config, feature_stages=("derived_features",))
+    processor.preprocess()
+    processor.feature_engineering()
+    processor.save_to_database()
+
+    saved = pd.read_csv(tmp_path / "custom.csv")
+    assert 9.0 in set(saved["rating"])
+    assert "context_tokenized" not in saved.columns
+    assert "tfidf_vector_1" not in saved.columns
+    assert "vectorize" not in processor.timings
+
+
+def test_tripcom_output_column_order(tmp_path):
+    """Test that a config with output_columns saves them in order, followed by the TF-IDF vectors."""
+    rows = [(5.0, f"Jan {i % 28 + 1}, 2025", f"park alpha{i % 25} beta{(i * 7) % 25}") for i in range(60)]
+    path = tmp_path / "reviews_tripcom.csv"
+    pd.DataFrame(rows, columns=["rating", "date", "text"]).to_csv(path, index=False)
+    processor = ReviewProcessor(str(path), str(tmp_path), config=TRIPCOM)
+    processor.preprocess()
+    processor.feature_engineering()
+
+    columns = list(processor.output_frame().columns)
+    assert columns[:len(TRIPCOM.output_columns)] == list(TRIPCOM.output_columns)
+    assert all(c.startswith("tfidf_vector_") for c in columns[len(TRIPCOM.output_columns):])
+
+
+def test_top_keywords_match_per_row_transform():
+    """Test that batched top-k keywords equal the per-review transform ranking, including ties and empty rows."""
+    texts = ["a b c d e f g", "b b c", "g f e d c b a", "zzz", "a a a b b c", ""]
+    vectorizer = TfidfVectorizer(token_pattern=r"\S+")
+    matrix = vectorizer.fit_transform(texts)
+    names = vectorizer.get_feature_names_out()
+
+    expected = []
+    for text in texts:
+        row = vectorizer.transform([text])
+        scores = sorted(((names[i], row[0, i]) for i in row.nonzero()[1]), key=lambda x: x[1], reverse=True)
+        expected.append(", ".join(word for word, _ in scores[:5]))
+
+    assert top_keywords(matrix, names, top_n=5) == expected
+    assert expected[-1] == ""
+
+
+@pytest.mark.parametrize("config", [TRIPCOM, GOOGLE], ids=["tripcom", "google"])
+def test_streaming_matches_in_memory(config, tmp_path):
+    """Test that chunked processing writes the same file as the in-memory pipeline, including the mean rating fill."""
+    date = (lambda i: f"Jan {i % 28 + 1}, 2025") if config is TRIPCOM else (lambda i: f"2025.{i % 12 + 1}.3.")
+    rows = [(None if i % 9 == 0 else float(i % 5 + 1), date(i), f"park alpha{i % 25} beta{(i * 7) % 25} 사파리{i % 4}")
+            for i in range(60)]
+    path = tmp_path / "reviews.csv"
+    pd.DataFrame(rows, columns=["rating", "date", "text"]).to_csv(path, index=False)
+
+    in_memory = ReviewProcessor(str(path), str(tmp_path / "memory"), config=config)
+    in_memory.preprocess()
+    in_memory.feature_engineering()
+    in_memory.save_to_database()
+    streaming = ReviewProcessor(str(path), str(tmp_path / "stream"), config=config)
+    output_path = streaming.process_streaming(rows_per_chunk=7)
+
+    expected = (tmp_path / "memory" / config.output_file).read_bytes()
+    assert open(output_path, "rb").read() == expected
+    # 중간 파일은 지움 (pyarrow가 있으면 .parquet도 저장됨)
+    assert set(os.listdir(tmp_path / "stream")) <= {config.output_file, os.path.basename(parquet_path(output_path))}
@@ -0,0 +1,53 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel, FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from st_app.graph.router import router_node
+from st_app.rag.backend import Backend
+from st_app.rag.fake import FakeChatModel, FakeEmbeddings
+import st_app.graph.router as router
+from st_app.utils.tracing import Tracer
+
+
+class ToolCallingStub(FakeMessagesListChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr(router, "tracer", tracer)
+    return tracer
+
+
+def make_backend(llm):
+    return Backend(llm=llm, embeddings=FakeEmbeddings(size=8))
+
+
+def make_state(question: str) -> dict:
+    return {"user_input": question, "chat_history": [], "history_summary": ""}
+
+
+def test_structured_route(tracer):
+    """Test that routes come from the RouteDecision tool call."""
+    result = router_node(make_state("입장료랑 후기 알려줘"), make_backend(FakeChatModel()))
+
+    assert result["routes"] == ["rag_review", "subject_info"]
+    assert tracer.counters() == {"router.structured": 1}
+
+
+def test_text_fallback_without_tool_calling(tracer):
+    """Test that models without tool calling fall back to text parsing."""
+    result = router_node(make_state("후기"), make_backend(FakeListChatModel(responses=["rag_review"])))
+
+    assert result["route"] == "rag_review"
+    assert tracer.counters() == {"router.fallback": 1, "router.no_tool_call": 1}
+
+
+def test_invalid_tool_args_fall_back_to_chat(tracer):
+    """Test that out-of-schema labels are counted and never retried."""
+    message = AIMessage(content="", tool_calls=[{"name": "RouteDecision", "args": {"routes": ["tickets"]}, "id": "1"}])
+    result = router_node(make_state("표"), make_backend(ToolCallingStub(responses=[message])))
+
+    assert result["routes"] == ["chat"]
+    assert tracer.counters() == {"router.fallback": 1, "router.invalid": 1, "router.empty": 1}
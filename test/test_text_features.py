@@ -0,0 +1,51 @@
+import re
+
+import pandas as pd
+import pytest
+from review_analysis.preprocessing.text_features import (
+    EMOJI_PATTERN, LEGACY_EMOJI_PATTERN, LEGACY_EMOJI_RANGES, SIMPLE_EMOJI_RANGES, URL_PATTERN, text_features,
+)
+
+
+@pytest.fixture
+def texts():
+    return pd.Series([
+        "사파리 정말 재밌었어요 😀",
+        "Great park  https://a.com and http://b.kr/x",
+        "",
+        None,
+        "줄\t길어요　ok ✂",
+        "   ",
+    ], index=[10, 11, 12, 13, 14, 15])
+
+
+def test_counts_match_regex_definitions(texts):
+    """Test that the single-pass scanner agrees with len, split and the regex patterns row by row."""
+    features = text_features(texts)
+    values = texts.fillna("")
+
+    assert list(features.index) == list(texts.index)
+    assert list(features["text_len"]) == [len(t) for t in values]
+    assert list(features["word_count"]) == [len(t.split()) for t in values]
+    assert list(features["emoji_count"] > 0) == [bool(EMOJI_PATTERN.search(t)) for t in values]
+    assert list(features["url_count"]) == [len(URL_PATTERN.findall(t)) for t in values]
+    assert features.loc[14, "hangul_ratio"] == pytest.approx(4 / 7)
+    assert features.loc[15, "hangul_ratio"] == 0
+
+
+def test_emoji_ranges_are_configurable(texts):
+    """Test that the simple emoji ranges used by ExampleProcessor ignore the dingbat range."""
+    simple = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF]')
+    features = text_features(texts, emoji_ranges=SIMPLE_EMOJI_RANGES)
+    assert list(features["emoji_count"] > 0) == [bool(simple.search(t)) for t in texts.fillna("")]
+    assert features.loc[14, "emoji_count"] == 0
+
+
+def test_korean_text_is_not_counted_as_emoji():
+    """Test that emoji_count skips Hangul while has_emoji can keep the legacy regex used for text_has_emoji."""
+    texts = pd.Series(["사파리 정말 재밌어요", "사파리 정말 재밌어요 😀", "漢字 ok"])
+    features = text_features(texts, has_emoji_ranges=LEGACY_EMOJI_RANGES)
+
+    assert list(features["emoji_count"]) == [0, 1, 0]
+    assert list(features["has_emoji"]) == [bool(LEGACY_EMOJI_PATTERN.search(t)) for t in texts]
+    assert list(text_features(texts)["has_emoji"]) == [0, 1, 0]
@@ -0,0 +1,45 @@
+import pytest
+from review_analysis.preprocessing.korean_tokenizer import preprocess_korean_text, tokenize_parallel
+from review_analysis.preprocessing.token_cache import TokenCache, cached_map
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TokenCache(str(tmp_path / "token_cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_only_new_texts_are_tokenized(cache):
+    """Test that a second run only tokenizes texts missing from the cache."""
+    seen = []
+
+    def tokenize(texts):
+        seen.append(list(texts))
+        return [("simple/v1", t.upper()) for t in texts]
+
+    assert cached_map(["a", "b", "a"], "simple/v1", cache, tokenize) == ["A", "B", "A"]
+    assert cached_map(["b", "c"], "simple/v1", cache, tokenize) == ["B", "C"]
+    assert seen == [["a", "b"], ["c"]]
+
+
+def test_tokenizer_version_separates_entries(cache):
+    """Test that results cached for one tokenizer version are not reused by another."""
+    cached_map(["리뷰"], "simple/v1", cache, lambda texts: [("simple/v1", "v1")] * len(texts))
+
+    assert cached_map(["리뷰"], "simple/v2", cache, lambda texts: [("simple/v2", "v2")] * len(texts)) == ["v2"]
+    assert len(cache) == 2
+
+
+def test_cache_persists_across_connections(tmp_path):
+    """Test that tokenize_parallel reads results written by an earlier run."""
+    path = str(tmp_path / "token_cache.sqlite")
+    texts = ["사파리 정말 재밌었어요", "줄이 너무 길어요", "great rides"]
+    first = TokenCache(path)
+    expected = tokenize_parallel(texts, processes=1, cache=first)
+    first.close()
+
+    second = TokenCache(path)
+    assert tokenize_parallel(texts, processes=1, cache=second) == expected == [preprocess_korean_text(t) for t in texts]
+    assert (second.hits, second.misses) == (3, 0)
+    second.close()
@@ -0,0 +1,53 @@
+import pytest
+from langchain_core.messages import AIMessage
+from st_app.utils.tracing import Tracer, record_llm_usage, record_cache, record_retrieval
+import st_app.utils.tracing as tracing
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr(tracing, "tracer", tracer)
+    return tracer
+
+
+def test_span_records_llm_usage(tracer):
+    """Test that token usage and cost are attributed to the current span."""
+    message = AIMessage(
+        content="안녕하세요",
+        usage_metadata={"input_tokens": 100, "output_tokens": 20, "total_tokens": 120},
+        response_metadata={"model_name": "solar-mini"},
+    )
+    with tracer.span("chat"):
+        record_llm_usage(message)
+
+    row = tracer.summary()[0]
+    assert row["span"] == "chat"
+    assert row["count"] == 1
+    assert row["tokens_in"] == 100
+    assert row["tokens_out"] == 20
+    assert row["cost_usd"] > 0
+
+
+def test_nested_spans_keep_their_own_attributes(tracer):
+    """Test that retrieval metrics land on the inner span only."""
+    with tracer.span("rag_review"):
+        with tracer.span("retrieve_reviews"):
+            record_retrieval(5, [0.1, 0.2])
+            record_cache(False)
+
+    rows = {row["span"]: row for row in tracer.summary()}
+    assert rows["retrieve_reviews"]["cache_misses"] == 1
+    assert rows["rag_review"]["cache_misses"] == 0
+
+
+def test_trace_node_counts_errors(tracer):
+    """Test that failing nodes are recorded and re-raised."""
+    def broken_node(state):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        tracing.trace_node("router", broken_node)({})
+
+    assert tracer.summary()[0]["errors"] == 1
+    assert 'st_app_span_errors_total{span="router"} 1' in tracer.render_prometheus()
@@ -0,0 +1,46 @@
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from st_app.graph.router import build_graph
+from st_app.rag.backend import Backend
+from st_app.rag.fake import FakeChatModel, FakeEmbeddings
+from st_app.rag.index_store import save_version
+from st_app.rag.warmup import FAILED, READY, SKIPPED, Warmup
+
+
+@pytest.fixture
+def backend(tmp_path):
+    embeddings = FakeEmbeddings(size=16)
+    docs = [Document(page_content=f"사파리 리뷰 {i}", metadata={"date": "2024-05-0%d" % (i + 1)}) for i in range(3)]
+    save_version(FAISS.from_documents(docs, embeddings), str(tmp_path))
+    return Backend(llm=FakeChatModel(), embeddings=embeddings, index_dir=str(tmp_path))
+
+
+def test_warmup_loads_index_in_background(backend):
+    """Test that the background warm-up loads the index and computes the recency reference date."""
+    warmup = Warmup(backend)
+    warmup.start()
+
+    assert warmup.wait(timeout=10)
+    assert backend.vectorstore is not None
+    assert backend.as_of is not None
+    assert [row["status"] for row in warmup.summary()] == [READY, READY, READY, SKIPPED]
+
+
+def test_warmup_runs_canary_question(backend):
+    """Test that a canary question goes through the whole graph."""
+    warmup = Warmup(backend, graph=build_graph(backend), canary="사파리 후기 어때?")
+
+    assert warmup.run()
+    assert warmup.status["canary"] == READY
+
+
+def test_warmup_failure_skips_later_stages(tmp_path):
+    """Test that a missing index marks the stage failed and skips the rest."""
+    warmup = Warmup(Backend(llm=FakeChatModel(), embeddings=FakeEmbeddings(size=16), index_dir=str(tmp_path)))
+
+    assert not warmup.run()
+    assert warmup.ready.is_set()
+    assert warmup.status["index"] == FAILED
+    assert warmup.status["pretouch"] == SKIPPED
+    assert warmup.error.startswith("index:")